@@ -0,0 +1 @@
+"""Benchmarks for the EPEVER Hi integration."""
@@ -0,0 +1,137 @@
+"""Micro-benchmark: sensor decode time per poll cycle.
+
+Compares the former per-property decode in EpeverHiModbusSensor.native_value
+with the compiled DecodePlan that decodes each snapshot once per poll.
+
+Run with: python -m benchmarks.bench_decode
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import random
+import struct
+import timeit
+
+from benchmarks.common import load_const_literal
+from tests.conftest import load_integration_module
+
+LOGGER = logging.getLogger("epever_hi.bench")
+
+# Home Assistant reads native_value several times per state write
+PROPERTY_READS_PER_WRITE = 3
+
+
+def legacy_native_value(data, slave, address, type_, scale, precision):
+    """Decode path used by native_value before the compiled plan."""
+    if type_ == "float32":
+        raw_hi = data.get((slave, address))
+        raw_lo = data.get((slave, address + 1))
+        if raw_hi is None or raw_lo is None:
+            LOGGER.debug("No data at 0x%04X/0x%04X", address, address + 1)
+            return None
+
+        import struct
+
+        try:
+            combined_bytes = struct.pack(">HH", raw_hi, raw_lo)
+            value = struct.unpack(">f", combined_bytes)[0]
+        except Exception:
+            return None
+        scaled = round(value, precision)
+        LOGGER.debug("raw float32=(%s, %s) → %s", raw_hi, raw_lo, scaled)
+        return scaled
+
+    raw = data.get((slave, address))
+    if raw is None:
+        LOGGER.debug("No data at address 0x%04X", address)
+        return None
+    scaled = round(raw * scale, precision)
+    LOGGER.debug("raw=%s → scaled=%s", raw, scaled)
+    return scaled
+
+
+def build_snapshot(definitions, slaves, seed=1):
+    """Return a random register snapshot covering every definition."""
+    rng = random.Random(seed)
+    data = {}
+    for slave in slaves:
+        for address, reg in definitions.items():
+            if reg.get("type") == "float32":
+                hi, lo = struct.unpack(">HH", struct.pack(">f", rng.uniform(0, 500)))
+                data[(slave, address)] = hi
+                data[(slave, address + 1)] = lo
+            else:
+                words = 2 if reg.get("data_type", "uint16")[-2:] == "32" else 1
+                for offset in range(words):
+                    data[(slave, address + offset)] = rng.randrange(0, 0x10000)
+    return data
+
+
+def run(units: int, number: int, repeat: int) -> dict[str, float | int]:
+    """Time one poll cycle worth of sensor decoding, before and after."""
+    decoder = load_integration_module("decoder")
+    definitions = load_const_literal("SENSOR_DEFINITIONS_NEW")
+    slaves = list(range(1, units + 1))
+    data = build_snapshot(definitions, slaves)
+    sensors = [
+        (
+            slave,
+            address,
+            reg["key"],
+            reg.get("type", "uint16"),
+            reg.get("scale", 1),
+            reg.get("precision", 0),
+        )
+        for slave in slaves
+        for address, reg in definitions.items()
+    ]
+
+    def legacy_cycle():
+        for slave, address, _key, type_, scale, precision in sensors:
+            for _ in range(PROPERTY_READS_PER_WRITE):
+                legacy_native_value(data, slave, address, type_, scale, precision)
+
+    plan = decoder.DecodePlan(definitions)
+
+    def compiled_cycle():
+        values = plan.decode(data, slaves)
+        for slave, _address, key, *_ in sensors:
+            for _ in range(PROPERTY_READS_PER_WRITE):
+                values.get((slave, key))
+
+    # Both paths must agree before timing them; the legacy path only ever
+    # decoded a single word, so multi-word values are not comparable
+    values = plan.decode(data, slaves)
+    for slave, address, key, type_, scale, precision in sensors:
+        if decoder.register_count(definitions[address]) > 1:
+            continue
+        expected = legacy_native_value(data, slave, address, type_, scale, precision)
+        assert values[(slave, key)] == expected, key
+
+    legacy = min(timeit.repeat(legacy_cycle, number=number, repeat=repeat)) / number
+    compiled = min(timeit.repeat(compiled_cycle, number=number, repeat=repeat)) / number
+    return {
+        "units": units,
+        "sensors": len(sensors),
+        "legacy_us_per_cycle": round(legacy * 1e6, 2),
+        "compiled_us_per_cycle": round(compiled * 1e6, 2),
+        "speedup": round(legacy / compiled, 2),
+    }
+
+
+def main() -> None:
+    """Run the benchmark and print one JSON object per unit count."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--units", type=int, nargs="+", default=[1, 6])
+    parser.add_argument("--number", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    for units in args.units:
+        print(json.dumps(run(units, args.number, args.repeat)))
+
+
+if __name__ == "__main__":
+    main()
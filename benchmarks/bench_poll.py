@@ -0,0 +1,146 @@
+"""Poll-cycle benchmark against the local EPEVER Hi simulator.
+
+Drives the coordinator's poll path (RegisterPoller block reads plus the
+DecodePlan snapshot decode) through EpeverHiModbusClient against
+tests/simulator.py, sweeping register count, injected RTT, framer, number
+of devices and pipeline depth. Every case prints one JSON object:
+
+    python -m benchmarks.bench_poll
+    python -m benchmarks.bench_poll --rtt-ms 5 100 --devices 1 4 --cycles 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import statistics
+import time
+
+from benchmarks.common import load_const_literal
+from tests.conftest import load_integration_module
+from tests.simulator import EpeverHiSimulator, SimulatorConfig, load_definition_tables
+
+# Tables an entry polls, in the order entities register them
+POLLED_TABLES = ("SENSOR_DEFINITIONS_NEW", "REGISTER_DEFINITIONS", "SWITCH_DEFINITIONS")
+
+
+def polled_definitions() -> list[tuple[int, dict]]:
+    """Return (address, definition) for every polled register, in address order."""
+    tables = load_definition_tables(POLLED_TABLES)
+    definitions = {}
+    for name in POLLED_TABLES:
+        for address, reg in tables[name].items():
+            definitions.setdefault(address, reg)
+    return sorted(definitions.items())
+
+
+async def run_case(
+    framer: str,
+    devices: int,
+    registers: int,
+    rtt: float,
+    pipeline_depth: int,
+    cycles: int,
+    serial_bus: bool = True,
+) -> dict[str, float | int | str]:
+    """Time ``cycles`` full poll cycles for one point of the sweep."""
+    modbus_client = load_integration_module("modbus_client")
+    poller_module = load_integration_module("poller")
+    decoder = load_integration_module("decoder")
+
+    selected = polled_definitions()[:registers]
+    units = tuple(range(1, devices + 1))
+    config = SimulatorConfig(
+        unit_ids=units, framer=framer, latency=rtt, serialize=serial_bus
+    )
+    async with EpeverHiSimulator(config) as sim:
+        client = modbus_client.EpeverHiModbusClient(
+            sim.host, sim.port, framer=framer, pipeline_depth=pipeline_depth
+        )
+        poller = poller_module.RegisterPoller(client)
+        for unit, (address, reg) in itertools.product(units, selected):
+            # Interval 0: every register is due on every cycle (worst case)
+            poller.register(
+                unit,
+                address,
+                reg.get("register_type", "holding"),
+                0.0,
+                decoder.register_count(reg),
+            )
+        plan = decoder.DecodePlan(load_const_literal("SENSOR_DEFINITIONS_NEW"))
+
+        data: dict = {}
+        durations = []
+        cpu = []
+        requests_before = client.metrics.requests
+        try:
+            data = await poller.async_poll(data)  # connect and warm the plan cache
+            requests_before = client.metrics.requests
+            for _ in range(cycles):
+                cpu_started = time.process_time()
+                started = time.perf_counter()
+                data = await poller.async_poll(data)
+                plan.decode(data, units)
+                durations.append(time.perf_counter() - started)
+                cpu.append(time.process_time() - cpu_started)
+        finally:
+            await client.close()
+
+    requests = client.metrics.requests - requests_before
+    failures = client.metrics.failures
+    elapsed = sum(durations)
+    return {
+        "framer": framer,
+        "devices": devices,
+        "registers": len(poller.active),
+        "rtt_ms": round(rtt * 1000, 1),
+        "pipeline_depth": pipeline_depth,
+        "serial_bus": serial_bus,
+        "requests_per_cycle": requests // cycles,
+        "cycle_ms": round(statistics.mean(durations) * 1000, 2),
+        "cycle_ms_max": round(max(durations) * 1000, 2),
+        "requests_per_sec": round(requests / elapsed, 1),
+        "cpu_ms_per_cycle": round(statistics.mean(cpu) * 1000, 3),
+        "failed_requests": failures,
+    }
+
+
+def main() -> None:
+    """Run the sweep and print one JSON object per case."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--framers", nargs="+", default=["tcp", "rtu"])
+    parser.add_argument("--devices", type=int, nargs="+", default=[1, 2])
+    parser.add_argument("--registers", type=int, nargs="+", default=[8, 24, 1000])
+    parser.add_argument("--rtt-ms", type=float, nargs="+", default=[1, 50, 200])
+    parser.add_argument("--pipeline-depth", type=int, nargs="+", default=[1])
+    parser.add_argument("--cycles", type=int, default=3)
+    parser.add_argument(
+        "--concurrent-gateway",
+        action="store_true",
+        help="let the simulated gateway answer requests in parallel",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.CRITICAL)
+    for framer, devices, registers, rtt_ms, depth in itertools.product(
+        args.framers, args.devices, args.registers, args.rtt_ms, args.pipeline_depth
+    ):
+        result = asyncio.run(
+            run_case(
+                framer,
+                devices,
+                registers,
+                rtt_ms / 1000,
+                depth,
+                args.cycles,
+                serial_bus=not args.concurrent_gateway,
+            )
+        )
+        print(json.dumps(result), flush=True)
+
+
+if __name__ == "__main__":
+    main()
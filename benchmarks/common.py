@@ -0,0 +1,20 @@
+"""Shared helpers for benchmarks that run without Home Assistant installed."""
+
+from __future__ import annotations
+
+import ast
+from typing import Any
+
+from tests.conftest import INTEGRATION_DIR
+
+
+def load_const_literal(name: str) -> Any:
+    """Return a literal definition table from const.py without importing it."""
+    tree = ast.parse((INTEGRATION_DIR / "const.py").read_text(encoding="utf-8"))
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(
+            isinstance(target, ast.Name) and target.id == name
+            for target in node.targets
+        ):
+            return ast.literal_eval(node.value)
+    raise KeyError(name)
@@ -5,10 +5,14 @@ from homeassistant.const import (
     # EVENT_HOMEASSISTANT_STOP,
     Platform,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.typing import ConfigType
 
-from .const import DOMAIN, LOGGER
-from .modbus_coordinator import EpeverHiModbusCoordinator
+from .const import DOMAIN, LOGGER, scoped_unique_id
+from .modbus_coordinator import EpeverHiModbusCoordinator, snapshot_store
+from .services import async_setup_services
 
 # from .info_sensor import EpeverHiInfoCoordinator
 
@@ -30,14 +34,51 @@ PLATFORMS: list[Platform] = [
 # PLATFORMS = ["sensor","number","switch","binary_sensor","select"]
 # , "number", "switch", "binary_sensor", "select"]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the EPEVER Hi services."""
+    async_setup_services(hass)
+    return True
+
+
+async def async_migrate_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Migrate an entry created by an older version of the integration."""
+    if entry.version == 1:
+        # Entries may share a gateway: scope entity unique IDs to the entry
+        prefix = scoped_unique_id(entry.entry_id, "")
+
+        @callback
+        def scope_unique_id(entity: er.RegistryEntry) -> dict[str, str] | None:
+            if entity.unique_id.startswith(prefix):
+                return None
+            return {"new_unique_id": prefix + entity.unique_id}
+
+        await er.async_migrate_entries(hass, entry.entry_id, scope_unique_id)
+        hass.config_entries.async_update_entry(entry, version=2)
+        LOGGER.info("Migrated EPEVER Hi entry %s to version 2", entry.entry_id)
+    return True
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up EPEVER Hi from a config entry."""
     LOGGER.debug("Initializing EPEVER Hi integration")
 
-    coordinator = EpeverHiModbusCoordinator(hass, entry.data)
-    await coordinator.async_setup()
-    await coordinator.async_config_entry_first_refresh()
+    # Options (register groups, poll interval) override the initial setup data
+    coordinator = EpeverHiModbusCoordinator(
+        hass, {**entry.data, **entry.options}, entry.entry_id
+    )
+    try:
+        coordinator.seed_poll_set()
+        if not await coordinator.async_setup():
+            # No snapshot to start from: wait for the device like before
+            await coordinator.async_config_entry_first_refresh()
+    except Exception:
+        # Home Assistant does not unload an entry whose setup failed; release
+        # the shared client here or every setup retry leaks a reference
+        await coordinator.async_close()
+        raise
 
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
 
@@ -45,6 +86,23 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # info = await info_coordinator._async_update_data()
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    # Entities now hold their own registrations
+    coordinator.release_seed()
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+    if coordinator.unprobed:
+        # Probing may wait out timeouts; learn the firmware's registers
+        # without holding up setup
+        entry.async_create_background_task(
+            hass,
+            coordinator.async_probe_capabilities(),
+            "epever_hi probe capabilities",
+        )
+    if coordinator.stale:
+        # Entities start from the restored snapshot; reconcile with the device
+        # without holding up setup if the gateway is unreachable
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), "epever_hi reconcile snapshot"
+        )
 
     LOGGER.info("EPEVER Hi integration initialized successfully")
     return True
@@ -57,3 +115,13 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # Ensure Modbus client is closed
     await coordinator.async_close()
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Delete the warm-start snapshot of a removed entry."""
+    await snapshot_store(hass, entry.entry_id).async_remove()
+
+
+async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the entry after its options changed."""
+    await hass.config_entries.async_reload(entry.entry_id)
@@ -5,11 +5,10 @@ import logging
 from homeassistant.components.binary_sensor import BinarySensorEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DIAGNOSTIC_DEFINITIONS, DOMAIN, get_device_info
+from .const import DEFAULT_POLL_TIER, DIAGNOSTIC_DEFINITIONS, DOMAIN
+from .entity import EpeverHiEntity
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -22,47 +21,60 @@ async def async_setup_entry(
     coordinator = hass.data[DOMAIN][entry.entry_id]
     sensors = []
 
-    for addr, reg in DIAGNOSTIC_DEFINITIONS.items():
-        entity_category = reg.get("entity_category", None)
-        reg_type = reg.get("register_type", "holding")
-        for bit_num, bit_def in reg.get("bits", {}).items():
-            coordinator.register_address(addr, reg_type)
-            sensors.append(
-                EpeverHiBinarySensor(
-                    coordinator=coordinator,
-                    address=addr,
-                    bit_num=bit_num,
-                    key=bit_def["key"],
-                    name=bit_def["name"],
-                    entry_id=entry.entry_id,
-                    entity_category=entity_category,
+    for slave in coordinator.slaves:
+        for addr, reg in DIAGNOSTIC_DEFINITIONS.items():
+            if not coordinator.group_enabled(reg):
+                continue
+            entity_category = reg.get("entity_category", None)
+            for bit_num, bit_def in reg.get("bits", {}).items():
+                # Every bit entity holds its own reference to the shared word
+                sensors.append(
+                    EpeverHiBinarySensor(
+                        coordinator=coordinator,
+                        address=addr,
+                        bit_num=bit_num,
+                        key=bit_def["key"],
+                        name=bit_def["name"],
+                        slave=slave,
+                        entry_id=entry.entry_id,
+                        entity_category=entity_category,
+                        register_type=reg.get("register_type", "holding"),
+                        poll_tier=reg.get("poll_tier", DEFAULT_POLL_TIER),
+                    )
                 )
-            )
 
     _LOGGER.debug("Adding %d binary sensors for EPEVER Hi", len(sensors))
     async_add_entities(sensors)
 
 
-class EpeverHiBinarySensor(CoordinatorEntity, BinarySensorEntity):
+class EpeverHiBinarySensor(EpeverHiEntity, BinarySensorEntity):
     """Binary sensor for EPEVER Hi device status bits."""
 
     def __init__(
         self,
-        coordinator: CoordinatorEntity,
+        coordinator,
         address: int,
         bit_num: int,
         key: str,
         name: str,
+        slave: int,
         entry_id: str,
         entity_category=None,
+        register_type: str = "holding",
+        poll_tier: str = DEFAULT_POLL_TIER,
     ):
-        super().__init__(coordinator)
-        self._address = address
+        super().__init__(
+            coordinator,
+            address,
+            slave,
+            entry_id,
+            f"epever_hi_bin_{key}",
+            register_type=register_type,
+            poll_tier=poll_tier,
+        )
         self._bit_num = bit_num
 
         self._attr_name = name
-        self._attr_unique_id = f"epever_hi_bin_{key}"
-        self._attr_device_info = DeviceInfo(**get_device_info(entry_id))
         self._attr_entity_category = entity_category
         _LOGGER.debug(
             "Initialized binary sensor %s (bit %d @ 0x%04X)", name, bit_num, address
@@ -70,7 +82,7 @@ class EpeverHiBinarySensor(CoordinatorEntity, BinarySensorEntity):
 
     @property
     def is_on(self) -> bool | None:
-        raw = self.coordinator.data.get(self._address)
+        raw = self._raw_value()
 
         if raw is None:
             _LOGGER.debug("No data at 0x%04X for %s", self._address, self.name)
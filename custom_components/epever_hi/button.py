@@ -3,27 +3,33 @@ from __future__ import annotations
 from homeassistant.components.button import ButtonEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import BUTTON_DEFINITIONS, DOMAIN, LOGGER, get_device_info
+from .const import BUTTON_DEFINITIONS, DEFAULT_POLL_TIER, DOMAIN, LOGGER
+from .entity import EpeverHiEntity
 
 
-class EpeverHiButton(CoordinatorEntity, ButtonEntity):
+class EpeverHiButton(EpeverHiEntity, ButtonEntity):
     """Modbus-based button entity for EPEVER Hi."""
 
-    def __init__(self, coordinator, props: dict, entry_id: str):
-        super().__init__(coordinator)
-        self._address = props["address"]
+    def __init__(self, coordinator, props: dict, slave: int, entry_id: str):
+        super().__init__(
+            coordinator,
+            props["address"],
+            slave,
+            entry_id,
+            f"epever_hi_button_{props['key']}",
+            register_type=props.get("register_type", "holding"),
+            poll_tier=props.get("poll_tier", DEFAULT_POLL_TIER),
+        )
         self._key = props["key"]
         self._attr_name = props["name"]
-        self._attr_unique_id = f"epever_hi_button_{self._key}"
-        self._attr_device_info = DeviceInfo(**get_device_info(entry_id))
 
     async def async_press(self) -> None:
         try:
-            ok = await self.coordinator.async_write_register(self._address, 1)
+            ok = await self.coordinator.async_write_register(
+                self._address, 1, self._slave
+            )
             if ok:
                 LOGGER.debug("Button pressed: wrote value 1 to 0x%04X", self._address)
         except Exception as err:
@@ -37,15 +43,19 @@ async def async_setup_entry(
 ):
     coordinator = hass.data[DOMAIN][entry.entry_id]
     buttons = []
-    for address, props in BUTTON_DEFINITIONS.items():
-        if props.get("entity_type") == "button":
-            reg_type = props.get("register_type", "holding")
-            coordinator.register_address(address, reg_type)
-            buttons.append(
-                EpeverHiButton(
-                    coordinator, {**props, "address": address}, entry.entry_id
+    for slave in coordinator.slaves:
+        for address, props in BUTTON_DEFINITIONS.items():
+            if props.get("entity_type") == "button" and coordinator.group_enabled(
+                props
+            ):
+                buttons.append(
+                    EpeverHiButton(
+                        coordinator,
+                        {**props, "address": address},
+                        slave,
+                        entry.entry_id,
+                    )
                 )
-            )
 
     LOGGER.debug("Adding %d buttons", len(buttons))
     async_add_entities(buttons)
@@ -0,0 +1,237 @@
+"""Register capabilities of a firmware, discovered by a one-time probe.
+
+Not every Hi firmware implements the whole register map in const.py. The
+probe finds which registers answer and the largest block each register page
+accepts; the coordinator caches the result per firmware in a
+helpers.storage.Store and the poll plan only reads what the device supports.
+Only definite answers are learned: a read that times out, or that a gateway
+reports unanswered, says nothing about the firmware.
+
+Kept free of Home Assistant imports so the probe can be tested against the
+device simulator.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import Awaitable, Callable, Iterable, Mapping
+from dataclasses import dataclass, field
+import logging
+from typing import Any
+
+from .modbus_client import ReadResult
+from .modbus_pipeline import (
+    EXC_ILLEGAL_DATA_ADDRESS,
+    EXC_ILLEGAL_DATA_VALUE,
+    EXC_ILLEGAL_FUNCTION,
+)
+from .read_planner import MAX_REGISTERS_PER_READ, ReadBlock, plan_reads
+
+_LOGGER = logging.getLogger(__package__)
+
+CAPABILITIES_VERSION = 1
+
+# (register type, first address, register count) of one value to probe
+ProbeSpan = tuple[str, int, int]
+
+# read(register_type, address, count) -> the registers or why they failed
+ProbeRead = Callable[[str, int, int], Awaitable[ReadResult]]
+
+# Exception codes that reject the registers, or the size of the block
+_REJECTIONS = (EXC_ILLEGAL_FUNCTION, EXC_ILLEGAL_DATA_ADDRESS, EXC_ILLEGAL_DATA_VALUE)
+
+
+def register_page(address: int) -> int:
+    """Return the 256-register page an address belongs to.
+
+    The Hi register map is laid out in pages (0x3200, 0x3500, 0x9000, ...);
+    block size limits are learned per page.
+    """
+    return address & 0xFF00
+
+
+def firmware_key(identity: Mapping[str, list[int]]) -> str | None:
+    """Return the cache key for a unit: its model and firmware words in hex."""
+    firmware = identity.get("firmware_version")
+    if not firmware:
+        return None
+    words = [*identity.get("controller_model", ()), *firmware]
+    return "-".join(f"{word:04X}" for word in words)
+
+
+@dataclass(slots=True)
+class Capabilities:
+    """What one firmware answers: missing registers and block size limits."""
+
+    # (register type, address) the device rejects or never answers
+    unsupported: set[tuple[str, int]] = field(default_factory=set)
+    # (register type, page) -> largest block accepted, if below the PDU limit
+    max_block: dict[tuple[str, int], int] = field(default_factory=dict)
+    # False if some reads went unanswered; not stored, so the firmware is
+    # probed again instead of caching the gaps
+    complete: bool = True
+
+    def supports(self, register_type: str, address: int, count: int = 1) -> bool:
+        """Return True if every register of the value answers."""
+        register_type = register_type.lower()
+        return not any(
+            (register_type, addr) in self.unsupported
+            for addr in range(address, address + count)
+        )
+
+    def block_limit(self, register_type: str, address: int) -> int:
+        """Return the largest block the device accepts at address."""
+        return self.max_block.get(
+            (register_type.lower(), register_page(address)), MAX_REGISTERS_PER_READ
+        )
+
+    def accepts(self, register_type: str, start: int, end: int) -> bool:
+        """Return True if registers start..end-1 can be read in one request."""
+        return end - start <= min(
+            self.block_limit(register_type, start),
+            self.block_limit(register_type, end - 1),
+        ) and self.supports(register_type, start, end - start)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the JSON form stored per firmware."""
+        return {
+            "unsupported": sorted(
+                [reg_type, addr] for reg_type, addr in self.unsupported
+            ),
+            "max_block": [
+                [reg_type, page, limit]
+                for (reg_type, page), limit in sorted(self.max_block.items())
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, stored: Any) -> Capabilities | None:
+        """Parse stored capabilities, or return None if they are unusable."""
+        try:
+            return cls(
+                unsupported={
+                    (str(reg_type), int(addr))
+                    for reg_type, addr in stored["unsupported"]
+                },
+                max_block={
+                    (str(reg_type), int(page)): int(limit)
+                    for reg_type, page, limit in stored["max_block"]
+                },
+            )
+        except (KeyError, TypeError, ValueError) as err:
+            _LOGGER.warning("Ignoring unreadable register capabilities: %s", err)
+            return None
+
+
+async def probe_capabilities(
+    read: ProbeRead, spans: Iterable[ProbeSpan]
+) -> Capabilities | None:
+    """Discover which of the spans answer and the block size each page takes.
+
+    Contiguous values of a page are read in one block first; the values of
+    a rejected block are then read one at a time to find the missing ones,
+    and a binary search finds the largest block size the rest is read with.
+
+    Only illegal function, data address and data value exceptions count as
+    rejections. A block that goes unanswered is not resolved further, as
+    every read of it may cost a timeout: its registers and the block size
+    stay unknown and the result is marked incomplete. Returns None if nothing
+    answered at all, since that is an outage rather than a property of the
+    firmware.
+    """
+    pages: defaultdict[tuple[str, int], set[tuple[int, int]]] = defaultdict(set)
+    for register_type, address, count in spans:
+        pages[(register_type.lower(), register_page(address))].add((address, count))
+
+    capabilities = Capabilities()
+    answered = False
+
+    async def read_block(block: ReadBlock) -> bool | None:
+        """Return True if read, False if rejected and None if unanswered."""
+        nonlocal answered
+        result = await read(block.register_type, block.address, block.count)
+        if result.registers is not None:
+            answered = True
+            return True
+        if result.exception_code in _REJECTIONS:
+            answered = True
+            return False
+        capabilities.complete = False
+        return None
+
+    def plan(
+        register_type: str, values: Iterable[tuple[int, int]], limit: int
+    ) -> list[ReadBlock]:
+        return plan_reads(
+            ((0, register_type, address, count) for address, count in values),
+            max_gap=0,
+            max_count=limit,
+            accept=lambda _, reg_type, start, end: capabilities.supports(
+                reg_type, start, end - start
+            ),
+        )
+
+    for (register_type, page), values in sorted(pages.items()):
+        rejected = []
+        unanswered = []
+        for block in plan(register_type, values, MAX_REGISTERS_PER_READ):
+            ok = await read_block(block)
+            if ok is False:
+                rejected.append(block)
+            elif ok is None:
+                unanswered.append(block)
+        if not rejected:
+            continue
+
+        for block in rejected:
+            for address, count in sorted(values):
+                if block.contains(address) and (
+                    await read_block(ReadBlock(0, register_type, address, count))
+                    is False
+                ):
+                    capabilities.unsupported.update(
+                        (register_type, addr)
+                        for addr in range(address, address + count)
+                    )
+
+        # Blocks may also have failed for their size alone: search for the
+        # largest size every block of the page is read with
+        supported = [
+            (address, count)
+            for address, count in values
+            if capabilities.supports(register_type, address, count)
+            and not any(block.contains(address) for block in unanswered)
+        ]
+        if not supported:
+            continue
+        good = max(count for _, count in supported)  # values read on their own
+        bad = None  # smallest block size seen rejected
+        limit = MAX_REGISTERS_PER_READ
+        while True:
+            results = [
+                (block.count, await read_block(block))
+                for block in plan(register_type, supported, limit)
+                if block.count > good
+            ]
+            failed = [count for count, ok in results if ok is False]
+            if failed:
+                bad = min(failed)
+            elif all(ok for _, ok in results):
+                good = max(good, limit)
+            else:
+                break  # unanswered; the limit stays unknown
+            if bad is None or bad - good <= 1:
+                break
+            limit = (good + bad) // 2
+        if bad is not None:
+            capabilities.max_block[(register_type, page)] = min(good, bad - 1)
+
+    if not answered:
+        return None
+    _LOGGER.debug(
+        "Probe found %d unsupported registers and %d block limits%s",
+        len(capabilities.unsupported),
+        len(capabilities.max_block),
+        "" if capabilities.complete else "; some reads went unanswered",
+    )
+    return capabilities
@@ -0,0 +1,97 @@
+"""Charging profile validation and encoding for one FC16 bulk write."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any
+
+# The profile is the contiguous holding range 0x9000-0x900E
+PROFILE_START = 0x9000
+PROFILE_KEYS = (
+    "battery_type",
+    "battery_capacity",
+    "temperature_compensation_coeff",
+    "high_volt_disconnect",
+    "charging_limit_voltage",
+    "over_voltage_reconnect",
+    "equalization_voltage",
+    "boost_voltage",
+    "float_voltage",
+    "boost_reconnect_voltage",
+    "low_voltage_reconnect",
+    "under_voltage_recover",
+    "under_voltage_warning",
+    "low_voltage_disconnect",
+    "discharging_limit_voltage",
+)
+PROFILE_COUNT = len(PROFILE_KEYS)
+
+# (higher, lower, strict): the controller rejects profiles violating these
+ORDERING_RULES = (
+    ("high_volt_disconnect", "charging_limit_voltage", True),
+    ("high_volt_disconnect", "over_voltage_reconnect", True),
+    ("charging_limit_voltage", "equalization_voltage", False),
+    ("equalization_voltage", "boost_voltage", False),
+    ("boost_voltage", "float_voltage", False),
+    ("float_voltage", "boost_reconnect_voltage", True),
+    ("boost_reconnect_voltage", "low_voltage_reconnect", True),
+    ("low_voltage_reconnect", "low_voltage_disconnect", True),
+    ("low_voltage_disconnect", "discharging_limit_voltage", False),
+    ("under_voltage_recover", "under_voltage_warning", True),
+    ("under_voltage_warning", "discharging_limit_voltage", False),
+)
+
+
+class ChargingProfileError(ValueError):
+    """Raised when a charging profile is incomplete or inconsistent."""
+
+
+def decode_profile(
+    registers: list[int | None], definitions: Mapping[int, Mapping[str, Any]]
+) -> dict[str, float]:
+    """Return the profile values held in the raw 0x9000-0x900E registers.
+
+    Registers that are None (not read yet) are left out of the result.
+    """
+    profile = {}
+    for offset, (key, raw) in enumerate(zip(PROFILE_KEYS, registers, strict=False)):
+        if raw is None:
+            continue
+        reg = definitions[PROFILE_START + offset]
+        profile[key] = round(raw * reg.get("scale", 1), reg.get("precision", 0))
+    return profile
+
+
+def encode_profile(
+    profile: Mapping[str, float], definitions: Mapping[int, Mapping[str, Any]]
+) -> list[int]:
+    """Validate a complete profile and return the raw registers to write.
+
+    Every value must lie inside its definition's min/max and the voltage
+    thresholds must keep the ordering the controller enforces; all problems
+    are reported together.
+    """
+    missing = [key for key in PROFILE_KEYS if profile.get(key) is None]
+    if missing:
+        raise ChargingProfileError(f"Missing profile values: {', '.join(missing)}")
+
+    errors = []
+    registers = []
+    for offset, key in enumerate(PROFILE_KEYS):
+        reg = definitions[PROFILE_START + offset]
+        value = profile[key]
+        if not reg.get("min", value) <= value <= reg.get("max", value):
+            errors.append(f"{key}={value} outside {reg['min']}..{reg['max']}")
+        registers.append(round(value / reg.get("scale", 1)))
+
+    raw = dict(zip(PROFILE_KEYS, registers, strict=True))
+    for higher, lower, strict in ORDERING_RULES:
+        if raw[higher] < raw[lower] or (strict and raw[higher] == raw[lower]):
+            relation = ">" if strict else ">="
+            errors.append(
+                f"{higher} ({profile[higher]}) must be {relation} "
+                f"{lower} ({profile[lower]})"
+            )
+    if errors:
+        raise ChargingProfileError("; ".join(errors))
+    return registers
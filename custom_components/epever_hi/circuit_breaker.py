@@ -0,0 +1,96 @@
+"""Circuit breaker with jittered exponential backoff for Modbus connections."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+import random
+import time
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Track connection health and decide when a connect attempt is allowed.
+
+    closed:    connection attempts are allowed.
+    open:      attempts fail fast until the backoff delay has elapsed.
+    half_open: one probe attempt is in flight; everyone else fails fast.
+
+    Every failed probe doubles the delay (up to ``max_delay``) and the delay
+    is spread by ``jitter`` so many entries do not reconnect in lockstep.
+    """
+
+    def __init__(
+        self,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+        jitter: float = 0.2,
+        clock: Callable[[], float] = time.monotonic,
+        rng: Callable[[], float] = random.random,
+    ) -> None:
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self._clock = clock
+        self._rng = rng
+
+        self.state = STATE_CLOSED
+        self.trips = 0
+        self.consecutive_failures = 0
+        self._state_since = clock()
+        self._retry_at = 0.0
+
+    @property
+    def time_in_state(self) -> float:
+        """Return the seconds spent in the current state."""
+        return self._clock() - self._state_since
+
+    @property
+    def retry_in(self) -> float:
+        """Return the seconds until the next probe is allowed."""
+        if self.state != STATE_OPEN:
+            return 0.0
+        return max(0.0, self._retry_at - self._clock())
+
+    def allow_request(self) -> bool:
+        """Return True if a connection attempt may be made now."""
+        if self.state == STATE_CLOSED:
+            return True
+        if self.state == STATE_OPEN and self._clock() >= self._retry_at:
+            self._set_state(STATE_HALF_OPEN)
+            return True
+        return False
+
+    def record_success(self) -> None:
+        """Close the breaker after a successful connection."""
+        self.consecutive_failures = 0
+        if self.state != STATE_CLOSED:
+            self._set_state(STATE_CLOSED)
+
+    def record_failure(self) -> None:
+        """Open the breaker and schedule the next probe."""
+        self.consecutive_failures += 1
+        if self.state == STATE_CLOSED:
+            self.trips += 1
+        delay = min(
+            self.max_delay, self.base_delay * 2 ** (self.consecutive_failures - 1)
+        )
+        delay *= 1 + self.jitter * (2 * self._rng() - 1)
+        self._retry_at = self._clock() + delay
+        self._set_state(STATE_OPEN)
+
+    def as_dict(self) -> dict[str, float | int | str]:
+        """Return the breaker statistics for diagnostics."""
+        return {
+            "state": self.state,
+            "time_in_state": round(self.time_in_state, 3),
+            "trips": self.trips,
+            "consecutive_failures": self.consecutive_failures,
+            "retry_in": round(self.retry_in, 3),
+        }
+
+    def _set_state(self, state: str) -> None:
+        self.state = state
+        self._state_since = self._clock()
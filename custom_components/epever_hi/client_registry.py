@@ -0,0 +1,101 @@
+"""Process-wide registry sharing one Modbus connection per gateway."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN, LOGGER
+from .modbus_client import EpeverHiModbusClient
+from .rtu import DEFAULT_BAUDRATE
+
+# Key under hass.data[DOMAIN]; config entries are stored by their entry_id
+DATA_CLIENTS = "clients"
+
+# (host or device path, port or None for serial, framer)
+ClientKey = tuple[str, int | None, str]
+
+
+@dataclass
+class _SharedClient:
+    """A client plus the number of config entries using it."""
+
+    client: EpeverHiModbusClient
+    refs: int = 0
+
+
+def _client_key(host: str, port: int | None, framer: str) -> ClientKey:
+    framer = framer.lower()
+    # A serial device is identified by its path alone
+    return (host.lower(), None if framer == "serial" else port, framer)
+
+
+@callback
+def async_acquire_client(
+    hass: HomeAssistant,
+    host: str,
+    port: int | None,
+    framer: str = "tcp",
+    pipeline_depth: int = 1,
+    baudrate: int = DEFAULT_BAUDRATE,
+    parity: str = "N",
+    stopbits: int = 1,
+) -> EpeverHiModbusClient:
+    """Return the shared client for a gateway, creating it on first use.
+
+    Many RS485-to-TCP gateways accept a single TCP client, so every config
+    entry pointing at the same host, port and framer shares one connection.
+    A serial port can only be opened once, so entries on the same device
+    path share it the same way.
+    """
+    clients: dict[ClientKey, _SharedClient] = hass.data.setdefault(
+        DOMAIN, {}
+    ).setdefault(DATA_CLIENTS, {})
+    key = _client_key(host, port, framer)
+
+    shared = clients.get(key)
+    if shared is None:
+        shared = clients[key] = _SharedClient(
+            EpeverHiModbusClient(
+                host,
+                port,
+                framer=framer,
+                pipeline_depth=pipeline_depth,
+                baudrate=baudrate,
+                parity=parity,
+                stopbits=stopbits,
+            )
+        )
+    elif shared.client.pipeline_depth != pipeline_depth:
+        LOGGER.warning(
+            "Gateway %s is shared; keeping pipeline depth %d instead of %d",
+            shared.client.endpoint,
+            shared.client.pipeline_depth,
+            pipeline_depth,
+        )
+
+    shared.refs += 1
+    LOGGER.debug("Acquired Modbus client %s (%d users)", key, shared.refs)
+    return shared.client
+
+
+async def async_release_client(
+    hass: HomeAssistant, client: EpeverHiModbusClient
+) -> None:
+    """Drop one reference; the socket is closed when the last user releases it."""
+    clients: dict[ClientKey, _SharedClient] = hass.data.get(DOMAIN, {}).get(
+        DATA_CLIENTS, {}
+    )
+    key = _client_key(client.host, client.port, client.framer)
+
+    shared = clients.get(key)
+    if shared is None or shared.client is not client:
+        await client.close()
+        return
+
+    shared.refs -= 1
+    LOGGER.debug("Released Modbus client %s (%d users)", key, shared.refs)
+    if shared.refs <= 0:
+        del clients[key]
+        await client.close()
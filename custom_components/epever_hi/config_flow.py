@@ -2,27 +2,76 @@ from __future__ import annotations
 
 from homeassistant import config_entries
 from homeassistant.const import CONF_HOST, CONF_NAME, CONF_PORT
+from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
+import homeassistant.helpers.config_validation as cv
 import voluptuous as vol
 
-from .const import CONF_CONNECTION_TYPE, CONF_REGISTER_TYPE, CONF_SLAVE, DOMAIN
+from .const import (
+    CONF_BAUDRATE,
+    CONF_CONNECTION_TYPE,
+    CONF_HISTORY_HOURS,
+    CONF_MAX_READ_GAP,
+    CONF_PARITY,
+    CONF_PIPELINE_DEPTH,
+    CONF_REGISTER_GROUPS,
+    CONF_REGISTER_TYPE,
+    CONF_SCAN_INTERVAL,
+    CONF_SLAVE,
+    CONF_STOPBITS,
+    CONF_WRITE_DEBOUNCE_MS,
+    DEFAULT_HISTORY_HOURS,
+    DEFAULT_PORT,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_WRITE_DEBOUNCE_MS,
+    DOMAIN,
+    REGISTER_GROUPS,
+    parse_slave_ids,
+)
+from .read_planner import DEFAULT_MAX_READ_GAP
+from .rtu import BAUDRATES, DEFAULT_BAUDRATE, PARITIES
 
 
 class EpeverHiConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for EPEVER Hi Solar Charge Controller."""
 
-    VERSION = 1
+    # 2: entity unique IDs are scoped to the entry (see async_migrate_entry)
+    VERSION = 2
 
     def __init__(self):
         self._errors = {}
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> EpeverHiOptionsFlow:
+        """Return the options flow for this handler."""
+        return EpeverHiOptionsFlow()
+
     async def async_step_user(self, user_input=None) -> FlowResult:
+        self._errors = {}
         if user_input is not None:
+            # Parallel units on one bus are entered as "1, 2, 3"
+            try:
+                user_input[CONF_SLAVE] = parse_slave_ids(user_input[CONF_SLAVE])
+            except ValueError:
+                self._errors[CONF_SLAVE] = "invalid_slave"
+            if user_input[CONF_CONNECTION_TYPE] == "serial":
+                # A serial device is addressed by its path alone
+                user_input.pop(CONF_PORT, None)
+            else:
+                user_input.setdefault(CONF_PORT, DEFAULT_PORT)
+
+        if user_input is not None and not self._errors:
+            # Entries may share a gateway, but each unit ID belongs to one entry
             existing = [
                 entry
                 for entry in self._async_current_entries()
                 if entry.data[CONF_HOST] == user_input[CONF_HOST]
-                and entry.data[CONF_PORT] == user_input[CONF_PORT]
+                and entry.data.get(CONF_PORT) == user_input.get(CONF_PORT)
+                and set(parse_slave_ids(entry.data[CONF_SLAVE]))
+                & set(user_input[CONF_SLAVE])
             ]
             if existing:
                 return self.async_abort(reason="already_configured")
@@ -33,16 +82,73 @@ class EpeverHiConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             data_schema=vol.Schema(
                 {
                     vol.Required(CONF_NAME, default="EPEVER Hi Solar Controller"): str,
+                    # IP address, or the device path for a serial connection
                     vol.Required(CONF_HOST): str,
-                    vol.Required(CONF_PORT, default=502): int,
-                    vol.Required(CONF_SLAVE, default=1): int,
+                    # Not used by serial connections
+                    vol.Optional(
+                        CONF_PORT, description={"suggested_value": DEFAULT_PORT}
+                    ): int,
+                    vol.Required(CONF_SLAVE, default="1"): str,
                     vol.Required(CONF_CONNECTION_TYPE, default="tcp"): vol.In(
-                        ["tcp", "rtu"]
+                        ["tcp", "rtu", "serial"]
                     ),
                     vol.Required(CONF_REGISTER_TYPE, default="holding"): vol.In(
                         ["holding", "input"]
                     ),
+                    vol.Optional(
+                        CONF_MAX_READ_GAP, default=DEFAULT_MAX_READ_GAP
+                    ): vol.All(int, vol.Range(min=0, max=124)),
+                    vol.Optional(CONF_PIPELINE_DEPTH, default=1): vol.All(
+                        int, vol.Range(min=1, max=16)
+                    ),
+                    vol.Optional(
+                        CONF_WRITE_DEBOUNCE_MS, default=DEFAULT_WRITE_DEBOUNCE_MS
+                    ): vol.All(int, vol.Range(min=0, max=5000)),
+                    vol.Optional(CONF_BAUDRATE, default=DEFAULT_BAUDRATE): vol.In(
+                        BAUDRATES
+                    ),
+                    vol.Optional(CONF_PARITY, default="N"): vol.In(PARITIES),
+                    vol.Optional(CONF_STOPBITS, default=1): vol.In([1, 2]),
                 }
             ),
             errors=self._errors,
         )
+
+
+class EpeverHiOptionsFlow(config_entries.OptionsFlow):
+    """Choose the polled register groups, poll interval and history length.
+
+    Saving reloads the entry, so disabled groups stop being polled right away.
+    """
+
+    async def async_step_init(self, user_input=None) -> FlowResult:
+        errors = {}
+        if user_input is not None:
+            if not user_input[CONF_REGISTER_GROUPS]:
+                errors[CONF_REGISTER_GROUPS] = "no_register_groups"
+            else:
+                return self.async_create_entry(data=user_input)
+
+        options = self.config_entry.options
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_REGISTER_GROUPS,
+                        default=options.get(
+                            CONF_REGISTER_GROUPS, list(REGISTER_GROUPS)
+                        ),
+                    ): cv.multi_select(REGISTER_GROUPS),
+                    vol.Required(
+                        CONF_SCAN_INTERVAL,
+                        default=options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL),
+                    ): vol.All(int, vol.Range(min=1, max=300)),
+                    vol.Required(
+                        CONF_HISTORY_HOURS,
+                        default=options.get(CONF_HISTORY_HOURS, DEFAULT_HISTORY_HOURS),
+                    ): vol.All(int, vol.Range(min=0, max=48)),
+                }
+            ),
+            errors=errors,
+        )
@@ -6,9 +6,58 @@ DOMAIN = "epever_hi"
 CONF_SLAVE = "slave"
 CONF_CONNECTION_TYPE = "connection_type"
 CONF_REGISTER_TYPE = "register_type"
+CONF_MAX_READ_GAP = "max_read_gap"
+CONF_PIPELINE_DEPTH = "pipeline_depth"
+CONF_WRITE_DEBOUNCE_MS = "write_debounce_ms"
+CONF_REGISTER_GROUPS = "register_groups"
+CONF_SCAN_INTERVAL = "scan_interval"
+# Modbus TCP port, for the tcp and rtu (RTU over TCP) connection types
+DEFAULT_PORT = 502
+CONF_HISTORY_HOURS = "history_hours"
+# Serial line settings, used with the "serial" connection type
+CONF_BAUDRATE = "baudrate"
+CONF_PARITY = "parity"
+CONF_STOPBITS = "stopbits"
+
+# Writes from number/select entities within this window collapse into one
+DEFAULT_WRITE_DEBOUNCE_MS = 300
 
 LOGGER = logging.getLogger(__package__)
 
+# Poll tiers: seconds between reads of a register, None means read once.
+# "fast" registers are read on every coordinator tick.
+POLL_TIER_FAST = "fast"
+POLL_TIER_NORMAL = "normal"
+POLL_TIER_SLOW = "slow"
+POLL_TIER_ONCE = "once"
+POLL_TIER_INTERVALS = {
+    POLL_TIER_FAST: 0,
+    POLL_TIER_NORMAL: 15,
+    POLL_TIER_SLOW: 60,
+    POLL_TIER_ONCE: None,
+}
+DEFAULT_POLL_TIER = POLL_TIER_FAST
+
+# Register groups that can be switched off in the options flow; entities of
+# a disabled group are not created and their registers are never polled
+GROUP_GRID = "grid"
+GROUP_PV = "pv"
+GROUP_LOAD = "load"
+GROUP_BATTERY = "battery"
+GROUP_CONFIG = "config"
+GROUP_STATUS = "status"
+REGISTER_GROUPS = {
+    GROUP_GRID: "Grid / utility",
+    GROUP_PV: "PV array",
+    GROUP_LOAD: "Load",
+    GROUP_BATTERY: "Battery",
+    GROUP_CONFIG: "Settings and controls",
+    GROUP_STATUS: "Status flags",
+}
+DEFAULT_SCAN_INTERVAL = 3  # seconds between coordinator ticks
+# Raw register samples kept in memory for charts (0 = keep none)
+DEFAULT_HISTORY_HOURS = 24
+
 # EPEVER Hi Solar Charge Controller Register Definitions
 # Based on EPEVER Hi Modbus Protocol Documentation
 
@@ -16,6 +65,7 @@ SENSOR_DEFINITIONS_NEW = {
     # Grid/Utility sensors
     0x3500: {
         "key": "grid_voltage",
+        "group": "grid",
         "name": "Grid Voltage",
         "unit": "V",
         "scale": 0.01,
@@ -26,6 +76,7 @@ SENSOR_DEFINITIONS_NEW = {
     },
     0x3501: {
         "key": "grid_current",
+        "group": "grid",
         "name": "Grid Current",
         "unit": "A",
         "scale": 0.01,
@@ -36,15 +87,18 @@ SENSOR_DEFINITIONS_NEW = {
     },
     0x3511: {
         "key": "grid_state",
+        "group": "grid",
         "name": "Grid State",
         "unit": "",
         "scale": 1,
         "precision": 0,
         "readable": True,
         "register_type": "input",
+        "poll_tier": "normal",
     },
     0x350F: {
         "key": "grid_total",
+        "group": "grid",
         "name": "Grid Total",
         "unit": "kWh",
         "scale": 0.01,
@@ -54,10 +108,12 @@ SENSOR_DEFINITIONS_NEW = {
         "swap": "word",
         "readable": True,
         "register_type": "input",
+        "poll_tier": "slow",
     },
     # PV Array sensors
     0x3549: {
         "key": "pv_voltage",
+        "group": "pv",
         "name": "PV Voltage",
         "unit": "V",
         "scale": 0.01,
@@ -68,6 +124,7 @@ SENSOR_DEFINITIONS_NEW = {
     },
     0x354A: {
         "key": "pv_current",
+        "group": "pv",
         "name": "PV Current",
         "unit": "A",
         "scale": 0.01,
@@ -78,6 +135,7 @@ SENSOR_DEFINITIONS_NEW = {
     },
     0x354B: {
         "key": "pv_power",
+        "group": "pv",
         "name": "PV Power",
         "unit": "W",
         "scale": 0.01,
@@ -90,6 +148,7 @@ SENSOR_DEFINITIONS_NEW = {
     },
     0x3557: {
         "key": "pv_total",
+        "group": "pv",
         "name": "PV Total",
         "unit": "kWh",
         "scale": 0.01,
@@ -99,10 +158,12 @@ SENSOR_DEFINITIONS_NEW = {
         "swap": "word",
         "readable": True,
         "register_type": "input",
+        "poll_tier": "slow",
     },
     # Load sensors
     0x3521: {
         "key": "load_voltage",
+        "group": "load",
         "name": "Load Voltage",
         "unit": "V",
         "scale": 0.01,
@@ -113,6 +174,7 @@ SENSOR_DEFINITIONS_NEW = {
     },
     0x3522: {
         "key": "load_current",
+        "group": "load",
         "name": "Load Current",
         "unit": "A",
         "scale": 0.01,
@@ -123,6 +185,7 @@ SENSOR_DEFINITIONS_NEW = {
     },
     0x3530: {
         "key": "load_total",
+        "group": "load",
         "name": "Load Total",
         "unit": "kWh",
         "scale": 0.01,
@@ -132,10 +195,12 @@ SENSOR_DEFINITIONS_NEW = {
         "swap": "word",
         "readable": True,
         "register_type": "input",
+        "poll_tier": "slow",
     },
     # Battery sensors
     0x3580: {
         "key": "battery_voltage",
+        "group": "battery",
         "name": "Battery Voltage",
         "unit": "V",
         "scale": 0.01,
@@ -146,6 +211,7 @@ SENSOR_DEFINITIONS_NEW = {
     },
     0x3581: {
         "key": "battery_current",
+        "group": "battery",
         "name": "Battery Current",
         "unit": "A",
         "scale": 0.01,
@@ -156,6 +222,7 @@ SENSOR_DEFINITIONS_NEW = {
     },
     0x3586: {
         "key": "battery_capacity",
+        "group": "battery",
         "name": "Battery Capacity",
         "unit": "%",
         "scale": 1,
@@ -163,9 +230,11 @@ SENSOR_DEFINITIONS_NEW = {
         "device_class": "battery",
         "readable": True,
         "register_type": "input",
+        "poll_tier": "normal",
     },
     0x3512: {
         "key": "battery_temp",
+        "group": "battery",
         "name": "Battery Temp",
         "unit": "°C",
         "scale": 0.01,
@@ -173,18 +242,22 @@ SENSOR_DEFINITIONS_NEW = {
         "device_class": "temperature",
         "readable": True,
         "register_type": "input",
+        "poll_tier": "normal",
     },
     0x3589: {
         "key": "battery_state",
+        "group": "battery",
         "name": "Battery State",
         "unit": "",
         "scale": 1,
         "precision": 0,
         "readable": True,
         "register_type": "input",
+        "poll_tier": "normal",
     },
     0x3533: {
         "key": "inverter_temp",
+        "group": "battery",
         "name": "Inverter Temp",
         "unit": "°C",
         "scale": 0.01,
@@ -192,6 +265,7 @@ SENSOR_DEFINITIONS_NEW = {
         "device_class": "temperature",
         "readable": True,
         "register_type": "input",
+        "poll_tier": "normal",
     },
 }
 
@@ -200,6 +274,7 @@ REGISTER_DEFINITIONS = {
     # Battery Settings
     0x9000: {
         "key": "battery_type",
+        "group": "config",
         "name": "Battery Type",
         "unit": "",
         "scale": 1,
@@ -209,9 +284,11 @@ REGISTER_DEFINITIONS = {
         "readable": True,
         "writable": True,
         "register_type": "holding",
+        "poll_tier": "slow",
     },
     0x9001: {
         "key": "battery_capacity",
+        "group": "config",
         "name": "Battery Capacity",
         "unit": "Ah",
         "scale": 1,
@@ -221,9 +298,11 @@ REGISTER_DEFINITIONS = {
         "readable": True,
         "writable": True,
         "register_type": "holding",
+        "poll_tier": "slow",
     },
     0x9002: {
         "key": "temperature_compensation_coeff",
+        "group": "config",
         "name": "Temperature Compensation Coefficient",
         "unit": "mV/°C/2V",
         "scale": 1,
@@ -232,9 +311,11 @@ REGISTER_DEFINITIONS = {
         "max": 9,
         "readable": True,
         "writable": True,
+        "poll_tier": "slow",
     },
     0x9003: {
         "key": "high_volt_disconnect",
+        "group": "config",
         "name": "High Voltage Disconnect",
         "unit": "V",
         "device_class": "voltage",
@@ -244,9 +325,11 @@ REGISTER_DEFINITIONS = {
         "max": 17,
         "readable": True,
         "writable": True,
+        "poll_tier": "slow",
     },
     0x9004: {
         "key": "charging_limit_voltage",
+        "group": "config",
         "name": "Charging Limit Voltage",
         "unit": "V",
         "device_class": "voltage",
@@ -256,9 +339,11 @@ REGISTER_DEFINITIONS = {
         "max": 17,
         "readable": True,
         "writable": True,
+        "poll_tier": "slow",
     },
     0x9005: {
         "key": "over_voltage_reconnect",
+        "group": "config",
         "name": "Over Voltage Reconnect",
         "unit": "V",
         "device_class": "voltage",
@@ -268,9 +353,11 @@ REGISTER_DEFINITIONS = {
         "max": 17,
         "readable": True,
         "writable": True,
+        "poll_tier": "slow",
     },
     0x9006: {
         "key": "equalization_voltage",
+        "group": "config",
         "name": "Equalization Voltage",
         "unit": "V",
         "device_class": "voltage",
@@ -280,9 +367,11 @@ REGISTER_DEFINITIONS = {
         "max": 17,
         "readable": True,
         "writable": True,
+        "poll_tier": "slow",
     },
     0x9007: {
         "key": "boost_voltage",
+        "group": "config",
         "name": "Boost Voltage",
         "unit": "V",
         "device_class": "voltage",
@@ -292,9 +381,11 @@ REGISTER_DEFINITIONS = {
         "max": 17,
         "readable": True,
         "writable": True,
+        "poll_tier": "slow",
     },
     0x9008: {
         "key": "float_voltage",
+        "group": "config",
         "name": "Float Voltage",
         "unit": "V",
         "device_class": "voltage",
@@ -304,9 +395,11 @@ REGISTER_DEFINITIONS = {
         "max": 17,
         "readable": True,
         "writable": True,
+        "poll_tier": "slow",
     },
     0x9009: {
         "key": "boost_reconnect_voltage",
+        "group": "config",
         "name": "Boost Reconnect Voltage",
         "unit": "V",
         "device_class": "voltage",
@@ -316,9 +409,11 @@ REGISTER_DEFINITIONS = {
         "max": 17,
         "readable": True,
         "writable": True,
+        "poll_tier": "slow",
     },
     0x900A: {
         "key": "low_voltage_reconnect",
+        "group": "config",
         "name": "Low Voltage Reconnect",
         "unit": "V",
         "device_class": "voltage",
@@ -328,9 +423,11 @@ REGISTER_DEFINITIONS = {
         "max": 17,
         "readable": True,
         "writable": True,
+        "poll_tier": "slow",
     },
     0x900B: {
         "key": "under_voltage_recover",
+        "group": "config",
         "name": "Under Voltage Recover",
         "unit": "V",
         "device_class": "voltage",
@@ -340,9 +437,11 @@ REGISTER_DEFINITIONS = {
         "max": 17,
         "readable": True,
         "writable": True,
+        "poll_tier": "slow",
     },
     0x900C: {
         "key": "under_voltage_warning",
+        "group": "config",
         "name": "Under Voltage Warning",
         "unit": "V",
         "device_class": "voltage",
@@ -352,9 +451,11 @@ REGISTER_DEFINITIONS = {
         "max": 17,
         "readable": True,
         "writable": True,
+        "poll_tier": "slow",
     },
     0x900D: {
         "key": "low_voltage_disconnect",
+        "group": "config",
         "name": "Low Voltage Disconnect",
         "unit": "V",
         "device_class": "voltage",
@@ -364,9 +465,11 @@ REGISTER_DEFINITIONS = {
         "max": 17,
         "readable": True,
         "writable": True,
+        "poll_tier": "slow",
     },
     0x900E: {
         "key": "discharging_limit_voltage",
+        "group": "config",
         "name": "Discharging Limit Voltage",
         "unit": "V",
         "device_class": "voltage",
@@ -376,10 +479,12 @@ REGISTER_DEFINITIONS = {
         "max": 17,
         "readable": True,
         "writable": True,
+        "poll_tier": "slow",
     },
     # Control registers - holding registers
     0x9607: {
         "key": "charging_mode",
+        "group": "config",
         "name": "Charging Mode",
         "unit": "",
         "scale": 1,
@@ -389,9 +494,11 @@ REGISTER_DEFINITIONS = {
         "readable": True,
         "writable": True,
         "register_type": "holding",
+        "poll_tier": "slow",
     },
     0x9608: {
         "key": "inverter_mode",
+        "group": "config",
         "name": "Inverter Mode",
         "unit": "",
         "scale": 1,
@@ -401,12 +508,14 @@ REGISTER_DEFINITIONS = {
         "readable": True,
         "writable": True,
         "register_type": "holding",
+        "poll_tier": "slow",
     },
 }
 
 SWITCH_DEFINITIONS = {
     0x0002: {
         "key": "manual_control_load",
+        "group": "config",
         "name": "Manual Control Load",
         "unit": "",
         "device_class": "switch",
@@ -414,21 +523,25 @@ SWITCH_DEFINITIONS = {
         "writable": True,
         "entity_type": "switch",
         "register_type": "holding",
+        "poll_tier": "normal",
     },
     0x0005: {
         "key": "enable_load_test",
+        "group": "config",
         "name": "Enable Load Test",
         "unit": "",
         "device_class": "switch",
         "readable": True,
         "writable": True,
         "entity_type": "switch",
+        "poll_tier": "normal",
     },
 }
 
 BUTTON_DEFINITIONS = {
     0x0001: {
         "key": "reset_charging_parameters",
+        "group": "config",
         "name": "Reset Charging Parameters",
         "unit": "",
         "device_class": "restart",
@@ -436,24 +549,29 @@ BUTTON_DEFINITIONS = {
         "writable": True,
         "entity_type": "button",
         "register_type": "holding",
+        "poll_tier": "once",
     },
     0x0003: {
         "key": "force_load_on",
+        "group": "config",
         "name": "Force Load On",
         "unit": "",
         "device_class": "restart",
         "readable": True,
         "writable": True,
         "entity_type": "button",
+        "poll_tier": "once",
     },
     0x0004: {
         "key": "force_load_off",
+        "group": "config",
         "name": "Force Load Off",
         "unit": "",
         "device_class": "restart",
         "readable": True,
         "writable": True,
         "entity_type": "button",
+        "poll_tier": "once",
     },
 }
 
@@ -469,6 +587,8 @@ NUMBER_DEFINITIONS = [
         "scale": reg.get("scale", 1),
         "precision": reg.get("precision", 0),
         "register_type": reg.get("register_type", "holding"),
+        "poll_tier": reg.get("poll_tier", DEFAULT_POLL_TIER),
+        "group": reg["group"],
         "unique_id": f"epever_hi_number_{reg['key']}",
     }
     for addr, reg in REGISTER_DEFINITIONS.items()
@@ -479,6 +599,7 @@ NUMBER_DEFINITIONS = [
 SELECT_DEFINITIONS = {
     0x9000: {
         "key": "battery_type",
+        "group": "config",
         "name": "Battery Type",
         "type": "uns16",
         "dataLength": 1,
@@ -494,6 +615,7 @@ SELECT_DEFINITIONS = {
             6: "LiTernary",
             7: "LiTi",
         },
+        "poll_tier": "slow",
     },
 }
 
@@ -501,6 +623,7 @@ SELECT_DEFINITIONS = {
 DIAGNOSTIC_DEFINITIONS = {
     0x3200: {
         "type": "uint16",
+        "group": "status",
         "entity_category": EntityCategory.DIAGNOSTIC,
         "register_type": "input",
         "bits": {
@@ -517,6 +640,7 @@ DIAGNOSTIC_DEFINITIONS = {
     },
     0x3201: {
         "type": "uint16",
+        "group": "status",
         "entity_category": EntityCategory.DIAGNOSTIC,
         "register_type": "input",
         "bits": {
@@ -573,10 +697,102 @@ FIRMWARE_INFO = {
 }
 
 
-def get_device_info(entry_id: str):
+# Poll and transport metrics published as opt-in diagnostic sensors; keys
+# match EpeverHiModbusCoordinator.metrics_snapshot()
+METRIC_SENSOR_DEFINITIONS = {
+    "poll_duration_p50": {
+        "name": "Poll Duration p50",
+        "unit": "ms",
+        "state_class": "measurement",
+    },
+    "poll_duration_p95": {
+        "name": "Poll Duration p95",
+        "unit": "ms",
+        "state_class": "measurement",
+    },
+    "requests_per_cycle": {
+        "name": "Requests per Poll",
+        "unit": None,
+        "state_class": "measurement",
+    },
+    "rtt_p50": {"name": "Modbus RTT p50", "unit": "ms", "state_class": "measurement"},
+    "rtt_p95": {"name": "Modbus RTT p95", "unit": "ms", "state_class": "measurement"},
+    "rtt_p99": {"name": "Modbus RTT p99", "unit": "ms", "state_class": "measurement"},
+    "request_failures": {
+        "name": "Modbus Request Failures",
+        "unit": None,
+        "state_class": "total_increasing",
+    },
+    "timeouts": {
+        "name": "Modbus Timeouts",
+        "unit": None,
+        "state_class": "total_increasing",
+    },
+    "reconnects": {
+        "name": "Modbus Reconnects",
+        "unit": None,
+        "state_class": "total_increasing",
+    },
+    "bytes_sent": {
+        "name": "Modbus Bytes Sent",
+        "unit": "B",
+        "state_class": "total_increasing",
+    },
+    "bytes_received": {
+        "name": "Modbus Bytes Received",
+        "unit": "B",
+        "state_class": "total_increasing",
+    },
+    "clamped_writes": {
+        "name": "Writes Adjusted by Device",
+        "unit": None,
+        "state_class": "total_increasing",
+    },
+    "quarantined_registers": {
+        "name": "Quarantined Registers",
+        "unit": None,
+        "state_class": "measurement",
+    },
+}
+
+
+def parse_slave_ids(value: int | str | list[int]) -> list[int]:
+    """Return the unit IDs from an int, a list or a comma separated string."""
+    if isinstance(value, int):
+        ids = [value]
+    elif isinstance(value, str):
+        ids = [int(part) for part in value.replace(" ", "").split(",") if part]
+    else:
+        ids = [int(part) for part in value]
+
+    if not ids or any(not 1 <= slave <= 247 for slave in ids):
+        raise ValueError(f"Invalid Modbus unit IDs: {value!r}")
+    # Keep the configured order, the first unit is the primary one
+    return list(dict.fromkeys(ids))
+
+
+def scoped_unique_id(entry_id: str, unique_id: str) -> str:
+    """Return an entity unique ID scoped to its config entry.
+
+    Entries may share a gateway and unit IDs repeat across gateways, so IDs
+    built from register keys alone would collide between entries.
+    """
+    return f"{entry_id}_{unique_id}"
+
+
+def get_device_info(entry_id: str, unit: int | None = None):
+    """Return device info; additional parallel units get a device of their own."""
+    if unit is None:
+        return {
+            "identifiers": {(DOMAIN, entry_id)},
+            "name": "EPEVER Hi Solar Charge Controller",
+            "manufacturer": "EPEVER",
+            "model": "Hi Series",
+        }
     return {
-        "identifiers": {(DOMAIN, entry_id)},
-        "name": "EPEVER Hi Solar Charge Controller",
+        "identifiers": {(DOMAIN, f"{entry_id}_unit{unit}")},
+        "name": f"EPEVER Hi Solar Charge Controller (unit {unit})",
         "manufacturer": "EPEVER",
         "model": "Hi Series",
+        "via_device": (DOMAIN, entry_id),
     }
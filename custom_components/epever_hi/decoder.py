@@ -0,0 +1,170 @@
+"""Compiled decode plan turning a register snapshot into entity values.
+
+Values wider than one register (uint32, int32, float32) are decoded from
+words that were read together in one block; ``swap`` selects the word and
+byte order the device uses for them.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass
+import struct
+from typing import Any
+
+RegisterKey = tuple[int, int]  # (slave, address)
+ValueKey = tuple[int, str]  # (slave, definition key)
+
+DecodeFunc = Callable[[Mapping[RegisterKey, int | None], int], Any]
+
+# data_type -> (struct used on the big-endian word bytes, number of registers)
+DATA_TYPES: dict[str, tuple[struct.Struct, int]] = {
+    "uint16": (struct.Struct(">H"), 1),
+    "int16": (struct.Struct(">h"), 1),
+    "uint32": (struct.Struct(">I"), 2),
+    "int32": (struct.Struct(">i"), 2),
+    "float32": (struct.Struct(">f"), 2),
+}
+
+# swap option -> (reverse word order, swap bytes inside each word)
+SWAP_MODES: dict[str, tuple[bool, bool]] = {
+    "none": (False, False),
+    "byte": (False, True),
+    "word": (True, False),
+    "word_byte": (True, True),
+}
+
+# Legacy "type" spellings found in the definition tables
+_TYPE_ALIASES = {"uns16": "uint16", "float32": "float32", "uint16": "uint16"}
+
+
+def data_type_of(definition: Mapping[str, Any]) -> str:
+    """Return the value type of a definition, defaulting to uint16."""
+    data_type = definition.get("data_type")
+    if data_type is None:
+        data_type = _TYPE_ALIASES.get(definition.get("type", "uint16"), "uint16")
+    if data_type not in DATA_TYPES:
+        raise ValueError(f"Unsupported data_type {data_type!r}")
+    return data_type
+
+
+def register_count(definition: Mapping[str, Any]) -> int:
+    """Return how many consecutive registers hold a definition's value."""
+    return DATA_TYPES[data_type_of(definition)][1]
+
+
+def in_register_groups(definition: Mapping[str, Any], groups: Iterable[str]) -> bool:
+    """Return True if a definition is polled with the given register groups.
+
+    Definitions without a group are always polled.
+    """
+    group = definition.get("group")
+    return group is None or group in groups
+
+
+def _compile_uint16(address: int, scale: float, precision: int) -> DecodeFunc:
+    if scale == 1:
+
+        def decode(data: Mapping[RegisterKey, int | None], slave: int) -> Any:
+            raw = data.get((slave, address))
+            return None if raw is None else round(raw, precision)
+
+    else:
+
+        def decode(data: Mapping[RegisterKey, int | None], slave: int) -> Any:
+            raw = data.get((slave, address))
+            return None if raw is None else round(raw * scale, precision)
+
+    return decode
+
+
+def _compile_words(
+    address: int,
+    data_type: str,
+    swap: str,
+    scale: float,
+    precision: int,
+) -> DecodeFunc:
+    value_struct, count = DATA_TYPES[data_type]
+    unpack = value_struct.unpack
+    offsets = range(count - 1, -1, -1) if SWAP_MODES[swap][0] else range(count)
+    byteorder = "little" if SWAP_MODES[swap][1] else "big"
+
+    def decode(data: Mapping[RegisterKey, int | None], slave: int) -> Any:
+        words = [data.get((slave, address + offset)) for offset in offsets]
+        if None in words:
+            # Never combine words from different reads: all or nothing
+            return None
+        try:
+            raw = b"".join(word.to_bytes(2, byteorder) for word in words)
+            value = unpack(raw)[0]
+        except (OverflowError, ValueError):
+            return None
+        return round(value * scale, precision)
+
+    return decode
+
+
+@dataclass(frozen=True, slots=True)
+class DecodeEntry:
+    """Everything needed to decode one definition, computed once."""
+
+    key: str
+    address: int
+    count: int
+    decode: DecodeFunc
+
+
+def compile_entry(address: int, definition: Mapping[str, Any]) -> DecodeEntry:
+    """Compile one register definition into a DecodeEntry."""
+    data_type = data_type_of(definition)
+    swap = definition.get("swap", "none")
+    if swap not in SWAP_MODES:
+        raise ValueError(f"Unsupported swap {swap!r} at 0x{address:04X}")
+    precision = definition.get("precision", 0)
+    # Legacy float32 definitions carry their own magnitude and are not scaled
+    scale = 1 if definition.get("type") == "float32" else definition.get("scale", 1)
+
+    if data_type == "uint16" and swap == "none":
+        decode = _compile_uint16(address, scale, precision)
+    else:
+        decode = _compile_words(address, data_type, swap, scale, precision)
+    return DecodeEntry(definition["key"], address, DATA_TYPES[data_type][1], decode)
+
+
+class DecodePlan:
+    """Decode a whole register snapshot into a value table in one pass.
+
+    The table is keyed by (slave, definition key); entities read their value
+    from it instead of decoding on every property access.
+    """
+
+    def __init__(self, definitions: Mapping[int, Mapping[str, Any]]) -> None:
+        self.entries = [compile_entry(addr, reg) for addr, reg in definitions.items()]
+        self._by_address: defaultdict[int, list[DecodeEntry]] = defaultdict(list)
+        for entry in self.entries:
+            for offset in range(entry.count):
+                self._by_address[entry.address + offset].append(entry)
+
+    def decode(
+        self, data: Mapping[RegisterKey, int | None], slaves: Iterable[int]
+    ) -> dict[ValueKey, Any]:
+        """Decode every definition for every unit."""
+        compiled = [(entry.key, entry.decode) for entry in self.entries]
+        return {
+            (slave, key): decode(data, slave)
+            for slave in slaves
+            for key, decode in compiled
+        }
+
+    def update(
+        self,
+        values: dict[ValueKey, Any],
+        data: Mapping[RegisterKey, int | None],
+        changed: Iterable[RegisterKey],
+    ) -> None:
+        """Re-decode only the definitions touching the changed registers."""
+        for slave, address in changed:
+            for entry in self._by_address.get(address, ()):
+                values[(slave, entry.key)] = entry.decode(data, slave)
@@ -0,0 +1,40 @@
+"""Diagnostics support for EPEVER Hi."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return connection health and poll metrics for a config entry."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    client = coordinator._client
+    return {
+        "connection": {
+            "host": client.host,
+            "port": client.port,
+            "framer": client.framer,
+            "connected": client.connected,
+            "pipelined": client.pipelined,
+        },
+        "circuit_breaker": client.breaker.as_dict(),
+        "metrics": coordinator.metrics_snapshot(),
+        "last_update_success": coordinator.last_update_success,
+        "snapshot": {
+            "stale": coordinator.stale,
+            "restored_at": coordinator.restored_at,
+            "units_with_identity": sorted(coordinator.identity),
+        },
+        "capabilities": {
+            slave: capabilities.as_dict()
+            for slave, capabilities in coordinator._poller.capabilities.items()
+        },
+        "history": coordinator.history.as_dict() if coordinator.history else None,
+    }
@@ -0,0 +1,89 @@
+"""Base entity for registers polled by the EPEVER Hi coordinator."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import DEFAULT_POLL_TIER, get_device_info, scoped_unique_id
+
+
+class EpeverHiEntity(CoordinatorEntity):
+    """Entity bound to one register address of one EPEVER Hi unit.
+
+    Unique IDs are scoped to the config entry. Entities of the primary unit
+    keep their key-based ID and the entry's device; every other unit on the
+    bus gets a "_unit<id>" suffix and its own device.
+    The coordinator context is the set of (slave, address) keys the entity
+    decodes, so it is only written when one of those registers changes.
+
+    The registers are polled only while the entity is added to Home
+    Assistant; entities disabled in the entity registry are never added and
+    cost no Modbus traffic.
+    """
+
+    def __init__(
+        self,
+        coordinator: Any,  # EpeverHiModbusCoordinator
+        address: int,
+        slave: int,
+        entry_id: str,
+        unique_id: str,
+        count: int = 1,
+        register_type: str | None = None,
+        poll_tier: str = DEFAULT_POLL_TIER,
+    ) -> None:
+        # Only updates touching these registers wake the entity
+        super().__init__(
+            coordinator,
+            context=frozenset((slave, address + offset) for offset in range(count)),
+        )
+        self._address = address
+        self._slave = slave
+        self._count = count
+        self._register_type = register_type
+        self._poll_tier = poll_tier
+        unit = None if slave == coordinator.primary_slave else slave
+
+        if unit is not None:
+            unique_id = f"{unique_id}_unit{unit}"
+        self._attr_unique_id = scoped_unique_id(entry_id, unique_id)
+        self._attr_device_info = DeviceInfo(**get_device_info(entry_id, unit))
+
+    @property
+    def available(self) -> bool:
+        """Return False for registers the unit lacks or that keep failing."""
+        return super().available and self.coordinator.register_available(
+            self._slave, self._address
+        )
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Flag values restored from the warm-start snapshot."""
+        if not self.coordinator.stale:
+            return None
+        return {"stale": True}
+
+    def _raw_value(self, offset: int = 0) -> int | None:
+        """Return the raw register value polled for this entity's unit."""
+        return self.coordinator.data.get((self._slave, self._address + offset))
+
+    async def async_added_to_hass(self) -> None:
+        """Start polling this entity's registers."""
+        await super().async_added_to_hass()
+        self.coordinator.register_address(
+            self._address,
+            self._register_type,
+            self._poll_tier,
+            self._slave,
+            count=self._count,
+        )
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Stop polling registers no other entity still uses."""
+        self.coordinator.unregister_address(
+            self._address, self._poll_tier, self._slave, count=self._count
+        )
+        await super().async_will_remove_from_hass()
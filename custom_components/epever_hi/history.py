@@ -0,0 +1,154 @@
+"""Fixed-memory history of raw register samples, kept at poll resolution.
+
+coordinator.data only holds the latest value per register, so looking back
+even a few minutes meant a recorder query. RegisterHistory keeps the last
+``capacity`` poll cycles in preallocated columns instead: one timestamp
+column shared by every register and an array('H') per register, about three
+bytes per register and cycle however long Home Assistant runs. Chart and
+analysis consumers slice it by time without a database round trip.
+
+Kept free of Home Assistant imports so it can be tested on its own.
+"""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left
+from collections.abc import Hashable, Mapping
+from dataclasses import dataclass
+from itertools import compress
+
+
+@dataclass(frozen=True, slots=True)
+class WindowStats:
+    """Summary of the raw values of one register within a time window."""
+
+    count: int
+    minimum: int
+    maximum: int
+    mean: float
+
+
+class RegisterHistory:
+    """Ring buffer of poll cycles with a shared time column.
+
+    Each register gets a value column and a validity column the first time
+    it has a value; cycles where it was not polled or its read failed are
+    marked invalid and skipped by the queries. Windows are half-open,
+    ``start <= timestamp < end``, in the timestamps passed to record().
+    """
+
+    def __init__(self, capacity: int) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self._times = array("d", bytes(8 * capacity))
+        self._values: dict[Hashable, array[int]] = {}
+        self._valid: dict[Hashable, bytearray] = {}
+        self._next = 0
+        self.count = 0  # cycles recorded since creation
+
+    def __len__(self) -> int:
+        return min(self.count, self.capacity)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._values
+
+    @property
+    def _oldest(self) -> int:
+        return self._next if self.count >= self.capacity else 0
+
+    @property
+    def nbytes(self) -> int:
+        """Return the memory held by the columns."""
+        return self.capacity * (
+            self._times.itemsize + 3 * len(self._values)  # 'H' value + valid flag
+        )
+
+    def record(self, timestamp: float, data: Mapping[Hashable, int | None]) -> None:
+        """Append one poll cycle, overwriting the oldest once the ring is full."""
+        slot = self._next
+        if self.count:
+            # Queries bisect the time column; never let a clock step break
+            # its order
+            timestamp = max(timestamp, self._times[slot - 1])
+        self._times[slot] = timestamp
+        for valid in self._valid.values():
+            valid[slot] = 0
+        for key, value in data.items():
+            if value is None:
+                continue
+            values = self._values.get(key)
+            if values is None:
+                values = self._values[key] = array("H", bytes(2 * self.capacity))
+                self._valid[key] = bytearray(self.capacity)
+            values[slot] = value
+            self._valid[key][slot] = 1
+        self._next = (slot + 1) % self.capacity
+        self.count += 1
+
+    def discard(self, key: Hashable) -> None:
+        """Free the columns of a register that is no longer polled."""
+        self._values.pop(key, None)
+        self._valid.pop(key, None)
+
+    def _segments(
+        self, start: float | None, end: float | None
+    ) -> list[tuple[int, int]]:
+        """Return the physical slot ranges of a window, oldest first."""
+        size = len(self)
+        oldest = self._oldest
+        times = self._times
+        capacity = self.capacity
+
+        def time_at(index: int) -> float:
+            return times[(oldest + index) % capacity]
+
+        first = 0 if start is None else bisect_left(range(size), start, key=time_at)
+        last = size if end is None else bisect_left(range(size), end, key=time_at)
+        if first >= last:
+            return []
+        begin = (oldest + first) % capacity
+        stop = begin + last - first
+        if stop <= capacity:
+            return [(begin, stop)]
+        return [(begin, capacity), (0, stop - capacity)]
+
+    def window(
+        self, key: Hashable, start: float | None = None, end: float | None = None
+    ) -> tuple[array[float], array[int]]:
+        """Return the timestamps and raw values of a register in a window."""
+        times: array[float] = array("d")
+        values: array[int] = array("H")
+        column = self._values.get(key)
+        if column is None:
+            return times, values
+        valid = self._valid[key]
+        for first, last in self._segments(start, end):
+            flags = valid[first:last]
+            times.extend(compress(self._times[first:last], flags))
+            values.extend(compress(column[first:last], flags))
+        return times, values
+
+    def stats(
+        self, key: Hashable, start: float | None = None, end: float | None = None
+    ) -> WindowStats | None:
+        """Return min/max/mean of a register in a window, or None if empty."""
+        _, values = self.window(key, start, end)
+        if not values:
+            return None
+        return WindowStats(
+            len(values), min(values), max(values), sum(values) / len(values)
+        )
+
+    def as_dict(self) -> dict[str, int | float | None]:
+        """Return the size and time span of the buffer for diagnostics."""
+        size = len(self)
+        return {
+            "capacity": self.capacity,
+            "samples": size,
+            "registers": len(self._values),
+            "bytes": self.nbytes,
+            "oldest": self._times[self._oldest] if size else None,
+            "newest": self._times[self._next - 1] if size else None,
+        }
@@ -9,8 +9,7 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import DOMAIN, FIRMWARE_INFO, get_device_info
-from .helpers import decode_modbus_value
+from .const import DOMAIN, FIRMWARE_INFO, get_device_info, scoped_unique_id
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -29,61 +28,51 @@ async def async_setup_entry(
     coordinator = hass.data[DOMAIN][entry.entry_id]
     sensors = []
 
-    for definition in SENSOR_DEFINITIONS:
-        sensors.append(
-            EpeverHiFirmwareSensor(coordinator._client, definition, entry.entry_id)
-        )
+    for slave in coordinator.slaves:
+        unit = None if slave == coordinator.primary_slave else slave
+        for definition in SENSOR_DEFINITIONS:
+            sensors.append(
+                EpeverHiFirmwareSensor(
+                    coordinator, definition, slave, unit, entry.entry_id
+                )
+            )
 
     _LOGGER.debug("Adding %d firmware diagnostic sensors for EPEVER Hi", len(sensors))
     async_add_entities(sensors)
 
 
 class EpeverHiFirmwareSensor(SensorEntity):
-    """Static diagnostic sensor for EPEVER Hi firmware info."""
+    """Static diagnostic sensor for EPEVER Hi firmware info.
+
+    The coordinator reads these registers once and keeps them in its
+    warm-start snapshot, so they are not read again on every restart.
+    """
+
+    _attr_should_poll = False
 
     def __init__(
         self,
-        client: Any,  # EpeverHiModbusClient
+        coordinator: Any,  # EpeverHiModbusCoordinator
         reg: dict[str, Any],
+        slave: int,
+        unit: int | None,
         entry_id: str,
     ):
-        self._client = client
+        self._coordinator = coordinator
+        self._slave = slave
         self._address = reg["address"]
-        self._scale = reg.get("scale", 1)
-        self._precision = reg.get("precision", 0)
-        self._type = reg.get("type", "uns16")
-        self._length = reg.get("dataLength", 1)
-        self._raw_value: list[int] | None = None
+        self._key = reg["key"]
 
         self._attr_name = reg["name"]
-        self._attr_unique_id = f"epever_hi_diag_{reg['key']}"
+        unique_id = f"epever_hi_diag_{reg['key']}"
+        if unit is not None:
+            unique_id += f"_unit{unit}"
+        self._attr_unique_id = scoped_unique_id(entry_id, unique_id)
         self._attr_native_unit_of_measurement = reg.get("unit", "")
         self._attr_device_class = reg.get("device_class")
         self._attr_entity_category = reg.get("entity_category")
-        self._attr_device_info = DeviceInfo(**get_device_info(entry_id))
-
-    async def async_added_to_hass(self) -> None:
-        """Read the value only once when the entity is added."""
-        try:
-            result = await self._client.read_register(
-                address=self._address,
-                count=self._length,
-                slave=1,  # or from config if needed
-            )
-            self._raw_value = result if isinstance(result, list) else [result]
-            _LOGGER.debug(
-                "%s read at 0x%04X → %s", self.name, self._address, self._raw_value
-            )
-            self.async_write_ha_state()
-        except Exception as e:
-            _LOGGER.warning("Failed to read diagnostic sensor %s: %s", self.name, e)
+        self._attr_device_info = DeviceInfo(**get_device_info(entry_id, unit))
 
     @property
     def native_value(self) -> str | float | None:
-        return decode_modbus_value(
-            raw=self._raw_value,
-            type_=self._type,
-            data_length=self._length,
-            scale=self._scale,
-            precision=self._precision,
-        )
+        return self._coordinator.identity_value(self._slave, self._key)
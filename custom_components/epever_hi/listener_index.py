@@ -0,0 +1,78 @@
+"""Index of coordinator listeners by the register keys they decode.
+
+A poll cycle usually changes a handful of registers; waking every entity
+for it wrote hundreds of unchanged states. ListenerIndex remembers which
+keys each listener subscribed to and the data last notified, so the
+coordinator only wakes the listeners of registers that changed.
+
+Kept free of Home Assistant imports so it can be tested on its own.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import Callable, Hashable, Iterable, Mapping
+from typing import Any
+
+Listener = Callable[[], None]
+
+
+class ListenerIndex:
+    """Listeners keyed by register, plus the data they were last notified of.
+
+    Listeners subscribed without keys are woken by every update. Everyone
+    is woken on the first update and whenever the coordinator state (last
+    update success, stale snapshot) changes, since that changes the
+    availability of every entity.
+    """
+
+    def __init__(self) -> None:
+        self._by_key: defaultdict[Hashable, set[Listener]] = defaultdict(set)
+        self._unkeyed: set[Listener] = set()
+        self._notified_data: dict[Hashable, Any] | None = None
+        self._notified_state: Hashable = None
+
+    def add(
+        self, listener: Listener, keys: Iterable[Hashable] | None = None
+    ) -> Callable[[], None]:
+        """Subscribe listener to keys, or to every update; return its remover."""
+        keys = None if keys is None else frozenset(keys)
+        if keys is None:
+            self._unkeyed.add(listener)
+        for key in keys or ():
+            self._by_key[key].add(listener)
+
+        def remove() -> None:
+            if keys is None:
+                self._unkeyed.discard(listener)
+            for key in keys or ():
+                listeners = self._by_key.get(key)
+                if listeners is not None:
+                    listeners.discard(listener)
+                    if not listeners:
+                        del self._by_key[key]
+
+        return remove
+
+    def changes(
+        self, data: Mapping[Hashable, Any], state: Hashable
+    ) -> set[Hashable] | None:
+        """Return the keys changed since the last call, or None to wake all."""
+        previous = self._notified_data
+        notify_all = previous is None or state != self._notified_state
+        self._notified_data = dict(data)
+        self._notified_state = state
+        if notify_all:
+            return None
+        return {
+            key
+            for key in data.keys() | previous.keys()
+            if data.get(key) != previous.get(key)
+        }
+
+    def listeners_for(self, keys: Iterable[Hashable]) -> set[Listener]:
+        """Return the listeners to wake for a change of keys."""
+        listeners = set(self._unkeyed)
+        for key in keys:
+            listeners.update(self._by_key.get(key, ()))
+        return listeners
@@ -0,0 +1,144 @@
+"""Low-overhead transport and poll-cycle metrics."""
+
+from __future__ import annotations
+
+from array import array
+
+
+class RollingHistogram:
+    """Keep the last ``size`` samples in a fixed ring and answer percentiles.
+
+    Recording is O(1) and allocation-free; the sorted view used for
+    percentiles is built lazily and reused until the next sample arrives.
+    """
+
+    def __init__(self, size: int = 512) -> None:
+        if size < 1:
+            raise ValueError("size must be at least 1")
+        self._samples = array("d", bytes(8 * size))
+        self._size = size
+        self._next = 0
+        self.count = 0  # samples recorded since creation
+        self._sorted: list[float] | None = None
+
+    def __len__(self) -> int:
+        return min(self.count, self._size)
+
+    def record(self, value: float) -> None:
+        """Add one sample, evicting the oldest once the ring is full."""
+        self._samples[self._next] = value
+        self._next = (self._next + 1) % self._size
+        self.count += 1
+        self._sorted = None
+
+    def percentile(self, percent: float) -> float | None:
+        """Return the nearest-rank percentile of the window, or None if empty."""
+        if not self.count:
+            return None
+        if self._sorted is None:
+            self._sorted = sorted(self._samples[: len(self)])
+        rank = max(1, -(-len(self._sorted) * percent // 100))  # ceil
+        return self._sorted[int(rank) - 1]
+
+    @property
+    def last(self) -> float | None:
+        """Return the most recent sample."""
+        return self._samples[self._next - 1] if self.count else None
+
+    def as_dict(self, scale: float = 1.0, precision: int = 1) -> dict[str, float]:
+        """Return p50/p95/p99 and the last sample, multiplied by ``scale``."""
+        if not self.count:
+            return {}
+        return {
+            name: round(value * scale, precision)
+            for name, value in (
+                ("last", self.last),
+                ("p50", self.percentile(50)),
+                ("p95", self.percentile(95)),
+                ("p99", self.percentile(99)),
+            )
+        }
+
+
+class TransportMetrics:
+    """Counters and RTT distribution of one Modbus connection."""
+
+    def __init__(self) -> None:
+        self.rtt = RollingHistogram()
+        self.requests = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.reconnects = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+
+    def record_request(self, rtt: float, sent: int, received: int) -> None:
+        """Record a completed request/response exchange."""
+        self.requests += 1
+        self.rtt.record(rtt)
+        self.bytes_sent += sent
+        self.bytes_received += received
+
+    def record_failure(self, sent: int, timeout: bool = False) -> None:
+        """Record a request that got no usable response."""
+        self.requests += 1
+        self.failures += 1
+        self.bytes_sent += sent
+        if timeout:
+            self.timeouts += 1
+
+    def as_dict(self) -> dict[str, int | float]:
+        """Return a flat snapshot for sensors and diagnostics."""
+        return {
+            "requests": self.requests,
+            "request_failures": self.failures,
+            "timeouts": self.timeouts,
+            "reconnects": self.reconnects,
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            **{
+                f"rtt_{name}": value
+                for name, value in self.rtt.as_dict(scale=1000).items()
+            },
+        }
+
+
+class PollMetrics:
+    """Duration and request counts of coordinator poll cycles and write checks."""
+
+    def __init__(self) -> None:
+        self.duration = RollingHistogram(size=256)
+        self.cycles = 0
+        self.requests_last_cycle = 0
+        self.failed_blocks_last_cycle = 0
+        self.quarantined = 0  # registers currently held back after failures
+        self.verified_writes = 0
+        self.clamped_writes = 0
+
+    def record_cycle(self, duration: float, requests: int, failed: int) -> None:
+        """Record one poll cycle that issued ``requests`` block reads."""
+        self.cycles += 1
+        self.duration.record(duration)
+        self.requests_last_cycle = requests
+        self.failed_blocks_last_cycle = failed
+
+    def record_write_check(self, written: int, read_back: int) -> None:
+        """Record a written register read back, counting device adjustments."""
+        self.verified_writes += 1
+        if read_back != written:
+            self.clamped_writes += 1
+
+    def as_dict(self) -> dict[str, int | float]:
+        """Return a flat snapshot for sensors and diagnostics."""
+        return {
+            "poll_cycles": self.cycles,
+            "verified_writes": self.verified_writes,
+            "clamped_writes": self.clamped_writes,
+            "requests_per_cycle": self.requests_last_cycle,
+            "failed_blocks_per_cycle": self.failed_blocks_last_cycle,
+            "quarantined_registers": self.quarantined,
+            **{
+                f"poll_duration_{name}": value
+                for name, value in self.duration.as_dict(scale=1000).items()
+            },
+        }
@@ -1,58 +1,205 @@
+import asyncio
+import contextlib
 import logging
+import time
+from typing import NamedTuple
 
 from pymodbus.client import AsyncModbusTcpClient
-from pymodbus.exceptions import ModbusException
+from pymodbus.exceptions import ModbusException, ModbusIOException
 from pymodbus.framer import FramerType
+from pymodbus.pdu import ExceptionResponse
+
+from .circuit_breaker import CircuitBreaker
+from .metrics import TransportMetrics
+from .modbus_pipeline import (
+    EXC_GATEWAY_PATH_UNAVAILABLE,
+    EXC_GATEWAY_TARGET_NO_RESPONSE,
+    EXC_ILLEGAL_FUNCTION,
+    FC_READ_HOLDING_REGISTERS,
+    FC_READ_INPUT_REGISTERS,
+    ModbusExceptionResponse,
+    ModbusPipelineError,
+    ModbusTcpPipeline,
+    ModbusTransport,
+)
+from .rtu import DEFAULT_BAUDRATE, ModbusRtuOverTcp, ModbusRtuSerial
 
 _LOGGER = logging.getLogger(__name__)
 
+# Function code + address + count/value, for reads and single writes alike
+_REQUEST_PDU_SIZE = 5
+
+# Exception codes of a gateway that could not reach the unit at all
+_GATEWAY_EXCEPTIONS = (EXC_GATEWAY_PATH_UNAVAILABLE, EXC_GATEWAY_TARGET_NO_RESPONSE)
+
 # Configure pymodbus logging to reduce verbose retry messages
 _PYMODBUS_LOGGER = logging.getLogger("pymodbus.logging")
 _PYMODBUS_LOGGER.setLevel(logging.WARNING)
 
 
+class ReadResult(NamedTuple):
+    """Outcome of one register read, for callers that act on why it failed."""
+
+    registers: list[int] | None
+    # Exception code of a Modbus exception response, if the read got one
+    exception_code: int | None = None
+    timed_out: bool = False
+
+    @property
+    def unit_silent(self) -> bool:
+        """Return True if the unit itself never answered.
+
+        Only registers or an exception response of the unit's own prove it
+        answered. A gateway reporting the unit unreachable (0x0A/0x0B) is as
+        good as a timeout: it says nothing about the requested registers.
+        """
+        return self.registers is None and (
+            self.exception_code is None or self.exception_code in _GATEWAY_EXCEPTIONS
+        )
+
+
 class EpeverHiModbusClient:
-    """Handles persistent async Modbus TCP communication for EPEVER Hi devices."""
+    """Handles persistent async Modbus TCP or serial RTU communication for EPEVER Hi."""
 
-    def __init__(self, host: str, port: int, framer: str = "tcp") -> None:
+    def __init__(
+        self,
+        host: str,
+        port: int | None,
+        framer: str = "tcp",
+        pipeline_depth: int = 1,
+        baudrate: int = DEFAULT_BAUDRATE,
+        parity: str = "N",
+        stopbits: int = 1,
+    ) -> None:
+        # With the "serial" framer host is the serial device path and port
+        # is unused
         self.host = host
         self.port = port
         self.framer = framer
+        self.pipeline_depth = pipeline_depth
+        self.baudrate = baudrate
+        self.parity = parity
+        self.stopbits = stopbits
         self.client: AsyncModbusTcpClient | None = None
+        # Native transport used instead of pymodbus, if any
+        self.transport: ModbusTransport | None = None
+        # Serializes transactions of every config entry sharing this client
+        self._lock = asyncio.Lock()
+        self.breaker = CircuitBreaker()
+        self.metrics = TransportMetrics()
+        self._has_connected = False
+        # Unit IDs that answered FC23 (read/write multiple) with illegal function
+        self._readwrite_unsupported: set[int] = set()
+        # Unit IDs where FC23 went unanswered: many units and gateways drop
+        # it silently. Kept once a plain write to the unit succeeds.
+        self._readwrite_unanswered: set[int] = set()
+
+    @property
+    def endpoint(self) -> str:
+        """Return host:port, or the device path of a serial connection."""
+        if self.framer.lower() == "serial":
+            return self.host
+        return f"{self.host}:{self.port}"
+
+    @property
+    def pipelined(self) -> bool:
+        """Return True if several requests may be in flight at once."""
+        return self.transport is not None and self.transport.pipelining
+
+    @property
+    def connected(self) -> bool:
+        """Return True if the active transport has an open connection."""
+        if self.transport is not None:
+            return self.transport.connected
+        return self.client is not None and self.client.connected
 
     async def ensure_connected(self) -> bool:
-        """Ensure the Modbus client is connected, reconnect if needed."""
-        if self.client is None:
-            # Choose framer based on configuration
-            framer_type = (
-                FramerType.RTU if self.framer.lower() == "rtu" else FramerType.SOCKET
-            )
+        """Ensure the Modbus client is connected, reconnect if needed.
+
+        While the circuit breaker is open this fails fast without touching
+        the network; once the backoff expires a single probe decides whether
+        polling resumes.
+        """
+        if self.connected:
+            return True
+        if not self.breaker.allow_request():
+            return False
+
+        if await self._connect():
+            if self.breaker.consecutive_failures:
+                _LOGGER.info(
+                    "Reconnected to Modbus server at %s after %d failed attempts",
+                    self.endpoint,
+                    self.breaker.consecutive_failures,
+                )
+            self.breaker.record_success()
+            if self._has_connected:
+                self.metrics.reconnects += 1
+            self._has_connected = True
+            return True
+
+        self.breaker.record_failure()
+        # Log once per outage, later probes only at debug level
+        log = _LOGGER.error if self.breaker.consecutive_failures == 1 else _LOGGER.debug
+        log(
+            "Failed to connect to Modbus server at %s (framer: %s); "
+            "next attempt in %.1fs",
+            self.endpoint,
+            self.framer,
+            self.breaker.retry_in,
+        )
+        return False
+
+    async def _connect(self) -> bool:
+        """Open the transport for the configured framer and pipeline depth."""
+        framer = self.framer.lower()
+        if self.transport is None:
+            if framer == "serial":
+                self.transport = ModbusRtuSerial(
+                    self.host, self.baudrate, self.parity, self.stopbits
+                )
+            elif framer == "rtu":
+                # Frames responses by their expected length, so segments
+                # split by the gateway never leave a read waiting for timeout
+                self.transport = ModbusRtuOverTcp(self.host, self.port, timeout=2.0)
+            elif self.pipeline_depth > 1:
+                # Pipelining needs our own MBAP transport; pymodbus serializes
+                # every transaction behind a single lock
+                self.transport = ModbusTcpPipeline(
+                    self.host, self.port, depth=self.pipeline_depth, timeout=2.0
+                )
+        if self.transport is not None:
+            return await self.transport.connect()
 
+        if self.client is None:
             # Configure client with reduced retries to minimize verbose logging
             self.client = AsyncModbusTcpClient(
                 self.host,
                 port=self.port,
-                framer=framer_type,
+                framer=FramerType.SOCKET,
                 timeout=2.0,  # Shorter timeout to fail faster
                 retries=1,  # Fewer retries to reduce log noise
             )
 
-        if not self.client.connected:
-            try:
-                connected = await self.client.connect()
-                if not connected:
-                    _LOGGER.error(
-                        "Failed to connect to Modbus server at %s:%s (framer: %s)",
-                        self.host,
-                        self.port,
-                        self.framer,
-                    )
-                    return False
-            except Exception as e:
-                _LOGGER.error("Modbus connection error: %s", e)
-                return False
+        try:
+            return bool(await self.client.connect())
+        except Exception as e:
+            _LOGGER.debug("Modbus connection error: %s", e)
+            return False
+
+    def _frame_size(self, pdu_size: int) -> int:
+        """Return the bytes on the wire for a PDU with this client's framing."""
+        if self.framer.lower() in ("rtu", "serial"):
+            return pdu_size + 3  # unit ID + CRC
+        return pdu_size + 7  # MBAP header including the unit ID
 
-        return True
+    def _transaction_lock(self) -> contextlib.AbstractAsyncContextManager:
+        """Return the lock guarding one transaction on the shared connection."""
+        if self.transport is not None:
+            # The pipeline matches concurrent responses by transaction ID and
+            # the serial transport serializes the bus itself
+            return contextlib.nullcontext()
+        return self._lock
 
     async def read_register(
         self,
@@ -69,57 +216,314 @@ class EpeverHiModbusClient:
             slave: Slave device ID
             register_type: Type of register - "holding" or "input"
         """
+        result = await self.read_register_result(address, count, slave, register_type)
+        return result.registers
+
+    async def read_register_result(
+        self,
+        address: int,
+        count: int = 1,
+        slave: int = 1,
+        register_type: str = "holding",
+    ) -> ReadResult:
+        """Read registers like read_register(), also reporting why a read failed.
+
+        The result carries the exception code of an exception response, or
+        whether the read timed out, so callers can tell a rejected address
+        range from a unit that is not answering.
+        """
+        async with self._transaction_lock():
+            return await self._read_register(address, count, slave, register_type)
+
+    async def _read_register(
+        self, address: int, count: int, slave: int, register_type: str
+    ) -> ReadResult:
         if not await self.ensure_connected():
-            return None
+            return ReadResult(None)
 
-        try:
-            if register_type.lower() == "input":
-                result = await self.client.read_input_registers(
-                    address=address, count=count, device_id=slave
-                )
-            else:
-                result = await self.client.read_holding_registers(
-                    address=address, count=count, device_id=slave
-                )
+        sent = self._frame_size(_REQUEST_PDU_SIZE)
+        started = time.perf_counter()
+        timed_out = False
+        exception_code = None
+        registers = None
 
-            if result is None or result.isError():
+        if self.transport is not None:
+            function_code = (
+                FC_READ_INPUT_REGISTERS
+                if register_type.lower() == "input"
+                else FC_READ_HOLDING_REGISTERS
+            )
+            try:
+                registers = await self.transport.read_registers(
+                    slave, function_code, address, count
+                )
+            except TimeoutError:
+                timed_out = True
                 _LOGGER.warning(
-                    "Read failed at address 0x%04X (type: %s)", address, register_type
+                    "Read timed out at address 0x%04X (type: %s)",
+                    address,
+                    register_type,
                 )
-                return None
-            return result.registers
-        except ModbusException as me:
-            _LOGGER.error("Modbus protocol error at 0x%04X: %s", address, me)
-        except Exception as e:
-            _LOGGER.error("Unexpected error reading 0x%04X: %s", address, e)
+            except ModbusExceptionResponse as er:
+                exception_code = er.exception_code
+                _LOGGER.warning("Read failed at address 0x%04X: %s", address, er)
+            except ModbusPipelineError as pe:
+                _LOGGER.warning("Read failed at address 0x%04X: %s", address, pe)
+        else:
+            try:
+                if register_type.lower() == "input":
+                    result = await self.client.read_input_registers(
+                        address=address, count=count, device_id=slave
+                    )
+                else:
+                    result = await self.client.read_holding_registers(
+                        address=address, count=count, device_id=slave
+                    )
 
-        return None
+                if result is None or result.isError():
+                    if isinstance(result, ExceptionResponse):
+                        exception_code = result.exception_code
+                    _LOGGER.warning(
+                        "Read failed at address 0x%04X (type: %s)",
+                        address,
+                        register_type,
+                    )
+                else:
+                    registers = result.registers
+            except ModbusIOException as ioe:
+                # pymodbus reports a missing response as an I/O error
+                timed_out = True
+                _LOGGER.error("Modbus protocol error at 0x%04X: %s", address, ioe)
+            except ModbusException as me:
+                _LOGGER.error("Modbus protocol error at 0x%04X: %s", address, me)
+            except Exception as e:
+                _LOGGER.error("Unexpected error reading 0x%04X: %s", address, e)
+
+        if registers is None:
+            self.metrics.record_failure(sent, timeout=timed_out)
+        else:
+            self.metrics.record_request(
+                time.perf_counter() - started,
+                sent,
+                self._frame_size(2 + 2 * len(registers)),
+            )
+        return ReadResult(registers, exception_code, timed_out)
 
     async def write_register(self, address: int, value: int, slave: int = 1) -> bool:
         """Write a value to a Modbus register."""
+        async with self._transaction_lock():
+            return await self._write_register(address, value, slave)
+
+    async def _write_register(self, address: int, value: int, slave: int) -> bool:
         if not await self.ensure_connected():
             return False
 
-        try:
-            result = await self.client.write_register(
-                address=address, value=value, device_id=slave
+        # FC6 echoes the request back on success
+        size = self._frame_size(_REQUEST_PDU_SIZE)
+        started = time.perf_counter()
+        timed_out = False
+        ok = False
+
+        if self.transport is not None:
+            try:
+                await self.transport.write_register(slave, address, value)
+                ok = True
+            except TimeoutError:
+                timed_out = True
+                _LOGGER.warning("Write timed out at 0x%04X", address)
+            except ModbusPipelineError as pe:
+                _LOGGER.warning("Write failed at 0x%04X: %s", address, pe)
+        else:
+            try:
+                result = await self.client.write_register(
+                    address=address, value=value, device_id=slave
+                )
+                if result.isError():
+                    _LOGGER.warning("Write failed at 0x%04X: %s", address, result)
+                else:
+                    ok = True
+            except ModbusIOException as ioe:
+                timed_out = True
+                _LOGGER.error("Modbus write error at 0x%04X: %s", address, ioe)
+            except ModbusException as me:
+                _LOGGER.error("Modbus write error at 0x%04X: %s", address, me)
+            except Exception as e:
+                _LOGGER.error("Unexpected error writing 0x%04X: %s", address, e)
+
+        if ok:
+            self.metrics.record_request(time.perf_counter() - started, size, size)
+        else:
+            self.metrics.record_failure(size, timeout=timed_out)
+        self._confirm_readwrite_fallback(slave, ok)
+        return ok
+
+    async def write_registers(
+        self, address: int, values: list[int], slave: int = 1
+    ) -> bool:
+        """Write consecutive registers in one FC16 transaction."""
+        async with self._transaction_lock():
+            return await self._write_registers(address, values, slave)
+
+    async def _write_registers(
+        self, address: int, values: list[int], slave: int
+    ) -> bool:
+        if not await self.ensure_connected():
+            return False
+
+        # Request carries a byte count plus the values; the reply echoes
+        # address and count only
+        sent = self._frame_size(_REQUEST_PDU_SIZE + 1 + 2 * len(values))
+        started = time.perf_counter()
+        timed_out = False
+        ok = False
+
+        if self.transport is not None:
+            try:
+                await self.transport.write_registers(slave, address, values)
+                ok = True
+            except TimeoutError:
+                timed_out = True
+                _LOGGER.warning("Write timed out at 0x%04X", address)
+            except ModbusPipelineError as pe:
+                _LOGGER.warning("Write failed at 0x%04X: %s", address, pe)
+        else:
+            try:
+                result = await self.client.write_registers(
+                    address=address, values=values, device_id=slave
+                )
+                if result.isError():
+                    _LOGGER.warning("Write failed at 0x%04X: %s", address, result)
+                else:
+                    ok = True
+            except ModbusIOException as ioe:
+                timed_out = True
+                _LOGGER.error("Modbus write error at 0x%04X: %s", address, ioe)
+            except ModbusException as me:
+                _LOGGER.error("Modbus write error at 0x%04X: %s", address, me)
+            except Exception as e:
+                _LOGGER.error("Unexpected error writing 0x%04X: %s", address, e)
+
+        if ok:
+            self.metrics.record_request(
+                time.perf_counter() - started,
+                sent,
+                self._frame_size(_REQUEST_PDU_SIZE),
             )
-            if result.isError():
-                _LOGGER.warning("Write failed at 0x%04X: %s", address, result)
-                return False
-            return True
-        except ModbusException as me:
-            _LOGGER.error("Modbus write error at 0x%04X: %s", address, me)
-        except Exception as e:
-            _LOGGER.error("Unexpected error writing 0x%04X: %s", address, e)
+        else:
+            self.metrics.record_failure(sent, timeout=timed_out)
+        self._confirm_readwrite_fallback(slave, ok)
+        return ok
 
-        return False
+    def supports_readwrite(self, slave: int) -> bool:
+        """Return False once the unit rejected or ignored FC23.
+
+        FC23 answered by a timeout or an error without an exception code
+        is taken as unsupported too, unless the plain write tried next also
+        fails: then the unit is down rather than lacking FC23.
+        """
+        return (
+            slave not in self._readwrite_unsupported
+            and slave not in self._readwrite_unanswered
+        )
+
+    def _confirm_readwrite_fallback(self, slave: int, ok: bool) -> None:
+        """Settle an unanswered FC23 by the plain write that followed it."""
+        if not ok:
+            self._readwrite_unanswered.discard(slave)
+
+    async def readwrite_registers(
+        self, address: int, values: list[int], slave: int = 1
+    ) -> list[int] | None:
+        """Write consecutive registers and read them back in one FC23 transaction.
+
+        Returns what the device holds after the write, which differs from
+        ``values`` where it clamped or adjusted them. Units rejecting FC23
+        are remembered; see supports_readwrite().
+        """
+        async with self._transaction_lock():
+            return await self._readwrite_registers(address, values, slave)
+
+    async def _readwrite_registers(
+        self, address: int, values: list[int], slave: int
+    ) -> list[int] | None:
+        if not await self.ensure_connected():
+            return None
+
+        # Read address/count, write address/count, byte count, then the values
+        count = len(values)
+        sent = self._frame_size(_REQUEST_PDU_SIZE + 5 + 2 * count)
+        started = time.perf_counter()
+        timed_out = False
+        exception_code = None
+        registers = None
+
+        if self.transport is not None:
+            try:
+                registers = await self.transport.readwrite_registers(
+                    slave, address, values
+                )
+            except TimeoutError:
+                timed_out = True
+                _LOGGER.warning("Write/read timed out at 0x%04X", address)
+            except ModbusExceptionResponse as er:
+                exception_code = er.exception_code
+                _LOGGER.debug("Write/read failed at 0x%04X: %s", address, er)
+            except ModbusPipelineError as pe:
+                _LOGGER.warning("Write/read failed at 0x%04X: %s", address, pe)
+        else:
+            try:
+                result = await self.client.readwrite_registers(
+                    read_address=address,
+                    read_count=count,
+                    write_address=address,
+                    values=values,
+                    device_id=slave,
+                )
+                if result.isError():
+                    if isinstance(result, ExceptionResponse):
+                        exception_code = result.exception_code
+                    _LOGGER.debug("Write/read failed at 0x%04X: %s", address, result)
+                else:
+                    registers = result.registers[:count]
+            except ModbusIOException as ioe:
+                timed_out = True
+                _LOGGER.error("Modbus write/read error at 0x%04X: %s", address, ioe)
+            except ModbusException as me:
+                _LOGGER.error("Modbus write/read error at 0x%04X: %s", address, me)
+            except Exception as e:
+                _LOGGER.error("Unexpected error writing/reading 0x%04X: %s", address, e)
+
+        if exception_code == EXC_ILLEGAL_FUNCTION:
+            _LOGGER.info(
+                "Unit %d does not support FC23; writes are verified separately", slave
+            )
+            self._readwrite_unsupported.add(slave)
+        elif registers is None and (
+            exception_code is None or exception_code in _GATEWAY_EXCEPTIONS
+        ):
+            _LOGGER.info(
+                "Unit %d did not answer FC23; writing without it from now on", slave
+            )
+            self._readwrite_unanswered.add(slave)
+        if registers is None:
+            self.metrics.record_failure(sent, timeout=timed_out)
+        else:
+            self.metrics.record_request(
+                time.perf_counter() - started,
+                sent,
+                self._frame_size(2 + 2 * count),
+            )
+        return registers
 
     async def close(self) -> None:
         """Close the Modbus connection gracefully."""
+        if self.transport is not None:
+            await self.transport.close()
+            self.transport = None
         if self.client:
             try:
-                await self.client.close()
+                # pymodbus closes synchronously
+                self.client.close()
             except Exception as e:
                 _LOGGER.warning("Error while closing Modbus client: %s", e)
             finally:
@@ -1,94 +1,664 @@
-import asyncio
+from collections.abc import Callable, Iterator
 from datetime import timedelta
+from functools import partial
+import time
 from typing import Any
 
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.update_coordinator import (
+    DataUpdateCoordinator,
+    UpdateFailed,
+)
 
-from .const import LOGGER
-from .modbus_client import EpeverHiModbusClient
+from .capabilities import (
+    CAPABILITIES_VERSION,
+    Capabilities,
+    firmware_key,
+    probe_capabilities,
+)
+from .client_registry import async_acquire_client, async_release_client
+from .const import (
+    BUTTON_DEFINITIONS,
+    CONF_BAUDRATE,
+    CONF_HISTORY_HOURS,
+    CONF_MAX_READ_GAP,
+    CONF_PARITY,
+    CONF_PIPELINE_DEPTH,
+    CONF_REGISTER_GROUPS,
+    CONF_SCAN_INTERVAL,
+    CONF_STOPBITS,
+    CONF_WRITE_DEBOUNCE_MS,
+    DEFAULT_HISTORY_HOURS,
+    DEFAULT_POLL_TIER,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_WRITE_DEBOUNCE_MS,
+    DIAGNOSTIC_DEFINITIONS,
+    DOMAIN,
+    FIRMWARE_INFO,
+    LOGGER,
+    NUMBER_DEFINITIONS,
+    POLL_TIER_INTERVALS,
+    REGISTER_GROUPS,
+    SELECT_DEFINITIONS,
+    SENSOR_DEFINITIONS_NEW,
+    SWITCH_DEFINITIONS,
+    parse_slave_ids,
+)
+from .decoder import DecodePlan, ValueKey, in_register_groups, register_count
+from .helpers import decode_modbus_value
+from .history import RegisterHistory
+from .listener_index import ListenerIndex
+from .modbus_client import ReadResult
+from .poller import ClientUnavailable, RegisterKey, RegisterPoller
+from .read_planner import DEFAULT_MAX_READ_GAP
+from .rtu import DEFAULT_BAUDRATE, break_even_gap
+from .snapshot import SNAPSHOT_VERSION, Snapshot, SnapshotSaver
+from .write_coalescer import WriteCoalescer
+
+# Seconds between a write and reading the register back (device may clamp)
+VERIFY_DELAY = 1.0
+# The warm-start snapshot only needs to be roughly current; saving it at
+# most this often (seconds) keeps the poll loop from writing .storage
+SNAPSHOT_SAVE_DELAY = 300
+
+# Definition tables the entity platforms create their entities from
+ENTITY_DEFINITIONS = (
+    SENSOR_DEFINITIONS_NEW,
+    {reg["address"]: reg for reg in NUMBER_DEFINITIONS},
+    SELECT_DEFINITIONS,
+    SWITCH_DEFINITIONS,
+    BUTTON_DEFINITIONS,
+    DIAGNOSTIC_DEFINITIONS,
+)
+
+
+def _definition_spans() -> Iterator[tuple[dict[str, Any], int, int]]:
+    """Yield every entity definition with its address and register count."""
+    for definitions in ENTITY_DEFINITIONS:
+        for address, reg in definitions.items():
+            count = register_count(reg) if definitions is SENSOR_DEFINITIONS_NEW else 1
+            yield reg, address, count
+
+
+def snapshot_store(hass: HomeAssistant, entry_id: str) -> Store[dict[str, Any]]:
+    """Return the warm-start snapshot store of a config entry."""
+    return Store(hass, SNAPSHOT_VERSION, f"{DOMAIN}.{entry_id}.snapshot")
 
 
 class EpeverHiModbusCoordinator(DataUpdateCoordinator):
-    """Coordinator that polls only the Modbus addresses registered by entities."""
+    """Coordinator that polls only the Modbus addresses registered by entities.
 
-    def __init__(self, hass: HomeAssistant, config: dict[str, Any]) -> None:
+    One coordinator serves every unit ID configured on the entry; all units
+    share a single connection and are planned together in one poll cycle.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, config: dict[str, Any], entry_id: str
+    ) -> None:
+        scan_interval = config.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
         super().__init__(
             hass,
             LOGGER,
             name="EPEVER Hi Modbus Coordinator",
-            update_interval=timedelta(seconds=3),
+            update_interval=timedelta(seconds=scan_interval),
         )
         self._host = config["host"]
-        self._port = config["port"]
-        self._slave = config["slave"]
+        self._port = config.get("port")  # unused for serial connections
+        self._slaves = parse_slave_ids(config["slave"])
         self._connection_type = config.get("connection_type", "tcp")
         self._register_type = config.get("register_type", "holding")
-        self._client = EpeverHiModbusClient(
-            self._host, self._port, framer=self._connection_type
+        self._register_groups = frozenset(
+            config.get(CONF_REGISTER_GROUPS, REGISTER_GROUPS)
+        )
+        baudrate = config.get(CONF_BAUDRATE, DEFAULT_BAUDRATE)
+        parity = config.get(CONF_PARITY, "N")
+        stopbits = config.get(CONF_STOPBITS, 1)
+        self._client = async_acquire_client(
+            hass,
+            self._host,
+            self._port,
+            framer=self._connection_type,
+            pipeline_depth=config.get(CONF_PIPELINE_DEPTH, 1),
+            baudrate=baudrate,
+            parity=parity,
+            stopbits=stopbits,
+        )
+        max_read_gap = config.get(CONF_MAX_READ_GAP, DEFAULT_MAX_READ_GAP)
+        if self._connection_type == "serial":
+            # On a slow bus every gap register costs two characters of airtime;
+            # never read through more than a separate request would cost
+            max_read_gap = min(max_read_gap, break_even_gap(baudrate, parity, stopbits))
+        self._poller = RegisterPoller(self._client, max_read_gap)
+        # Listener fan-out: entities subscribe to the register keys they decode
+        self._listener_index = ListenerIndex()
+        # Sensor values decoded once per published snapshot
+        self._decode_plan = DecodePlan(SENSOR_DEFINITIONS_NEW)
+        self.values: dict[ValueKey, Any] = {}
+        self.metrics = self._poller.metrics
+        # Raw samples of every poll cycle, for charts and analysis that
+        # would otherwise query the recorder
+        history_hours = config.get(CONF_HISTORY_HOURS, DEFAULT_HISTORY_HOURS)
+        self.history: RegisterHistory | None = (
+            RegisterHistory(max(1, round(history_hours * 3600 / scan_interval)))
+            if history_hours
+            else None
+        )
+        # Slider drags and repeated selections collapse into one write per key
+        self._writes = WriteCoalescer(
+            self._async_send_write,
+            config.get(CONF_WRITE_DEBOUNCE_MS, DEFAULT_WRITE_DEBOUNCE_MS) / 1000,
         )
-        self._active_addresses: dict[int, str] = {}  # address -> register_type mapping
+        # Written keys (and the value sent) awaiting one shared read-back
+        self._verify_keys: dict[RegisterKey, int | None] = {}
+        self._cancel_verify: CALLBACK_TYPE | None = None
+        # Warm start: last good registers and static unit identity
+        self._store = snapshot_store(hass, entry_id)
+        self._snapshot_saver = SnapshotSaver(
+            self._store.async_delay_save, self._snapshot_data, SNAPSHOT_SAVE_DELAY
+        )
+        self.identity: dict[int, dict[str, list[int]]] = {}
+        # Probed register capabilities, shared by every entry and keyed by
+        # firmware (see capabilities.firmware_key)
+        self._capabilities_store: Store[dict[str, Any]] = Store(
+            hass, CAPABILITIES_VERSION, f"{DOMAIN}.capabilities"
+        )
+        # slave -> firmware key of units still to probe
+        self.unprobed: dict[int, str] = {}
+        self._last_good_poll = 0.0
+        # UNIX time of the restored snapshot until a live poll replaces it
+        self.restored_at: float | None = None
+        # Registrations made by seed_poll_set() until release_seed()
+        self._seeded: list[tuple[int, str, str, int, int]] = []
+
+    @property
+    def slaves(self) -> list[int]:
+        """Return the Modbus unit IDs served by this coordinator."""
+        return self._slaves
 
-    def register_address(self, address: int, register_type: str = None) -> None:
-        """Register a Modbus address to be polled with its register type."""
+    @property
+    def primary_slave(self) -> int:
+        """Return the unit ID whose entities keep the legacy unique IDs."""
+        return self._slaves[0]
+
+    @property
+    def stale(self) -> bool:
+        """Return True while data comes from the snapshot, not the device."""
+        return self.restored_at is not None
+
+    def identity_value(self, slave: int, key: str) -> str | float | None:
+        """Return a decoded FIRMWARE_INFO value (serial, model, firmware)."""
+        for reg in FIRMWARE_INFO.values():
+            if reg["key"] == key:
+                return decode_modbus_value(
+                    raw=self.identity.get(slave, {}).get(key),
+                    type_=reg.get("type", "uns16"),
+                    data_length=reg.get("dataLength", 1),
+                    scale=reg.get("scale", 1),
+                    precision=reg.get("precision", 0),
+                )
+        return None
+
+    def group_enabled(self, definition: dict[str, Any]) -> bool:
+        """Return True if the definition's register group is polled."""
+        return in_register_groups(definition, self._register_groups)
+
+    def register_address(
+        self,
+        address: int,
+        register_type: str = None,
+        poll_tier: str = DEFAULT_POLL_TIER,
+        slave: int | None = None,
+        count: int = 1,
+    ) -> None:
+        """Register a value of one unit to be polled.
+
+        ``count`` consecutive registers starting at ``address`` hold the value;
+        they are always read together in one request. Registrations are
+        reference counted; unregister_address() with the same arguments
+        releases one.
+        """
         # Use global register_type from config as default, or specific per address
         reg_type = register_type or self._register_type
-        self._active_addresses[address] = reg_type
+        slave = self.primary_slave if slave is None else slave
+        self._poller.register(
+            slave, address, reg_type, self._poll_interval(poll_tier), count
+        )
         LOGGER.debug(
-            "Registered address 0x%04X for polling (type: %s)", address, reg_type
+            "Registered address 0x%04X on unit %d for polling (type: %s, tier: %s)",
+            address,
+            slave,
+            reg_type,
+            poll_tier,
         )
 
-    async def async_setup(self) -> None:
-        """Connect the Modbus client."""
-        await self._client.ensure_connected()
+    def unregister_address(
+        self,
+        address: int,
+        poll_tier: str = DEFAULT_POLL_TIER,
+        slave: int | None = None,
+        count: int = 1,
+    ) -> None:
+        """Release a registration; the value stops being polled with the last."""
+        slave = self.primary_slave if slave is None else slave
+        self._poller.unregister(slave, address, self._poll_interval(poll_tier), count)
+        if self.history is not None:
+            for offset in range(count):
+                if (slave, address + offset) not in self._poller.active:
+                    self.history.discard((slave, address + offset))
+        LOGGER.debug("Unregistered address 0x%04X on unit %d", address, slave)
+
+    def seed_poll_set(self) -> None:
+        """Register every enabled entity definition before the first refresh.
+
+        Entities only register once they are added, after the first refresh;
+        seeding lets that refresh prime every value in one batched read so
+        entities have data the moment they appear. release_seed() drops the
+        seed references again once the platforms are set up.
+        """
+        for slave in self._slaves:
+            for reg, address, count in _definition_spans():
+                if not self.group_enabled(reg):
+                    continue
+                seed = (
+                    address,
+                    reg.get("register_type", "holding"),
+                    reg.get("poll_tier", DEFAULT_POLL_TIER),
+                    slave,
+                    count,
+                )
+                self.register_address(*seed[:4], count=count)
+                self._seeded.append(seed)
+
+    def release_seed(self) -> None:
+        """Drop the seed references, keeping what added entities registered.
+
+        Registers behind disabled entities stop being polled from here on.
+        """
+        for address, _, poll_tier, slave, count in self._seeded:
+            self.unregister_address(address, poll_tier, slave, count=count)
+        LOGGER.debug(
+            "Released %d seed registrations, %d registers remain polled",
+            len(self._seeded),
+            len(self._poller.active),
+        )
+        self._seeded.clear()
+
+    @staticmethod
+    def _poll_interval(poll_tier: str) -> float:
+        interval = POLL_TIER_INTERVALS.get(poll_tier)
+        return float("inf") if interval is None else interval
+
+    def metrics_snapshot(self) -> dict[str, int | float]:
+        """Return poll-cycle metrics merged with the shared transport metrics."""
+        return {**self._client.metrics.as_dict(), **self.metrics.as_dict()}
+
+    @callback
+    def async_add_listener(
+        self, update_callback: CALLBACK_TYPE, context: Any = None
+    ) -> Callable[[], None]:
+        """Listen for updates; a frozenset context subscribes to register keys."""
+        remove_listener = super().async_add_listener(update_callback, context)
+        remove_from_index = self._listener_index.add(
+            update_callback, context if isinstance(context, frozenset) else None
+        )
+
+        @callback
+        def remove_indexed_listener() -> None:
+            remove_listener()
+            remove_from_index()
+
+        return remove_indexed_listener
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Decode changed registers and notify only the entities using them.
+
+        Everyone is notified when availability flips or on the first update.
+        """
+        data = self.data or {}
+        changed = self._listener_index.changes(
+            data, (self.last_update_success, self.stale)
+        )
+        # Quarantined registers turn their entities unavailable without
+        # their value necessarily changing
+        unavailable = self._poller.take_availability_changes()
+
+        if changed is None:
+            self.values = self._decode_plan.decode(data, self._slaves)
+            super().async_update_listeners()
+            return
+
+        self._decode_plan.update(self.values, data, changed)
+        callbacks = self._listener_index.listeners_for(changed | unavailable)
+        LOGGER.debug(
+            "%d registers changed, notifying %d listeners", len(changed), len(callbacks)
+        )
+        for update_callback in callbacks:
+            update_callback()
+
+    async def async_setup(self) -> bool:
+        """Restore the warm-start snapshot and identify the units.
+
+        Each unit's identity also selects the cached register capabilities
+        of its firmware; see _async_apply_capabilities().
+
+        Returns True if register values were restored; they are published
+        right away and marked stale until the first live poll, so the
+        caller can skip the blocking first refresh. The FIRMWARE_INFO
+        registers are only read from units the snapshot has no identity for.
+        """
+        snapshot = None
+        if (stored := await self._store.async_load()) is not None:
+            snapshot = Snapshot.from_dict(stored)
+        if snapshot is not None:
+            self.identity = snapshot.identity
+
+        missing = [slave for slave in self._slaves if slave not in self.identity]
+        if missing and await self._client.ensure_connected():
+            for slave in missing:
+                await self._async_read_identity(slave)
+            self._snapshot_saver.schedule()
+        await self._async_apply_capabilities()
+
+        if snapshot is None or not snapshot.registers:
+            return False
+        LOGGER.debug(
+            "Restored %d registers saved %.0f s ago",
+            len(snapshot.registers),
+            time.time() - snapshot.saved_at,
+        )
+        self._last_good_poll = snapshot.saved_at
+        self.restored_at = snapshot.saved_at
+        self.async_set_updated_data(dict(snapshot.registers))
+        return True
+
+    async def _async_read_identity(self, slave: int) -> None:
+        identity = {}
+        for address, reg in FIRMWARE_INFO.items():
+            raw = await self._client.read_register(
+                address=address, count=reg.get("dataLength", 1), slave=slave
+            )
+            if raw is not None:
+                identity[reg["key"]] = raw
+        if identity:
+            self.identity[slave] = identity
+
+    async def _async_apply_capabilities(self) -> None:
+        """Plan reads from the cached capabilities of each unit's firmware.
+
+        Units whose firmware has no cached capabilities yet are left for
+        async_probe_capabilities(), which runs after setup.
+        """
+        cache = await self._capabilities_store.async_load() or {}
+        self.unprobed = {}
+        for slave in self._slaves:
+            key = firmware_key(self.identity.get(slave, {}))
+            if key is None:
+                continue
+            capabilities = Capabilities.from_dict(cache[key]) if key in cache else None
+            if capabilities is None:
+                self.unprobed[slave] = key
+            else:
+                self._poller.set_capabilities(slave, capabilities)
+
+    async def async_probe_capabilities(self) -> None:
+        """Probe the firmwares seen for the first time and cache the result.
+
+        Runs in the background after setup, since unanswered reads may each
+        cost a timeout. Units sharing a firmware are probed once. A probe
+        with unanswered reads is used for this session only and repeated on
+        the next setup.
+        """
+        probed: dict[str, Capabilities] = {}
+        for slave, key in list(self.unprobed.items()):
+            capabilities = probed.get(key)
+            if capabilities is None:
+                if not await self._client.ensure_connected():
+                    return
+                capabilities = await probe_capabilities(
+                    partial(self._async_probe_read, slave),
+                    (
+                        (reg.get("register_type", "holding"), address, count)
+                        for reg, address, count in _definition_spans()
+                    ),
+                )
+                if capabilities is None:
+                    continue
+                LOGGER.info(
+                    "Probed firmware %s on unit %d: %d registers not supported",
+                    key,
+                    slave,
+                    len(capabilities.unsupported),
+                )
+                probed[key] = capabilities
+            self._poller.set_capabilities(slave, capabilities)
+            del self.unprobed[slave]
+
+        complete = {
+            key: capabilities
+            for key, capabilities in probed.items()
+            if capabilities.complete
+        }
+        for key in probed.keys() - complete.keys():
+            LOGGER.debug(
+                "Not caching the probe of firmware %s: some reads went unanswered",
+                key,
+            )
+        if complete:
+            cache = await self._capabilities_store.async_load() or {}
+            cache.update(
+                (key, capabilities.as_dict()) for key, capabilities in complete.items()
+            )
+            await self._capabilities_store.async_save(cache)
+
+    async def _async_probe_read(
+        self, slave: int, register_type: str, address: int, count: int
+    ) -> ReadResult:
+        return await self._client.read_register_result(
+            address=address, count=count, slave=slave, register_type=register_type
+        )
+
+    def register_available(self, slave: int, address: int) -> bool:
+        """Return False for registers the unit lacks or that keep failing."""
+        return self._poller.available((slave, address))
+
+    def _snapshot_data(self) -> dict[str, Any]:
+        """Return the JSON snapshot of the last good values for the Store."""
+        return Snapshot(
+            registers={
+                key: value
+                for key, value in (self.data or {}).items()
+                if value is not None
+            },
+            identity=self.identity,
+            saved_at=self._last_good_poll,
+        ).as_dict()
 
     async def async_close(self) -> None:
-        """Close the Modbus client connection."""
+        """Release the shared Modbus client; the last user closes the socket."""
+        if self._cancel_verify is not None:
+            self._cancel_verify()
+            self._cancel_verify = None
+        # Do not drop a value the user already chose
+        await self._writes.async_flush()
         try:
-            await self._client.close()
+            await async_release_client(self.hass, self._client)
         except Exception as err:
             LOGGER.debug("Error closing Modbus client: %s", err)
 
-    async def async_write_register(self, address: int, value: int) -> bool:
-        """Write a register and optimistically update coordinator data.
+    async def async_write_register(
+        self,
+        address: int,
+        value: int,
+        slave: int | None = None,
+        coalesce: bool = False,
+    ) -> bool:
+        """Write a register and reflect the result in coordinator data.
+
+        Units supporting FC23 write and read the register back in one round
+        trip, so coordinator data holds what the device accepted. Otherwise
+        the value is shown optimistically and only the written register is
+        read back shortly after (device may clamp/adjust value).
 
-        - Perform the Modbus write
-        - Immediately reflect the new raw value in coordinator.data
-        - Schedule a short delayed refresh to reconcile with device
+        With ``coalesce`` the value is shown right away but only written once
+        no newer value for the same register arrived within the debounce
+        window; every call of the burst returns the result of that one write.
         """
+        key = (self.primary_slave if slave is None else slave, address)
+        if not coalesce:
+            return await self._async_send_write(key, value)
+
+        self._set_register(key, value)
+        ok = await self._writes.submit(key, value)
+        if not ok:
+            # Reconcile the optimistic value with what the device holds
+            self._schedule_verify(key, None)
+        return ok
+
+    async def _async_send_write(self, key: RegisterKey, value: int) -> bool:
+        slave, address = key
+        if self._client.supports_readwrite(slave):
+            registers = await self._client.readwrite_registers(address, [value], slave)
+            if registers is not None:
+                self._apply_read_back({key: value}, {key: registers[0]})
+                return True
+            if self._client.supports_readwrite(slave):
+                return False
+            # Unit just rejected or ignored FC23: fall back to FC6 and a
+            # delayed read
+
         ok = await self._client.write_register(
-            address=address, value=value, slave=self._slave
+            address=address, value=value, slave=slave
         )
         if ok:
-            # Optimistic update for snappy UI
-            new_data = dict(self.data or {})
-            new_data[address] = value
-            self.async_set_updated_data(new_data)
+            self._set_register(key, value)
+            self._schedule_verify(key, value)
+        return ok
 
-            # Verify shortly after (device may clamp/adjust value)
-            async def _verify():
-                await asyncio.sleep(1.0)
-                await self.async_request_refresh()
+    @callback
+    def _set_register(self, key: RegisterKey, value: int) -> None:
+        """Publish a raw value before the device confirms it, for a snappy UI."""
+        if (self.data or {}).get(key) == value:
+            return
+        self._publish({**(self.data or {}), key: value})
 
-            self.hass.async_create_task(_verify())
+    @callback
+    def _apply_read_back(
+        self,
+        written: dict[RegisterKey, int | None],
+        values: dict[RegisterKey, int],
+    ) -> None:
+        """Merge read-back registers into the data, counting clamped writes."""
+        for key, value in values.items():
+            sent = written.get(key)
+            if sent is None:
+                continue
+            self.metrics.record_write_check(sent, value)
+            if value != sent:
+                LOGGER.info(
+                    "Unit %d adjusted 0x%04X: wrote %d, device holds %d",
+                    key[0],
+                    key[1],
+                    sent,
+                    value,
+                )
+        self._publish({**(self.data or {}), **values})
 
-        return ok
+    @callback
+    def _publish(self, data: dict[RegisterKey, int | None]) -> None:
+        """Show register values that did not come from a poll.
 
-    async def _async_update_data(self) -> dict[int, int | None]:
-        """Poll only the registered Modbus addresses."""
-        results: dict[int, int | None] = {}
+        Unlike async_set_updated_data() this neither marks the last update
+        successful nor reschedules the next poll, so a write cannot hide a
+        failing connection or push the poll back.
+        """
+        self.data = data
+        self.async_update_listeners()
 
-        for addr, reg_type in self._active_addresses.items():
-            try:
-                value = await self._client.read_register(
-                    address=addr, count=1, slave=self._slave, register_type=reg_type
-                )
-                results[addr] = value[0] if value else None
-                LOGGER.debug("Read 0x%04X (%s) → %s", addr, reg_type, results[addr])
-            except Exception as err:
-                LOGGER.error(
-                    "Error reading register 0x%04X (%s): %s", addr, reg_type, err
-                )
-                results[addr] = None
+    @callback
+    def _schedule_verify(self, key: RegisterKey, value: int | None) -> None:
+        """Read key back after VERIFY_DELAY, sharing one read per burst.
+
+        ``value`` is what was written, or None if the write failed and only
+        the optimistic value needs replacing.
+        """
+        # Should the read-back fail, the next poll picks the register up
+        self._poller.mark_due(key)
+        self._verify_keys[key] = value
+        if self._cancel_verify is None:
+            self._cancel_verify = async_call_later(
+                self.hass, VERIFY_DELAY, self._async_verify
+            )
+
+    async def _async_verify(self, _now: Any) -> None:
+        self._cancel_verify = None
+        written, self._verify_keys = self._verify_keys, {}
+        values = await self._poller.async_read(set(written))
+        LOGGER.debug("Read back %d of %d written registers", len(values), len(written))
+        if values:
+            self._apply_read_back(written, values)
+
+    async def async_write_registers(
+        self, address: int, values: list[int], slave: int | None = None
+    ) -> bool:
+        """Write consecutive holding registers in one transaction.
 
-        return results
+        FC23 writes and reads the range back in a single round trip; units
+        without it get an FC16 write followed by one read of the range. Either
+        way coordinator data shows what the device accepted.
+        """
+        slave = self.primary_slave if slave is None else slave
+        registers = None
+        if self._client.supports_readwrite(slave):
+            registers = await self._client.readwrite_registers(address, values, slave)
+            if registers is None and self._client.supports_readwrite(slave):
+                return False
+
+        if registers is None:
+            ok = await self._client.write_registers(
+                address=address, values=values, slave=slave
+            )
+            if not ok:
+                return False
+            registers = await self._client.read_register(
+                address=address,
+                count=len(values),
+                slave=slave,
+                register_type="holding",
+            )
+
+        keys = [(slave, address + offset) for offset in range(len(values))]
+        written = dict(zip(keys, values, strict=True))
+        if registers is None:
+            # Keep the written values and let the next poll read them back
+            for key in keys:
+                self._poller.mark_due(key)
+            self._apply_read_back({}, written)
+        else:
+            self._apply_read_back(written, dict(zip(keys, registers, strict=True)))
+        return True
+
+    async def _async_update_data(self) -> dict[RegisterKey, int | None]:
+        """Poll the registers whose tier is due, keeping the rest from last cycle."""
+        # Allow half a tick of slack so tier intervals align with the poll ticks
+        slack = self.update_interval.total_seconds() / 2
+        try:
+            data = await self._poller.async_poll(self.data or {}, slack)
+        except ClientUnavailable as err:
+            raise UpdateFailed(str(err)) from err
+        self._last_good_poll = time.time()
+        if self.history is not None and self._poller.refreshed:
+            # Only what was read this cycle is a sample; values of tiers that
+            # were not due and of quarantined registers are carried over
+            self.history.record(
+                self._last_good_poll,
+                {key: data[key] for key in self._poller.refreshed},
+            )
+        # A value still inside its debounce window has not reached the device;
+        # keep showing it instead of bouncing back to the old reading
+        data.update(self._writes.pending_values())
+        self.restored_at = None
+        self._snapshot_saver.schedule()
+        return data
@@ -0,0 +1,307 @@
+"""Native Modbus transports, including a pipelined Modbus TCP client."""
+
+from __future__ import annotations
+
+import abc
+import asyncio
+import logging
+import struct
+
+_LOGGER = logging.getLogger(__name__)
+
+_MBAP_HEADER = struct.Struct(">HHHB")  # transaction id, protocol id, length, unit
+# The MBAP length counts the unit ID and a PDU of at most 253 bytes
+_MAX_MBAP_LENGTH = 254
+_READ_REQUEST = struct.Struct(">BHH")  # function code, address, count/value
+
+FC_READ_HOLDING_REGISTERS = 0x03
+FC_READ_INPUT_REGISTERS = 0x04
+FC_WRITE_SINGLE_REGISTER = 0x06
+FC_WRITE_MULTIPLE_REGISTERS = 0x10
+FC_READ_WRITE_MULTIPLE_REGISTERS = 0x17
+
+# Exception codes the integration tells apart
+EXC_ILLEGAL_FUNCTION = 0x01
+EXC_ILLEGAL_DATA_ADDRESS = 0x02
+# The answer to reading more registers than the device accepts at once
+EXC_ILLEGAL_DATA_VALUE = 0x03
+# A gateway answering for a unit that is unreachable or silent
+EXC_GATEWAY_PATH_UNAVAILABLE = 0x0A
+EXC_GATEWAY_TARGET_NO_RESPONSE = 0x0B
+
+
+class ModbusPipelineError(Exception):
+    """Raised when a transaction on a native transport fails."""
+
+
+class ModbusExceptionResponse(ModbusPipelineError):
+    """Raised when the device answers with a Modbus exception response."""
+
+    def __init__(self, function_code: int, exception_code: int) -> None:
+        super().__init__(
+            f"Exception response 0x{exception_code:02X} to function 0x{function_code:02X}"
+        )
+        self.function_code = function_code
+        self.exception_code = exception_code
+
+
+class ModbusTransport(abc.ABC):
+    """Register-level requests on top of a transport's ``execute``.
+
+    Subclasses frame a request PDU for their medium and return the response
+    PDU, raising ModbusExceptionResponse for exception responses.
+    """
+
+    # True while several requests may be in flight at once
+    pipelining = False
+
+    @property
+    @abc.abstractmethod
+    def connected(self) -> bool:
+        """Return True while the transport is open."""
+
+    @abc.abstractmethod
+    async def connect(self) -> bool:
+        """Open the transport."""
+
+    @abc.abstractmethod
+    async def close(self) -> None:
+        """Close the transport and fail every outstanding transaction."""
+
+    @abc.abstractmethod
+    async def execute(self, slave: int, pdu: bytes) -> bytes:
+        """Send a request PDU and return the matching response PDU."""
+
+    def _response_mismatch(self, reason: str) -> None:  # noqa: B027
+        """Called when a response does not fit the request it answers.
+
+        An optional hook; the default ignores the mismatch.
+        """
+
+    async def read_registers(
+        self, slave: int, function_code: int, address: int, count: int
+    ) -> list[int]:
+        """Read ``count`` registers with FC3 or FC4."""
+        response = await self.execute(
+            slave, _READ_REQUEST.pack(function_code, address, count)
+        )
+        if len(response) != 2 + 2 * count or response[1] != 2 * count:
+            self._response_mismatch("response length does not match request")
+            raise ModbusPipelineError(
+                f"Unexpected response length for 0x{address:04X}+{count}"
+            )
+        return list(struct.unpack(f">{count}H", response[2:]))
+
+    async def write_register(self, slave: int, address: int, value: int) -> None:
+        """Write a single register with FC6."""
+        request = _READ_REQUEST.pack(FC_WRITE_SINGLE_REGISTER, address, value)
+        response = await self.execute(slave, request)
+        if response != request:
+            raise ModbusPipelineError(f"Write to 0x{address:04X} was not echoed")
+
+    async def write_registers(
+        self, slave: int, address: int, values: list[int]
+    ) -> None:
+        """Write consecutive registers with FC16 in one transaction."""
+        count = len(values)
+        request = _READ_REQUEST.pack(
+            FC_WRITE_MULTIPLE_REGISTERS, address, count
+        ) + struct.pack(f">B{count}H", 2 * count, *values)
+        response = await self.execute(slave, request)
+        if response != request[:5]:
+            raise ModbusPipelineError(
+                f"Write to 0x{address:04X}+{count} was not acknowledged"
+            )
+
+    async def readwrite_registers(
+        self, slave: int, address: int, values: list[int]
+    ) -> list[int]:
+        """Write consecutive registers and read them back with one FC23."""
+        count = len(values)
+        request = struct.pack(
+            f">BHHHHB{count}H",
+            FC_READ_WRITE_MULTIPLE_REGISTERS,
+            address,
+            count,
+            address,
+            count,
+            2 * count,
+            *values,
+        )
+        response = await self.execute(slave, request)
+        if len(response) != 2 + 2 * count or response[1] != 2 * count:
+            self._response_mismatch("response length does not match request")
+            raise ModbusPipelineError(
+                f"Unexpected response length for 0x{address:04X}+{count}"
+            )
+        return list(struct.unpack(f">{count}H", response[2:]))
+
+
+class ModbusTcpPipeline(ModbusTransport):
+    """Modbus TCP client that matches responses to requests by transaction ID.
+
+    Up to ``depth`` requests are written to the socket before their responses
+    arrive. Gateways that mangle transaction IDs, answer with the wrong
+    function, or drop queued requests are detected and the pipeline falls
+    back to strict serial mode (one request in flight) on the same socket.
+    """
+
+    def __init__(
+        self, host: str, port: int, depth: int = 4, timeout: float = 2.0
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.depth = max(1, depth)
+        self.timeout = timeout
+        self.pipelining = self.depth > 1
+
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        self._reader_task: asyncio.Task | None = None
+        self._pending: dict[int, tuple[int, asyncio.Future[bytes]]] = {}
+        self._slots = asyncio.Semaphore(self.depth)
+        self._serial_lock = asyncio.Lock()
+        self._connect_lock = asyncio.Lock()
+        self._next_tid = 0
+
+    @property
+    def connected(self) -> bool:
+        """Return True while the socket is open."""
+        return self._writer is not None and not self._writer.is_closing()
+
+    async def connect(self) -> bool:
+        """Open the TCP connection and start the response reader."""
+        async with self._connect_lock:
+            if self.connected:
+                return True
+            try:
+                self._reader, self._writer = await asyncio.wait_for(
+                    asyncio.open_connection(self.host, self.port), self.timeout
+                )
+            except (OSError, TimeoutError) as err:
+                _LOGGER.debug(
+                    "Pipeline connect to %s:%s failed: %s", self.host, self.port, err
+                )
+                return False
+            self._reader_task = asyncio.create_task(self._read_loop())
+            return True
+
+    async def close(self) -> None:
+        """Close the socket and fail every outstanding transaction."""
+        self._fail_pending(ModbusPipelineError("Connection closed"))
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+            self._reader_task = None
+        if self._writer is not None:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except OSError:
+                pass
+            self._writer = None
+            self._reader = None
+
+    async def execute(self, slave: int, pdu: bytes) -> bytes:
+        """Send a request PDU and return the matching response PDU."""
+        async with self._slots:
+            if self.pipelining:
+                return await self._transact(slave, pdu)
+            async with self._serial_lock:
+                return await self._transact(slave, pdu)
+
+    async def _transact(self, slave: int, pdu: bytes) -> bytes:
+        if not self.connected and not await self.connect():
+            raise ModbusPipelineError(f"Not connected to {self.host}:{self.port}")
+
+        tid = self._allocate_tid()
+        future: asyncio.Future[bytes] = asyncio.get_running_loop().create_future()
+        concurrent = bool(self._pending)
+        self._pending[tid] = (pdu[0], future)
+        self._writer.write(_MBAP_HEADER.pack(tid, 0, len(pdu) + 1, slave) + pdu)
+
+        try:
+            await self._writer.drain()
+            response = await asyncio.wait_for(future, self.timeout)
+        except TimeoutError:
+            if concurrent and self.pipelining:
+                self._fallback_to_serial("request timed out with others in flight")
+            raise
+        except OSError as err:
+            await self.close()
+            raise ModbusPipelineError(f"Connection error: {err}") from err
+        finally:
+            self._pending.pop(tid, None)
+
+        if response[0] & 0x80:
+            raise ModbusExceptionResponse(
+                pdu[0], response[1] if len(response) > 1 else 0
+            )
+        return response
+
+    def _allocate_tid(self) -> int:
+        while True:
+            self._next_tid = (self._next_tid + 1) & 0xFFFF
+            if self._next_tid not in self._pending:
+                return self._next_tid
+
+    async def _read_loop(self) -> None:
+        reader = self._reader
+        try:
+            while True:
+                header = await reader.readexactly(_MBAP_HEADER.size)
+                tid, protocol, length, _unit = _MBAP_HEADER.unpack(header)
+                if protocol != 0 or not 1 <= length <= _MAX_MBAP_LENGTH:
+                    # The stream is out of sync; nothing after this can be
+                    # framed reliably
+                    raise ModbusPipelineError(
+                        f"Malformed MBAP header (protocol {protocol}, length {length})"
+                    )
+                pdu = await reader.readexactly(length - 1)
+                self._dispatch(tid, pdu)
+        except asyncio.CancelledError:
+            raise
+        except (asyncio.IncompleteReadError, OSError, ModbusPipelineError) as err:
+            _LOGGER.debug("Pipeline connection to %s lost: %s", self.host, err)
+            self._fail_pending(ModbusPipelineError("Connection lost"))
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+
+    def _dispatch(self, tid: int, pdu: bytes) -> None:
+        entry = self._pending.get(tid)
+        if entry is None:
+            # Late answer to a timed-out request is harmless when serial, but
+            # while pipelining it means the gateway rewrites transaction IDs
+            if self.pipelining and self._pending:
+                self._fallback_to_serial(f"unknown transaction id {tid}")
+                self._fail_pending(ModbusPipelineError("Transaction ID mismatch"))
+            return
+
+        function_code, future = entry
+        if future.done():
+            return
+        if not pdu or (pdu[0] & 0x7F) != function_code:
+            self._fallback_to_serial("response function code mismatch")
+            future.set_exception(ModbusPipelineError("Function code mismatch"))
+            return
+        future.set_result(pdu)
+
+    def _fail_pending(self, err: Exception) -> None:
+        for _, future in self._pending.values():
+            if not future.done():
+                future.set_exception(err)
+
+    def _response_mismatch(self, reason: str) -> None:
+        self._fallback_to_serial(reason)
+
+    def _fallback_to_serial(self, reason: str) -> None:
+        if not self.pipelining:
+            return
+        self.pipelining = False
+        _LOGGER.warning(
+            "Gateway %s:%s does not support pipelined requests (%s); "
+            "falling back to serial mode",
+            self.host,
+            self.port,
+            reason,
+        )
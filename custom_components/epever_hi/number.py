@@ -3,33 +3,37 @@ from __future__ import annotations
 from homeassistant.components.number import NumberEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN, LOGGER, NUMBER_DEFINITIONS, get_device_info
+from .const import DOMAIN, LOGGER, NUMBER_DEFINITIONS
+from .entity import EpeverHiEntity
 
 
-class EpeverHiNumberEntity(CoordinatorEntity, NumberEntity):
+class EpeverHiNumberEntity(EpeverHiEntity, NumberEntity):
     """Number entity representing a writable Modbus register."""
 
-    def __init__(self, coordinator: CoordinatorEntity, reg: dict, entry_id: str):
-        super().__init__(coordinator)
+    def __init__(self, coordinator, reg: dict, slave: int, entry_id: str):
+        super().__init__(
+            coordinator,
+            reg["address"],
+            slave,
+            entry_id,
+            reg["unique_id"],
+            register_type=reg["register_type"],
+            poll_tier=reg["poll_tier"],
+        )
         self._reg = reg
-        self._address = reg["address"]
         self._scale = reg.get("scale", 1.0)
         self._precision = reg.get("precision", 0)
 
         self._attr_name = reg["name"]
-        self._attr_unique_id = reg["unique_id"]
         self._attr_native_min_value = reg["min"]
         self._attr_native_max_value = reg["max"]
         self._attr_native_unit_of_measurement = reg["unit"]
-        self._attr_device_info = DeviceInfo(**get_device_info(entry_id))
 
     @property
     def native_value(self) -> float | None:
-        raw = self.coordinator.data.get(self._address)
+        raw = self._raw_value()
         if raw is None:
             return None
         return round(raw * self._scale, self._precision)
@@ -37,7 +41,9 @@ class EpeverHiNumberEntity(CoordinatorEntity, NumberEntity):
     async def async_set_native_value(self, value: float) -> None:
         raw_value = round(value / self._scale)
         try:
-            ok = await self.coordinator.async_write_register(self._address, raw_value)
+            ok = await self.coordinator.async_write_register(
+                self._address, raw_value, self._slave, coalesce=True
+            )
             if ok:
                 LOGGER.debug(
                     "Wrote value %s (raw %d) to 0x%04X", value, raw_value, self._address
@@ -56,9 +62,12 @@ async def async_setup_entry(
     coordinator = hass.data[DOMAIN][entry.entry_id]
     entities: list[EpeverHiNumberEntity] = []
 
-    for reg in NUMBER_DEFINITIONS:
-        reg_type = reg.get("register_type", "holding")
-        coordinator.register_address(reg["address"], reg_type)
-        entities.append(EpeverHiNumberEntity(coordinator, reg, entry.entry_id))
+    for slave in coordinator.slaves:
+        for reg in NUMBER_DEFINITIONS:
+            if not coordinator.group_enabled(reg):
+                continue
+            entities.append(
+                EpeverHiNumberEntity(coordinator, reg, slave, entry.entry_id)
+            )
 
     async_add_entities(entities)
@@ -0,0 +1,493 @@
+"""Poll scheduling and block reads behind the EPEVER Hi coordinator.
+
+Kept free of Home Assistant imports so the poll path can be benchmarked and
+tested against the device simulator on its own.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import Counter, defaultdict
+from collections.abc import Callable
+import logging
+import time
+from typing import Any
+
+from .capabilities import Capabilities
+from .metrics import PollMetrics
+from .modbus_client import ReadResult
+from .modbus_pipeline import EXC_ILLEGAL_DATA_ADDRESS
+from .quarantine import RegisterQuarantine
+from .read_planner import DEFAULT_MAX_READ_GAP, ReadBlock, plan_reads
+
+_LOGGER = logging.getLogger(__package__)
+
+# Coordinator data and poll bookkeeping are keyed by (slave, address)
+RegisterKey = tuple[int, int]
+
+# One registration of a key: (interval, first address, register count)
+_Registration = tuple[float, int, int]
+
+# Where a rejected block was split: (slave, register type, first address of
+# the later piece). Merged reads across a split are retried after 15 minutes,
+# backing off to once a day while the device keeps rejecting them.
+_Split = tuple[int, str, int]
+_SPLIT_RETRY_DELAY = 900.0
+_SPLIT_MAX_DELAY = 86400.0
+
+
+class ClientUnavailable(Exception):
+    """Raised when the connection is down and the circuit breaker is open."""
+
+
+class RegisterPoller:
+    """Track which registers are due and read them in planned blocks."""
+
+    def __init__(
+        self,
+        client: Any,  # EpeverHiModbusClient
+        max_read_gap: int = DEFAULT_MAX_READ_GAP,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.client = client
+        self.max_read_gap = max_read_gap
+        self.metrics = PollMetrics()
+        self._clock = clock
+        self.active: dict[RegisterKey, str] = {}  # key -> register_type
+        self._intervals: dict[RegisterKey, float] = {}  # key -> seconds
+        self._next_due: dict[RegisterKey, float] = {}  # key -> monotonic due time
+        # Words of multi-register values -> (first address, register count)
+        self._spans: dict[RegisterKey, tuple[int, int]] = {}
+        # Live registrations per key; the key is polled while any remain
+        self._registrations: defaultdict[RegisterKey, Counter[_Registration]] = (
+            defaultdict(Counter)
+        )
+        self._read_plans: dict[frozenset[RegisterKey], list[ReadBlock]] = {}
+        # slave -> what its firmware answers, once probed
+        self.capabilities: dict[int, Capabilities] = {}
+        # Keys that kept failing; retried on their own with growing delays
+        self.quarantine = RegisterQuarantine(clock=clock)
+        self._availability_changed: set[RegisterKey] = set()
+        # Splits found by bisecting rejected blocks; due ones may merge again
+        self.splits = RegisterQuarantine(
+            threshold=1,
+            base_delay=_SPLIT_RETRY_DELAY,
+            max_delay=_SPLIT_MAX_DELAY,
+            clock=clock,
+        )
+        self._merge_retries: frozenset[_Split] = frozenset()
+        # Keys the last async_poll() actually read from the device; the rest
+        # of its result was carried over from the previous cycle
+        self.refreshed: set[RegisterKey] = set()
+
+    def set_capabilities(self, slave: int, capabilities: Capabilities) -> None:
+        """Plan reads of a unit around the registers its firmware lacks."""
+        self.capabilities[slave] = capabilities
+        self._read_plans.clear()
+
+    def supported(self, key: RegisterKey) -> bool:
+        """Return False if the unit's firmware does not answer the register."""
+        capabilities = self.capabilities.get(key[0])
+        reg_type = self.active.get(key)
+        if capabilities is None or reg_type is None:
+            return True
+        first, count = self._spans.get(key, (key[1], 1))
+        return capabilities.supports(reg_type, first, count)
+
+    def available(self, key: RegisterKey) -> bool:
+        """Return False for registers that are unsupported or quarantined."""
+        return key not in self.quarantine and self.supported(key)
+
+    def register(
+        self,
+        slave: int,
+        address: int,
+        register_type: str,
+        interval: float,
+        count: int = 1,
+    ) -> None:
+        """Poll ``count`` registers from ``address`` every ``interval`` seconds.
+
+        A register shared by several entities is polled at the shortest
+        interval any of them asked for; the words of a multi-register value
+        are always read together in one request. Registrations are counted,
+        so every call needs a matching unregister() to stop the polling.
+        """
+        for offset in range(count):
+            key = (slave, address + offset)
+            self._registrations[key][(interval, address, count)] += 1
+            self.active[key] = register_type
+            self._next_due.setdefault(key, 0.0)
+            self._apply_registrations(key)
+        self._read_plans.clear()
+
+    def unregister(
+        self, slave: int, address: int, interval: float, count: int = 1
+    ) -> None:
+        """Drop one registration made with the same arguments.
+
+        The registers stop being polled once nobody else registered them.
+        """
+        for offset in range(count):
+            key = (slave, address + offset)
+            registrations = self._registrations.get(key)
+            registration = (interval, address, count)
+            if not registrations or not registrations[registration]:
+                continue
+            registrations[registration] -= 1
+            if registrations[registration] <= 0:
+                del registrations[registration]
+            if registrations:
+                self._apply_registrations(key)
+                continue
+            del self._registrations[key]
+            del self.active[key]
+            del self._intervals[key]
+            del self._next_due[key]
+            self._spans.pop(key, None)
+            self.quarantine.discard(key)
+        self._read_plans.clear()
+
+    def _apply_registrations(self, key: RegisterKey) -> None:
+        registrations = self._registrations[key]
+        self._intervals[key] = min(interval for interval, _, _ in registrations)
+        _, first, count = max(registrations, key=lambda registration: registration[2])
+        if count > 1:
+            self._spans[key] = (first, count)
+        else:
+            self._spans.pop(key, None)
+
+    def mark_due(self, key: RegisterKey) -> None:
+        """Read a registered key on the next poll regardless of its tier."""
+        if key in self._next_due:
+            self._next_due[key] = 0.0
+
+    def due_keys(self, now: float) -> frozenset[RegisterKey]:
+        """Return the registered keys whose interval has elapsed."""
+        return frozenset(key for key, due_at in self._next_due.items() if due_at <= now)
+
+    def plan_for(self, keys: frozenset[RegisterKey]) -> list[ReadBlock]:
+        """Return the block reads covering the given active registers."""
+        plan = self._read_plans.get(keys)
+        if plan is None:
+            plan = self._read_plans[keys] = self._build_plan(keys)
+            _LOGGER.debug(
+                "Planned %d block reads for %d due registers", len(plan), len(keys)
+            )
+        return plan
+
+    def _build_plan(self, keys: frozenset[RegisterKey]) -> list[ReadBlock]:
+        # A due word pulls in its whole value so it is never read torn
+        return plan_reads(
+            (
+                (
+                    slave,
+                    self.active[(slave, addr)],
+                    *self._spans.get((slave, addr), (addr, 1)),
+                )
+                for slave, addr in keys
+                if self.supported((slave, addr))
+            ),
+            max_gap=self.max_read_gap,
+            accept=self._accepts
+            if self.capabilities or self.quarantine or self.splits
+            else None,
+        )
+
+    def _accepts(self, slave: int, register_type: str, start: int, end: int) -> bool:
+        # Never read through a quarantined register as part of a gap
+        if self.quarantine and any(
+            (slave, addr) in self.quarantine for addr in range(start, end)
+        ):
+            return False
+        # Keep rejected blocks split until their merged read is retried
+        if self.splits and any(
+            (split := (slave, register_type, addr)) in self.splits
+            and split not in self._merge_retries
+            for addr in range(start + 1, end)
+        ):
+            return False
+        capabilities = self.capabilities.get(slave)
+        return capabilities is None or capabilities.accepts(register_type, start, end)
+
+    def _retry_blocks(self) -> list[ReadBlock]:
+        """Return one read per quarantined value whose retry is due."""
+        blocks = {
+            ReadBlock(
+                key[0], self.active[key].lower(), *self._spans.get(key, (key[1], 1))
+            )
+            for key in self.quarantine.due()
+            if key in self.active
+        }
+        return sorted(blocks, key=lambda block: (block.slave, block.address))
+
+    def _record_result(self, key: RegisterKey, ok: bool) -> None:
+        """Track a key's read result; quarantine changes alter the plan."""
+        if ok:
+            changed = self.quarantine.record_success(key)
+            if changed:
+                _LOGGER.info("Register 0x%04X on unit %d answers again", key[1], key[0])
+        else:
+            changed = self.quarantine.record_failure(key)
+            if changed:
+                _LOGGER.warning(
+                    "Register 0x%04X on unit %d keeps failing; "
+                    "retrying it separately with increasing delays",
+                    key[1],
+                    key[0],
+                )
+        if changed:
+            self._read_plans.clear()
+            self._availability_changed.add(key)
+            self.metrics.quarantined = len(self.quarantine)
+
+    def _values_in(
+        self, block: ReadBlock, keys: frozenset[RegisterKey]
+    ) -> list[tuple[int, int]]:
+        """Return the (first address, count) of each wanted value in a block."""
+        return sorted(
+            {
+                self._spans.get(key, (key[1], 1))
+                for key in keys
+                if self.covers(block, key)
+            }
+        )
+
+    async def _bisect(
+        self, block: ReadBlock, values: list[tuple[int, int]]
+    ) -> tuple[list[tuple[ReadBlock, list[int] | None]] | None, int]:
+        """Read a rejected block's values in halves until every piece answers.
+
+        Returns the pieces with their registers, a value that fails on its
+        own being a piece without registers, and the number of requests
+        sent. The pieces are None if a read failed for any reason other
+        than an illegal data address, for example a timeout: a unit that
+        stopped answering says nothing about its register map.
+        """
+        if len(values) < 2:
+            return [(block, None)], 0
+        half = len(values) // 2
+        pieces: list[tuple[ReadBlock, list[int] | None]] = []
+        requests = 0
+        for part in (values[:half], values[half:]):
+            first = part[0][0]
+            sub_block = ReadBlock(
+                block.slave,
+                block.register_type,
+                first,
+                max(address + count for address, count in part) - first,
+            )
+            result = await self.read_block(sub_block)
+            requests += 1
+            if result.registers:
+                pieces.append((sub_block, result.registers))
+                continue
+            if result.exception_code != EXC_ILLEGAL_DATA_ADDRESS:
+                return None, requests
+            sub_pieces, sub_requests = await self._bisect(sub_block, part)
+            requests += sub_requests
+            if sub_pieces is None:
+                return None, requests
+            pieces.extend(sub_pieces)
+        return pieces, requests
+
+    async def _split_block(
+        self, block: ReadBlock, keys: frozenset[RegisterKey]
+    ) -> tuple[list[tuple[ReadBlock, list[int] | None]] | None, int]:
+        """Bisect a rejected block and remember where it had to be split."""
+        pieces, requests = await self._bisect(block, self._values_in(block, keys))
+        if pieces is None or not any(registers for _, registers in pieces):
+            return None, requests
+        new_splits = 0
+        for piece, _ in pieces[1:]:
+            split = (block.slave, block.register_type, piece.address)
+            new_splits += self.splits.record_failure(split)
+        if new_splits:
+            _LOGGER.info(
+                "Block 0x%04X+%d (%s, unit %d) was rejected; "
+                "reading it as %d smaller blocks",
+                block.address,
+                block.count,
+                block.register_type,
+                block.slave,
+                len(pieces),
+            )
+        self._read_plans.clear()
+        return pieces, requests
+
+    def _merged(self, block: ReadBlock) -> None:
+        """Forget the splits a successfully read block reads across."""
+        released = [
+            addr
+            for addr in range(block.address + 1, block.end)
+            if self.splits.record_success((block.slave, block.register_type, addr))
+        ]
+        if released:
+            _LOGGER.info(
+                "Block 0x%04X+%d (%s, unit %d) reads in one request again",
+                block.address,
+                block.count,
+                block.register_type,
+                block.slave,
+            )
+            self._read_plans.clear()
+
+    def take_availability_changes(self) -> set[RegisterKey]:
+        """Return the keys quarantined or released since the last call."""
+        changed, self._availability_changed = self._availability_changed, set()
+        return changed
+
+    def covers(self, block: ReadBlock, key: RegisterKey) -> bool:
+        """Return True if the block reads the active register behind key."""
+        reg_type = self.active.get(key)
+        return (
+            reg_type is not None
+            and key[0] == block.slave
+            and reg_type.lower() == block.register_type
+            and block.contains(key[1])
+        )
+
+    async def read_block(self, block: ReadBlock) -> ReadResult:
+        """Read one planned block, logging instead of raising on failure."""
+        try:
+            result = await self.client.read_register_result(
+                address=block.address,
+                count=block.count,
+                slave=block.slave,
+                register_type=block.register_type,
+            )
+        except Exception as err:
+            _LOGGER.error(
+                "Error reading block 0x%04X+%d (%s, unit %d): %s",
+                block.address,
+                block.count,
+                block.register_type,
+                block.slave,
+                err,
+            )
+            return ReadResult(None)
+
+        _LOGGER.debug(
+            "Read block 0x%04X+%d (%s, unit %d) → %s",
+            block.address,
+            block.count,
+            block.register_type,
+            block.slave,
+            result.registers,
+        )
+        return result
+
+    async def _read_blocks(self, plan: list[ReadBlock]) -> list[ReadResult]:
+        if self.client.pipelined:
+            # Pipelined client: keep every planned read in flight at once
+            return await asyncio.gather(*(self.read_block(block) for block in plan))
+        return [await self.read_block(block) for block in plan]
+
+    async def async_read(self, keys: set[RegisterKey]) -> dict[RegisterKey, int]:
+        """Read just the given registers now, outside the poll schedule.
+
+        Used to read back written registers without a full poll cycle;
+        inactive keys are skipped and registers that fail to read are left
+        out of the result (and keep their place in the schedule).
+        """
+        wanted = frozenset(key for key in keys if key in self.active)
+        if not wanted:
+            return {}
+        plan = self._build_plan(wanted)
+        responses = await self._read_blocks(plan)
+        now = self._clock()
+
+        values: dict[RegisterKey, int] = {}
+        for block, result in zip(plan, responses, strict=True):
+            for addr, value in block.slice(result.registers or []).items():
+                key = (block.slave, addr)
+                if self.covers(block, key):
+                    values[key] = value
+                    self._next_due[key] = now + self._intervals[key]
+        return values
+
+    async def async_poll(
+        self, previous: dict[RegisterKey, int | None], slack: float = 0.0
+    ) -> dict[RegisterKey, int | None]:
+        """Poll the registers that are due, keeping the rest from ``previous``.
+
+        ``slack`` seconds are taken off every interval so tiers line up with
+        the caller's poll ticks.
+        """
+        results: dict[RegisterKey, int | None] = {
+            key: previous.get(key) for key in self.active
+        }
+        self.refreshed = set()
+        now = self._clock()
+        due = frozenset(key for key in self.due_keys(now) if key not in self.quarantine)
+        retries = self._retry_blocks()
+        if not due and not retries:
+            return results
+        merge_retries = frozenset(self.splits.due())
+        if merge_retries != self._merge_retries:
+            self._merge_retries = merge_retries
+            self._read_plans.clear()
+        if not await self.client.ensure_connected():
+            # Circuit breaker is open: fail the whole cycle fast instead of
+            # letting every block read wait for its own connect timeout
+            raise ClientUnavailable(
+                f"Modbus server {self.client.endpoint} unavailable "
+                f"(circuit {self.client.breaker.state}, "
+                f"retry in {self.client.breaker.retry_in:.0f}s)"
+            )
+        plan = [*self.plan_for(due), *retries] if due else retries
+        started = time.perf_counter()
+
+        responses = await self._read_blocks(plan)
+        requests = len(plan)
+        wanted = due.union(key for key in self.quarantine.due())
+
+        # A unit that answered nothing is down, which says nothing about its
+        # individual registers; a failed retry of a held register still
+        # pushes its next retry back, or it would time out every cycle
+        answered = {
+            block.slave
+            for block, result in zip(plan, responses, strict=True)
+            if not result.unit_silent
+        }
+
+        # A block rejected with an illegal data address reads through a hole
+        # in the register map: bisect it to read around the hole. Timeouts,
+        # gateway exceptions and other errors never cause a split.
+        reads: list[tuple[ReadBlock, list[int] | None]] = []
+        for block, result in zip(plan, responses, strict=True):
+            if result.registers:
+                if self.splits:
+                    self._merged(block)
+            elif result.exception_code == EXC_ILLEGAL_DATA_ADDRESS:
+                pieces, sent = await self._split_block(block, wanted)
+                requests += sent
+                if pieces is not None:
+                    reads.extend(pieces)
+                    continue
+            reads.append((block, result.registers))
+
+        self.metrics.record_cycle(
+            time.perf_counter() - started,
+            requests,
+            sum(1 for _, registers in reads if not registers),
+        )
+
+        for block, registers in reads:
+            if not registers:
+                for key in wanted:
+                    if self.covers(block, key):
+                        results[key] = None
+                        if block.slave in answered or key in self.quarantine:
+                            self._record_result(key, False)
+                continue
+            # Every active register covered by the block is refreshed, due or not
+            for addr, value in block.slice(registers).items():
+                key = (block.slave, addr)
+                if self.covers(block, key):
+                    results[key] = value
+                    self.refreshed.add(key)
+                    self._next_due[key] = now + self._intervals[key] - slack
+                    self._record_result(key, True)
+
+        return results
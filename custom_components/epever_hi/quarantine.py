@@ -0,0 +1,68 @@
+"""Quarantine with exponential retry for registers that keep failing."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Hashable
+import time
+
+
+class RegisterQuarantine:
+    """Hold back keys whose reads failed ``threshold`` polls in a row.
+
+    A held key is left out of the regular poll and retried on its own after
+    ``base_delay`` seconds; every failed retry doubles the delay up to
+    ``max_delay``. One successful read releases the key.
+    """
+
+    def __init__(
+        self,
+        threshold: int = 3,
+        base_delay: float = 30.0,
+        max_delay: float = 3600.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.threshold = threshold
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._clock = clock
+        # Consecutive failures of keys not (yet) held
+        self._failures: dict[Hashable, int] = {}
+        # Held key -> (monotonic retry time, failed retries so far)
+        self._held: dict[Hashable, tuple[float, int]] = {}
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._held
+
+    def __len__(self) -> int:
+        return len(self._held)
+
+    def record_success(self, key: Hashable) -> bool:
+        """Forget the key's failures; return True if this released it."""
+        self._failures.pop(key, None)
+        return self._held.pop(key, None) is not None
+
+    def record_failure(self, key: Hashable) -> bool:
+        """Count a failed read; return True if this put the key on hold."""
+        now = self._clock()
+        if key in self._held:
+            retries = self._held[key][1] + 1
+            delay = min(self.max_delay, self.base_delay * 2**retries)
+            self._held[key] = (now + delay, retries)
+            return False
+        failures = self._failures.get(key, 0) + 1
+        if failures < self.threshold:
+            self._failures[key] = failures
+            return False
+        self._failures.pop(key, None)
+        self._held[key] = (now + self.base_delay, 0)
+        return True
+
+    def due(self) -> list[Hashable]:
+        """Return the held keys whose retry time has come."""
+        now = self._clock()
+        return [key for key, (retry_at, _) in self._held.items() if retry_at <= now]
+
+    def discard(self, key: Hashable) -> None:
+        """Stop tracking a key that is no longer polled."""
+        self._failures.pop(key, None)
+        self._held.pop(key, None)
@@ -0,0 +1,92 @@
+"""Read planner that merges polled Modbus addresses into block reads."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from itertools import groupby
+
+# FC3/FC4 responses carry at most 125 registers (250 data bytes) per PDU
+MAX_REGISTERS_PER_READ = 125
+
+# Unused registers we are willing to read to avoid an extra round trip
+DEFAULT_MAX_READ_GAP = 16
+
+
+@dataclass(frozen=True, slots=True)
+class ReadBlock:
+    """A contiguous range of registers fetched with a single request."""
+
+    slave: int
+    register_type: str
+    address: int
+    count: int
+
+    @property
+    def end(self) -> int:
+        """Return the first address after this block."""
+        return self.address + self.count
+
+    def contains(self, address: int) -> bool:
+        """Return True if the address lies inside this block."""
+        return self.address <= address < self.end
+
+    def slice(self, registers: list[int]) -> dict[int, int]:
+        """Map a block response back onto the individual register addresses."""
+        return {
+            self.address + offset: value
+            for offset, value in enumerate(registers[: self.count])
+        }
+
+
+def plan_reads(
+    addresses: Iterable[tuple[int, str, int] | tuple[int, str, int, int]],
+    max_gap: int = DEFAULT_MAX_READ_GAP,
+    max_count: int = MAX_REGISTERS_PER_READ,
+    accept: Callable[[int, str, int, int], bool] | None = None,
+) -> list[ReadBlock]:
+    """Group (slave, register_type, address[, count]) tuples into read blocks.
+
+    Addresses sharing a slave and register type are merged when the hole
+    between them is at most ``max_gap`` registers and the resulting block
+    stays within ``max_count`` registers. An optional count marks a
+    multi-word value; its words always land in the same block so the value
+    is read in one transaction.
+
+    ``accept(slave, register_type, start, end)`` may veto a merge, for
+    example one that would read through a register the device rejects.
+    """
+    max_gap = max(0, max_gap)
+    max_count = max(1, min(max_count, MAX_REGISTERS_PER_READ))
+
+    spans = set()
+    for slave, reg_type, addr, *rest in addresses:
+        count = rest[0] if rest else 1
+        if not 1 <= count <= max_count:
+            raise ValueError(
+                f"Cannot read {count} registers at 0x{addr:04X} in one request"
+            )
+        spans.add((slave, reg_type.lower(), addr, count))
+
+    blocks: list[ReadBlock] = []
+    for (slave, reg_type), group in groupby(sorted(spans), key=lambda item: item[:2]):
+        start: int | None = None
+        end = 0
+        for _, _, addr, count in group:
+            if start is None:
+                start, end = addr, addr + count
+                continue
+            merged_end = max(end, addr + count)
+            if (
+                addr - end <= max_gap
+                and merged_end - start <= max_count
+                and (accept is None or accept(slave, reg_type, start, merged_end))
+            ):
+                end = merged_end
+                continue
+            blocks.append(ReadBlock(slave, reg_type, start, end - start))
+            start, end = addr, addr + count
+        if start is not None:
+            blocks.append(ReadBlock(slave, reg_type, start, end - start))
+
+    return blocks
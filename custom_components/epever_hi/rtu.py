@@ -0,0 +1,428 @@
+"""Modbus RTU framing, bus timing and the native RTU transports.
+
+Kept free of Home Assistant imports; pyserial is only needed once a serial
+transport is actually opened.
+"""
+
+from __future__ import annotations
+
+import abc
+import asyncio
+import logging
+
+from .modbus_pipeline import (
+    FC_READ_HOLDING_REGISTERS,
+    FC_READ_INPUT_REGISTERS,
+    FC_READ_WRITE_MULTIPLE_REGISTERS,
+    ModbusExceptionResponse,
+    ModbusPipelineError,
+    ModbusTransport,
+)
+
+try:
+    import serial
+except ImportError:  # pragma: no cover - only the serial transport needs it
+    serial = None
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_BAUDRATE = 115200
+BAUDRATES = (9600, 19200, 38400, 57600, 115200)
+PARITIES = ("N", "E", "O")
+
+# Above 19200 baud the spec fixes the inter-frame silence at 1.75 ms
+_FIXED_GAP_BAUDRATE = 19200
+_FIXED_FRAME_GAP = 0.00175
+
+# Slave + function code + exception code + CRC
+_EXCEPTION_FRAME_SIZE = 5
+
+# Responses whose third byte counts the data bytes that follow
+_BYTE_COUNT_FUNCTIONS = (
+    FC_READ_HOLDING_REGISTERS,
+    FC_READ_INPUT_REGISTERS,
+    FC_READ_WRITE_MULTIPLE_REGISTERS,
+)
+
+# Time the controller typically needs between request and response
+DEFAULT_TURNAROUND = 0.01
+
+
+def _crc_table() -> list[int]:
+    table = []
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0xA001 if crc & 1 else crc >> 1
+        table.append(crc)
+    return table
+
+
+_CRC_TABLE = _crc_table()
+
+
+def crc16(data: bytes, crc: int = 0xFFFF) -> int:
+    """Return the Modbus CRC-16 of data, continuing from a previous ``crc``."""
+    for byte in data:
+        crc = (crc >> 8) ^ _CRC_TABLE[(crc ^ byte) & 0xFF]
+    return crc
+
+
+def build_frame(slave: int, pdu: bytes) -> bytes:
+    """Return the RTU frame for a request PDU: unit ID, PDU and CRC."""
+    frame = bytes((slave,)) + pdu
+    return frame + crc16(frame).to_bytes(2, "little")
+
+
+def char_time(baudrate: int, parity: str = "N", stopbits: int = 1) -> float:
+    """Return the seconds one character takes on the wire.
+
+    A character is a start bit, 8 data bits, an optional parity bit and the
+    stop bits.
+    """
+    bits = 1 + 8 + (parity != "N") + stopbits
+    return bits / baudrate
+
+
+def frame_gap(baudrate: int, parity: str = "N", stopbits: int = 1) -> float:
+    """Return the 3.5-character silence that delimits RTU frames."""
+    if baudrate > _FIXED_GAP_BAUDRATE:
+        return _FIXED_FRAME_GAP
+    return 3.5 * char_time(baudrate, parity, stopbits)
+
+
+def expected_response_length(pdu: bytes) -> int:
+    """Return the RTU frame length of a normal response to the request PDU.
+
+    Exception responses are shorter and are recognised by their function code.
+    """
+    if pdu[0] in _BYTE_COUNT_FUNCTIONS:
+        count = int.from_bytes(pdu[3:5], "big")
+        return 5 + 2 * count  # slave, function, byte count, data, CRC
+    # FC6 echoes address and value, FC16 address and count
+    return 8
+
+
+def break_even_gap(
+    baudrate: int,
+    parity: str = "N",
+    stopbits: int = 1,
+    turnaround: float = DEFAULT_TURNAROUND,
+) -> int:
+    """Return how many unused registers are cheaper to read than a new request.
+
+    A separate request costs its own frame, the response header and CRC, two
+    frame gaps and the device turnaround; reading through a hole costs two
+    characters per register.
+    """
+    char = char_time(baudrate, parity, stopbits)
+    overhead = (
+        (8 + _EXCEPTION_FRAME_SIZE) * char
+        + 2 * frame_gap(baudrate, parity, stopbits)
+        + turnaround
+    )
+    return min(124, int(overhead / (2 * char)))
+
+
+class RtuFrameAssembler:
+    """Reassemble one RTU response from however the bytes were split.
+
+    The frame length starts out as the one the request implies and is fixed
+    by the header once it arrives: an exception response is five bytes, a
+    read carries its byte count. The CRC is updated with every fragment, so
+    a complete frame is validated without another pass over it.
+    """
+
+    __slots__ = ("_crc", "expected", "frame")
+
+    def __init__(self, expected: int) -> None:
+        self.expected = expected
+        self.frame = bytearray()
+        self._crc = 0xFFFF
+
+    @property
+    def complete(self) -> bool:
+        """Return True once the whole frame has arrived."""
+        return len(self.frame) >= self.expected
+
+    @property
+    def valid(self) -> bool:
+        """Return True if the complete frame passed its CRC check."""
+        # The CRC over a frame including its own CRC is zero
+        return self.complete and self._crc == 0
+
+    def feed(self, data: bytes) -> bytes:
+        """Consume data up to the end of the frame and return the rest."""
+        used = 0
+        while used < len(data) and not self.complete:
+            # Take the header bytes one call at a time until the length is known
+            limit = self.expected if len(self.frame) >= 3 else 3
+            take = data[used : used + limit - len(self.frame)]
+            used += len(take)
+            self.frame += take
+            self._crc = crc16(take, self._crc)
+            self._update_expected()
+        return data[used:]
+
+    def _update_expected(self) -> None:
+        frame = self.frame
+        if len(frame) >= 2 and frame[1] & 0x80:
+            self.expected = _EXCEPTION_FRAME_SIZE
+        elif len(frame) >= 3 and frame[1] in _BYTE_COUNT_FUNCTIONS:
+            self.expected = 5 + frame[2]
+
+
+class _RtuMaster(ModbusTransport):
+    """One RTU transaction at a time, each response framed by its length.
+
+    Subclasses deliver received bytes to ``_receive`` and send frames in
+    ``_send``; a transaction completes the moment its last byte arrives.
+    """
+
+    def __init__(self, timeout: float) -> None:
+        self.timeout = timeout
+        self._lock = asyncio.Lock()
+        self._assembler: RtuFrameAssembler | None = None
+        self._response: asyncio.Future[RtuFrameAssembler] | None = None
+
+    @property
+    @abc.abstractmethod
+    def name(self) -> str:
+        """Return the port or address used in log and error messages."""
+
+    @abc.abstractmethod
+    async def _send(self, frame: bytes, expected: int) -> float:
+        """Send a request frame and return how long to wait for the response."""
+
+    async def execute(self, slave: int, pdu: bytes) -> bytes:
+        """Send a request PDU and return the response PDU."""
+        async with self._lock:
+            if not self.connected and not await self.connect():
+                raise ModbusPipelineError(f"Not connected to {self.name}")
+
+            expected = expected_response_length(pdu)
+            self._assembler = RtuFrameAssembler(expected)
+            self._response = asyncio.get_running_loop().create_future()
+            try:
+                timeout = await self._send(build_frame(slave, pdu), expected)
+                assembler = await asyncio.wait_for(self._response, timeout)
+            finally:
+                self._assembler = self._response = None
+        return self._check_frame(slave, pdu, assembler)
+
+    def _receive(self, data: bytes) -> None:
+        assembler = self._assembler
+        if assembler is None or self._response.done():
+            # Late bytes of a timed out response must not start the next frame
+            _LOGGER.debug("Discarding %d stray bytes from %s", len(data), self.name)
+            return
+        rest = assembler.feed(data)
+        if assembler.complete:
+            self._response.set_result(assembler)
+            if rest:
+                _LOGGER.debug("Discarding %d bytes after a frame", len(rest))
+
+    def _connection_lost(self, reason: str) -> None:
+        if self._response is not None and not self._response.done():
+            self._response.set_exception(
+                ModbusPipelineError(f"Connection to {self.name} lost: {reason}")
+            )
+
+    def _check_frame(
+        self, slave: int, pdu: bytes, assembler: RtuFrameAssembler
+    ) -> bytes:
+        frame = assembler.frame
+        if not assembler.valid:
+            raise ModbusPipelineError("Response CRC mismatch")
+        if frame[0] != slave or (frame[1] & 0x7F) != pdu[0]:
+            raise ModbusPipelineError(
+                f"Response from unit {frame[0]} function 0x{frame[1]:02X} "
+                f"does not match the request"
+            )
+        if frame[1] & 0x80:
+            raise ModbusExceptionResponse(pdu[0], frame[2])
+        return bytes(frame[1:-2])
+
+
+class ModbusRtuSerial(_RtuMaster):
+    """Modbus RTU master on a local serial port.
+
+    Frames are delimited by the 3.5-character silence computed from the baud
+    rate rather than a fixed sleep, and a response is complete as soon as
+    the number of bytes the request implies has arrived, so reads never wait
+    for a timeout to find the end of a frame.
+    """
+
+    def __init__(
+        self,
+        port: str,
+        baudrate: int = DEFAULT_BAUDRATE,
+        parity: str = "N",
+        stopbits: int = 1,
+        timeout: float = 1.0,
+    ) -> None:
+        super().__init__(timeout)
+        self.port = port
+        self.baudrate = baudrate
+        self.parity = parity
+        self.stopbits = stopbits
+        self.char_time = char_time(baudrate, parity, stopbits)
+        self.frame_gap = frame_gap(baudrate, parity, stopbits)
+
+        self._serial = None
+        # Loop time the bus last carried a character, ours or the device's
+        self._last_activity = 0.0
+
+    @property
+    def name(self) -> str:
+        """Return the serial device path."""
+        return self.port
+
+    @property
+    def connected(self) -> bool:
+        """Return True while the serial port is open."""
+        return self._serial is not None and self._serial.is_open
+
+    async def connect(self) -> bool:
+        """Open the serial port and start watching it for incoming bytes."""
+        if self.connected:
+            return True
+        if serial is None:
+            _LOGGER.error("pyserial is required for serial port %s", self.port)
+            return False
+        loop = asyncio.get_running_loop()
+        try:
+            self._serial = await loop.run_in_executor(None, self._open)
+        except (OSError, serial.SerialException) as err:
+            _LOGGER.debug("Opening serial port %s failed: %s", self.port, err)
+            return False
+        loop.add_reader(self._serial.fileno(), self._on_readable)
+        return True
+
+    def _open(self):
+        return serial.Serial(
+            self.port,
+            baudrate=self.baudrate,
+            bytesize=serial.EIGHTBITS,
+            parity=self.parity,
+            stopbits=self.stopbits,
+            timeout=0,
+        )
+
+    async def close(self) -> None:
+        """Close the serial port."""
+        self._close_port("closed")
+
+    def _close_port(self, reason: str) -> None:
+        if self._serial is None:
+            return
+        port, self._serial = self._serial, None
+        asyncio.get_running_loop().remove_reader(port.fileno())
+        port.close()
+        self._connection_lost(reason)
+
+    def _on_readable(self) -> None:
+        try:
+            data = self._serial.read(self._serial.in_waiting or 1)
+        except (OSError, serial.SerialException) as err:
+            self._close_port(str(err))
+            return
+        if not data:
+            # Readable without data: the device went away
+            self._close_port("device disconnected")
+            return
+        self._last_activity = asyncio.get_running_loop().time()
+        self._receive(data)
+
+    def transfer_time(self, size: int) -> float:
+        """Return the seconds ``size`` characters occupy the bus."""
+        return size * self.char_time
+
+    async def _send(self, frame: bytes, expected: int) -> float:
+        """Send once the bus has been silent for a full frame gap."""
+        loop = asyncio.get_running_loop()
+        silent_until = self._last_activity + self.frame_gap
+        if (wait := silent_until - loop.time()) > 0:
+            await asyncio.sleep(wait)
+        try:
+            self._serial.write(frame)
+        except (OSError, serial.SerialException) as err:
+            self._close_port(str(err))
+            raise ModbusPipelineError(f"Serial write failed: {err}") from err
+        sent = self.transfer_time(len(frame))
+        self._last_activity = loop.time() + sent
+        return sent + self.timeout + self.transfer_time(expected)
+
+
+class _RtuOverTcpProtocol(asyncio.Protocol):
+    """Hands every received TCP segment straight to the RTU master."""
+
+    def __init__(self, master: ModbusRtuOverTcp) -> None:
+        self._master = master
+
+    def data_received(self, data: bytes) -> None:
+        self._master._receive(data)
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        self._master._transport_lost(exc)
+
+
+class ModbusRtuOverTcp(_RtuMaster):
+    """Modbus RTU frames tunnelled through a TCP gateway.
+
+    Gateways forward the serial bytes as they come, often splitting one
+    frame across several TCP segments. Segments are reassembled until the
+    length the request implies has arrived, so a read returns as soon as
+    its frame is complete instead of when a timeout ends it.
+    """
+
+    def __init__(self, host: str, port: int, timeout: float = 2.0) -> None:
+        super().__init__(timeout)
+        self.host = host
+        self.port = port
+        self._transport: asyncio.Transport | None = None
+        self._connect_lock = asyncio.Lock()
+
+    @property
+    def name(self) -> str:
+        """Return the gateway address."""
+        return f"{self.host}:{self.port}"
+
+    @property
+    def connected(self) -> bool:
+        """Return True while the socket is open."""
+        return self._transport is not None and not self._transport.is_closing()
+
+    async def connect(self) -> bool:
+        """Open the TCP connection to the gateway."""
+        async with self._connect_lock:
+            if self.connected:
+                return True
+            loop = asyncio.get_running_loop()
+            try:
+                self._transport, _ = await asyncio.wait_for(
+                    loop.create_connection(
+                        lambda: _RtuOverTcpProtocol(self), self.host, self.port
+                    ),
+                    self.timeout,
+                )
+            except (OSError, TimeoutError) as err:
+                _LOGGER.debug("RTU connect to %s failed: %s", self.name, err)
+                return False
+            return True
+
+    async def close(self) -> None:
+        """Close the socket and fail the outstanding transaction."""
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+        self._connection_lost("closed")
+
+    def _transport_lost(self, exc: Exception | None) -> None:
+        _LOGGER.debug("RTU connection to %s lost: %s", self.name, exc)
+        self._transport = None
+        self._connection_lost(str(exc) if exc else "closed by gateway")
+
+    async def _send(self, frame: bytes, expected: int) -> float:
+        self._transport.write(frame)
+        return self.timeout
@@ -5,11 +5,10 @@ from typing import Any
 from homeassistant.components.select import SelectEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN, LOGGER, SELECT_DEFINITIONS, get_device_info
+from .const import DEFAULT_POLL_TIER, DOMAIN, LOGGER, SELECT_DEFINITIONS
+from .entity import EpeverHiEntity
 
 
 async def async_setup_entry(
@@ -20,49 +19,56 @@ async def async_setup_entry(
     coordinator = hass.data[DOMAIN][entry.entry_id]
     selects = []
 
-    for addr, reg in SELECT_DEFINITIONS.items():
-        if (
-            reg.get("options")
-            and reg.get("writable")
-            and (
-                not reg.get("entity_type") == "switch"
-                and not reg.get("entity_type") == "button"
-            )
-        ):
-            reg_type = reg.get("register_type", "holding")
-            coordinator.register_address(addr, reg_type)
-            selects.append(
-                EpeverHiModbusSelect(
-                    coordinator=coordinator,
-                    reg=reg,
-                    address=addr,
-                    entry_id=entry.entry_id,
+    for slave in coordinator.slaves:
+        for addr, reg in SELECT_DEFINITIONS.items():
+            if (
+                coordinator.group_enabled(reg)
+                and reg.get("options")
+                and reg.get("writable")
+                and (
+                    not reg.get("entity_type") == "switch"
+                    and not reg.get("entity_type") == "button"
+                )
+            ):
+                selects.append(
+                    EpeverHiModbusSelect(
+                        coordinator=coordinator,
+                        reg=reg,
+                        address=addr,
+                        slave=slave,
+                        entry_id=entry.entry_id,
+                    )
                 )
-            )
 
     LOGGER.debug("Adding %d Modbus select entities for EPEVER Hi", len(selects))
     async_add_entities(selects)
 
 
-class EpeverHiModbusSelect(CoordinatorEntity, SelectEntity):
+class EpeverHiModbusSelect(EpeverHiEntity, SelectEntity):
     """Select entity that maps values from Modbus register options."""
 
     def __init__(
         self,
-        coordinator: CoordinatorEntity,
+        coordinator,
         reg: dict[str, Any],
         address: int,
+        slave: int,
         entry_id: str,
     ):
-        super().__init__(coordinator)
-        self._address = address
+        super().__init__(
+            coordinator,
+            address,
+            slave,
+            entry_id,
+            f"epever_hi_select_{reg['key']}",
+            register_type=reg.get("register_type", "holding"),
+            poll_tier=reg.get("poll_tier", DEFAULT_POLL_TIER),
+        )
         self._options_map = reg["options"]
         self._reverse_map = {v: k for k, v in self._options_map.items()}
 
         self._attr_name = reg["name"]
-        self._attr_unique_id = f"epever_hi_select_{reg['key']}"
         self._attr_options = list(self._reverse_map.keys())
-        self._attr_device_info = DeviceInfo(**get_device_info(entry_id))
 
         LOGGER.debug(
             "Initialized select '%s' with options: %s",
@@ -72,7 +78,7 @@ class EpeverHiModbusSelect(CoordinatorEntity, SelectEntity):
 
     @property
     def current_option(self) -> str | None:
-        raw = self.coordinator.data.get(self._address)
+        raw = self._raw_value()
         if raw is None:
             LOGGER.debug("No data at 0x%04X for select %s", self._address, self.name)
             return None
@@ -89,7 +95,9 @@ class EpeverHiModbusSelect(CoordinatorEntity, SelectEntity):
 
         value = self._reverse_map[option]
         try:
-            ok = await self.coordinator.async_write_register(self._address, value)
+            ok = await self.coordinator.async_write_register(
+                self._address, value, self._slave, coalesce=True
+            )
             if ok:
                 LOGGER.debug(
                     "Wrote value %d to 0x%04X for option '%s'",
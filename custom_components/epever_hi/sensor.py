@@ -5,11 +5,21 @@ from typing import Any
 from homeassistant.components.sensor import SensorEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.entity import DeviceInfo, EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN, LOGGER, SENSOR_DEFINITIONS_NEW, get_device_info
+from .const import (
+    DEFAULT_POLL_TIER,
+    DOMAIN,
+    LOGGER,
+    METRIC_SENSOR_DEFINITIONS,
+    SENSOR_DEFINITIONS_NEW,
+    get_device_info,
+    scoped_unique_id,
+)
+from .decoder import register_count
+from .entity import EpeverHiEntity
 
 # Build sensor definitions from the new structure
 SENSOR_DEFINITIONS = [
@@ -27,13 +37,13 @@ async def async_setup_entry(
     """Set up EPEVER Hi Modbus sensors based on config entry."""
     coordinator = hass.data[DOMAIN][entry.entry_id]
     sensors = []
-    for definition in SENSOR_DEFINITIONS:
-        reg_type = definition.get("register_type", "holding")
-        coordinator.register_address(definition["address"], reg_type)
-        if definition.get("type") == "float32":
-            # For float32, we need to register both high and low addresses
-            coordinator.register_address(definition["address"] + 1, reg_type)
-        sensors.append(EpeverHiModbusSensor(coordinator, definition, entry.entry_id))
+    for slave in coordinator.slaves:
+        for definition in SENSOR_DEFINITIONS:
+            if not coordinator.group_enabled(definition):
+                continue
+            sensors.append(
+                EpeverHiModbusSensor(coordinator, definition, slave, entry.entry_id)
+            )
     #     EpeverHiModbusSensor(coordinator, definition, entry.entry_id)
     #     for definition in SENSOR_DEFINITIONS:
     #     coordinator.register_address(definition["address"])
@@ -46,29 +56,41 @@ async def async_setup_entry(
     for sensor in sensors:
         LOGGER.debug("  • %s (address: 0x%04X)", sensor.name, sensor._address)
 
+    # Metric sensors read no register
+    sensors.extend(
+        EpeverHiMetricSensor(coordinator, key, definition, entry.entry_id)
+        for key, definition in METRIC_SENSOR_DEFINITIONS.items()
+    )
+
     async_add_entities(sensors)
 
 
-class EpeverHiModbusSensor(CoordinatorEntity, SensorEntity):
+class EpeverHiModbusSensor(EpeverHiEntity, SensorEntity):
     """Sensor entity for a Modbus register on the EPEVER Hi device."""
 
     def __init__(
         self,
-        coordinator: CoordinatorEntity,
+        coordinator: Any,  # EpeverHiModbusCoordinator
         reg: dict[str, Any],
+        slave: int,
         entry_id: str,
     ):
-        super().__init__(coordinator)
-        self._address = reg["address"]
-        self._scale = reg.get("scale", 1)
-        self._precision = reg.get("precision", 0)
+        super().__init__(
+            coordinator,
+            reg["address"],
+            slave,
+            entry_id,
+            f"epever_hi_sensor_{reg['key']}",
+            # Multi-word values register all their words as one span
+            count=register_count(reg),
+            register_type=reg.get("register_type", "holding"),
+            poll_tier=reg.get("poll_tier", DEFAULT_POLL_TIER),
+        )
+        self._key = reg["key"]
 
         self._attr_name = reg["name"]
         self._attr_native_unit_of_measurement = reg.get("unit")
         self._attr_device_class = reg.get("device_class")
-        self._attr_unique_id = f"epever_hi_sensor_{reg['key']}"
-        self._type = reg.get("type", "uint16")
-        self._attr_device_info = DeviceInfo(**get_device_info(entry_id))
 
         LOGGER.debug(
             "Initialized sensor %s (unique_id=%s) at address 0x%04X",
@@ -79,44 +101,8 @@ class EpeverHiModbusSensor(CoordinatorEntity, SensorEntity):
 
     @property
     def native_value(self) -> float | None:
-        """Return the scaled value from the coordinator's data and log it."""
-
-        if self._type == "float32":
-            raw_hi = self.coordinator.data.get(self._address)
-            raw_lo = self.coordinator.data.get(self._address + 1)
-            if raw_hi is None or raw_lo is None:
-                LOGGER.debug(
-                    "No data for %s at addresses 0x%04X/0x%04X",
-                    self.name,
-                    self._address,
-                    self._address + 1,
-                )
-                return None
-
-            import struct
-
-            try:
-                combined_bytes = struct.pack(">HH", raw_hi, raw_lo)
-                value = struct.unpack(">f", combined_bytes)[0]
-            except Exception as e:
-                LOGGER.warning("Failed to decode float32 for %s: %s", self.name, e)
-                return None
-
-            scaled = round(value, self._precision)
-            LOGGER.debug(
-                "%s: raw float32=(%s, %s) → %s", self.name, raw_hi, raw_lo, scaled
-            )
-            return scaled
-
-        # default UInt16 logic
-        raw = self.coordinator.data.get(self._address)
-        if raw is None:
-            LOGGER.debug("No data for %s at address 0x%04X", self.name, self._address)
-            return None
-
-        scaled = round(raw * self._scale, self._precision)
-        LOGGER.debug("%s: raw=%s → scaled=%s", self.name, raw, scaled)
-        return scaled
+        """Return the value the coordinator decoded for this poll."""
+        return self.coordinator.values.get((self._slave, self._key))
 
     # @property
     # def native_value(self) -> float | None:
@@ -133,3 +119,38 @@ class EpeverHiModbusSensor(CoordinatorEntity, SensorEntity):
     #         "%s: raw=%s → scaled=%s", self.name, raw, scaled
     #     )
     #     return scaled
+
+
+class EpeverHiMetricSensor(CoordinatorEntity, SensorEntity):
+    """Diagnostic sensor publishing one poll or transport metric.
+
+    Disabled by default; enable it to size poll intervals for a site.
+    """
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(
+        self,
+        coordinator: Any,  # EpeverHiModbusCoordinator
+        key: str,
+        definition: dict[str, Any],
+        entry_id: str,
+    ) -> None:
+        super().__init__(coordinator)
+        self._key = key
+        self._attr_name = definition["name"]
+        self._attr_unique_id = scoped_unique_id(entry_id, f"epever_hi_metric_{key}")
+        self._attr_native_unit_of_measurement = definition.get("unit")
+        self._attr_state_class = definition.get("state_class")
+        self._attr_device_info = DeviceInfo(**get_device_info(entry_id))
+
+    @property
+    def available(self) -> bool:
+        """Metrics stay readable while the device is unreachable."""
+        return True
+
+    @property
+    def native_value(self) -> float | int | None:
+        """Return the current metric value."""
+        return self.coordinator.metrics_snapshot().get(self._key)
@@ -0,0 +1,74 @@
+"""Services for the EPEVER Hi integration."""
+
+from __future__ import annotations
+
+from homeassistant.core import HomeAssistant, ServiceCall, callback
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+import homeassistant.helpers.config_validation as cv
+import voluptuous as vol
+
+from .charging_profile import (
+    PROFILE_COUNT,
+    PROFILE_KEYS,
+    PROFILE_START,
+    ChargingProfileError,
+    decode_profile,
+    encode_profile,
+)
+from .const import DOMAIN, LOGGER, REGISTER_DEFINITIONS
+
+SERVICE_APPLY_CHARGING_PROFILE = "apply_charging_profile"
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_SLAVE = "slave"
+
+APPLY_CHARGING_PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_SLAVE): vol.All(vol.Coerce(int), vol.Range(min=1, max=247)),
+        **{vol.Optional(key): vol.Coerce(float) for key in PROFILE_KEYS},
+    }
+)
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration services."""
+
+    async def async_apply_charging_profile(call: ServiceCall) -> None:
+        """Write a whole charging profile with a single FC16 transaction."""
+        entry_id = call.data[ATTR_CONFIG_ENTRY_ID]
+        coordinator = hass.data.get(DOMAIN, {}).get(entry_id)
+        if coordinator is None:
+            raise ServiceValidationError(f"No loaded EPEVER Hi entry {entry_id}")
+        slave = call.data.get(ATTR_SLAVE, coordinator.primary_slave)
+        if slave not in coordinator.slaves:
+            raise ServiceValidationError(f"Unit {slave} is not part of {entry_id}")
+
+        # Values left out of the call keep what the device reported last
+        data = coordinator.data or {}
+        profile = decode_profile(
+            [data.get((slave, PROFILE_START + n)) for n in range(PROFILE_COUNT)],
+            REGISTER_DEFINITIONS,
+        )
+        profile.update(
+            {key: call.data[key] for key in PROFILE_KEYS if key in call.data}
+        )
+
+        try:
+            registers = encode_profile(profile, REGISTER_DEFINITIONS)
+        except ChargingProfileError as err:
+            raise ServiceValidationError(str(err)) from err
+
+        LOGGER.debug("Applying charging profile to unit %d: %s", slave, profile)
+        if not await coordinator.async_write_registers(PROFILE_START, registers, slave):
+            raise HomeAssistantError(
+                f"Writing the charging profile to unit {slave} failed"
+            )
+
+    if not hass.services.has_service(DOMAIN, SERVICE_APPLY_CHARGING_PROFILE):
+        hass.services.async_register(
+            DOMAIN,
+            SERVICE_APPLY_CHARGING_PROFILE,
+            async_apply_charging_profile,
+            schema=APPLY_CHARGING_PROFILE_SCHEMA,
+        )
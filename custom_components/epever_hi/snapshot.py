@@ -0,0 +1,98 @@
+"""Warm-start snapshot of the last good register values and unit identity.
+
+Kept free of Home Assistant imports; the coordinator persists the JSON form
+through a helpers.storage.Store.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass, field
+import logging
+from typing import Any
+
+from .poller import RegisterKey
+
+_LOGGER = logging.getLogger(__package__)
+
+SNAPSHOT_VERSION = 1
+
+# Store.async_delay_save(data_func, delay)
+DelaySave = Callable[[Callable[[], dict[str, Any]], float], None]
+
+
+@dataclass(slots=True)
+class Snapshot:
+    """Register values of the last good poll plus static identity registers."""
+
+    registers: dict[RegisterKey, int] = field(default_factory=dict)
+    # slave -> FIRMWARE_INFO key -> raw registers (serial, model, firmware)
+    identity: dict[int, dict[str, list[int]]] = field(default_factory=dict)
+    saved_at: float = 0.0  # UNIX time of the poll the values came from
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the JSON form; object keys must be strings."""
+        registers: dict[str, dict[str, int]] = {}
+        for (slave, address), value in self.registers.items():
+            registers.setdefault(str(slave), {})[str(address)] = value
+        return {
+            "saved_at": self.saved_at,
+            "registers": registers,
+            "identity": {
+                str(slave): dict(values) for slave, values in self.identity.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, stored: Any) -> Snapshot | None:
+        """Parse a stored snapshot, or return None if it is unusable."""
+        try:
+            return cls(
+                registers={
+                    (int(slave), int(address)): int(value)
+                    for slave, values in stored["registers"].items()
+                    for address, value in values.items()
+                },
+                identity={
+                    int(slave): {
+                        key: [int(word) for word in raw] for key, raw in values.items()
+                    }
+                    for slave, values in stored.get("identity", {}).items()
+                },
+                saved_at=float(stored["saved_at"]),
+            )
+        except (AttributeError, KeyError, TypeError, ValueError) as err:
+            _LOGGER.warning("Ignoring unreadable register snapshot: %s", err)
+            return None
+
+
+class SnapshotSaver:
+    """Schedule a delayed snapshot save that later polls do not push back.
+
+    Store.async_delay_save() restarts its timer on every call, so calling it
+    on each poll cycle would postpone the save for as long as polling
+    succeeds. A save is only scheduled while none is pending; the data
+    callback, run when the save happens, clears the pending flag.
+    """
+
+    def __init__(
+        self,
+        delay_save: DelaySave,
+        data: Callable[[], dict[str, Any]],
+        delay: float,
+    ) -> None:
+        self._delay_save = delay_save
+        self._data = data
+        self._delay = delay
+        self.pending = False
+
+    def schedule(self) -> None:
+        """Save within ``delay`` seconds unless a save is already due."""
+        if self.pending:
+            return
+        self.pending = True
+        self._delay_save(self._saved_data, self._delay)
+
+    def _saved_data(self) -> dict[str, Any]:
+        self.pending = False
+        return self._data()
@@ -3,30 +3,34 @@ from __future__ import annotations
 from homeassistant.components.switch import SwitchEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN, LOGGER, SWITCH_DEFINITIONS, get_device_info
+from .const import DEFAULT_POLL_TIER, DOMAIN, LOGGER, SWITCH_DEFINITIONS
+from .entity import EpeverHiEntity
 
 
-class EpeverHiSwitch(CoordinatorEntity, SwitchEntity):
+class EpeverHiSwitch(EpeverHiEntity, SwitchEntity):
     """Modbus-based switch entity for EPEVER Hi."""
 
-    def __init__(self, coordinator, props: dict, entry_id: str):
-        super().__init__(coordinator)
-        self._address = props["address"]
+    def __init__(self, coordinator, props: dict, slave: int, entry_id: str):
+        super().__init__(
+            coordinator,
+            props["address"],
+            slave,
+            entry_id,
+            f"epever_hi_switch_{props['key']}",
+            register_type=props.get("register_type", "holding"),
+            poll_tier=props.get("poll_tier", DEFAULT_POLL_TIER),
+        )
         self._bit = props.get("bit")
         self._key = props["key"]
 
         self._attr_name = props["name"]
-        self._attr_unique_id = f"epever_hi_switch_{self._key}"
         # self._attr_entity_category = EntityCategory.CONFIG
-        self._attr_device_info = DeviceInfo(**get_device_info(entry_id))
 
     @property
     def is_on(self) -> bool | None:
-        raw = self.coordinator.data.get(self._address)
+        raw = self._raw_value()
         if raw is None:
             return None
 
@@ -36,7 +40,9 @@ class EpeverHiSwitch(CoordinatorEntity, SwitchEntity):
 
     async def async_turn_on(self, **kwargs):
         try:
-            ok = await self.coordinator.async_write_register(self._address, 1)
+            ok = await self.coordinator.async_write_register(
+                self._address, 1, self._slave
+            )
             if ok:
                 LOGGER.debug("Wrote value 1 to 0x%04X", self._address)
         except Exception as err:
@@ -46,7 +52,9 @@ class EpeverHiSwitch(CoordinatorEntity, SwitchEntity):
 
     async def async_turn_off(self, **kwargs):
         try:
-            ok = await self.coordinator.async_write_register(self._address, 0)
+            ok = await self.coordinator.async_write_register(
+                self._address, 0, self._slave
+            )
             if ok:
                 LOGGER.debug("Wrote value 0 to 0x%04X", self._address)
         except Exception as err:
@@ -61,15 +69,19 @@ async def async_setup_entry(
     coordinator = hass.data[DOMAIN][entry.entry_id]
     switches = []
 
-    for address, props in SWITCH_DEFINITIONS.items():
-        if props.get("entity_type") == "switch":
-            reg_type = props.get("register_type", "holding")
-            coordinator.register_address(address, reg_type)
-            switches.append(
-                EpeverHiSwitch(
-                    coordinator, {**props, "address": address}, entry.entry_id
+    for slave in coordinator.slaves:
+        for address, props in SWITCH_DEFINITIONS.items():
+            if props.get("entity_type") == "switch" and coordinator.group_enabled(
+                props
+            ):
+                switches.append(
+                    EpeverHiSwitch(
+                        coordinator,
+                        {**props, "address": address},
+                        slave,
+                        entry.entry_id,
+                    )
                 )
-            )
 
     LOGGER.debug("Adding %d switches", len(switches))
     async_add_entities(switches)
@@ -0,0 +1,100 @@
+"""Per-register write coalescing for bursts of UI writes.
+
+Kept free of Home Assistant imports so it can be tested on its own.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+import logging
+
+_LOGGER = logging.getLogger(__package__)
+
+
+class _PendingWrite:
+    """The latest value queued for one key and everyone waiting on it."""
+
+    __slots__ = ("future", "handle", "value")
+
+    def __init__(self, value: int, future: asyncio.Future[bool]) -> None:
+        self.value = value
+        self.future = future
+        self.handle: asyncio.TimerHandle | None = None
+
+
+class WriteCoalescer:
+    """Collapse writes to the same key that arrive within ``window`` seconds.
+
+    Every call restarts the key's window; when it expires only the latest
+    value is written and all callers of the burst get that write's result.
+    Writes to one key never overlap: a value queued while the previous write
+    is still on the wire is sent after it completes.
+    """
+
+    def __init__(
+        self, write: Callable[[Hashable, int], Awaitable[bool]], window: float
+    ) -> None:
+        self._write = write
+        self.window = window
+        self._pending: dict[Hashable, _PendingWrite] = {}
+        self._in_flight: dict[Hashable, asyncio.Task[bool]] = {}
+        self.submitted = 0  # values handed to submit()
+        self.written = 0  # writes actually sent
+
+    def pending_values(self) -> dict[Hashable, int]:
+        """Return the values still waiting for their window to close."""
+        return {key: entry.value for key, entry in self._pending.items()}
+
+    async def submit(self, key: Hashable, value: int) -> bool:
+        """Queue value for key and return whether the coalesced write succeeded."""
+        self.submitted += 1
+        if self.window <= 0 and key not in self._in_flight:
+            self.written += 1
+            return await self._write(key, value)
+
+        loop = asyncio.get_running_loop()
+        entry = self._pending.get(key)
+        if entry is None:
+            entry = self._pending[key] = _PendingWrite(value, loop.create_future())
+        else:
+            _LOGGER.debug("Coalescing write to %s: %s → %s", key, entry.value, value)
+            entry.value = value
+            if entry.handle is not None:
+                entry.handle.cancel()
+        entry.handle = loop.call_later(self.window, self._flush, key)
+        return await asyncio.shield(entry.future)
+
+    def _flush(self, key: Hashable) -> None:
+        """Hand the key's final value to a write task once its window closes."""
+        entry = self._pending.pop(key)
+        previous = self._in_flight.get(key)
+        task = asyncio.get_running_loop().create_task(self._send(key, entry, previous))
+        self._in_flight[key] = task
+
+    async def _send(
+        self, key: Hashable, entry: _PendingWrite, previous: asyncio.Task[bool] | None
+    ) -> bool:
+        if previous is not None:
+            await asyncio.wait([previous])
+        self.written += 1
+        try:
+            ok = await self._write(key, entry.value)
+        except Exception as err:  # surfaced to every caller of the burst
+            entry.future.set_exception(err)
+            ok = False
+        else:
+            entry.future.set_result(ok)
+        finally:
+            if self._in_flight.get(key) is asyncio.current_task():
+                del self._in_flight[key]
+        return ok
+
+    async def async_flush(self) -> None:
+        """Send every queued write now and wait for all writes to finish."""
+        for key, entry in list(self._pending.items()):
+            if entry.handle is not None:
+                entry.handle.cancel()
+            self._flush(key)
+        if self._in_flight:
+            await asyncio.wait(list(self._in_flight.values()))
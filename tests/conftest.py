@@ -1,7 +1,30 @@
 """Test configuration and pytest fixtures for EPEVER Hi integration."""
 
+import importlib
+from pathlib import Path
+import sys
+import types
+
 import pytest
 
+INTEGRATION_DIR = Path(__file__).parent.parent / "custom_components" / "epever_hi"
+
+
+class FakeClock:
+    """Manually advanced monotonic clock; set or advance ``now``."""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    """Return a FakeClock to inject wherever a module takes ``clock``."""
+    return FakeClock()
+
 
 @pytest.fixture
 def mock_entry_data():
@@ -18,12 +41,26 @@ def mock_entry_data():
 def mock_epever_hi_data():
     """Mock EPEVER Hi device data for testing."""
     return {
-        0x3100: 2850,  # Solar voltage (28.50V)
-        0x3101: 580,  # Solar current (5.80A)
-        0x3104: 1240,  # Battery voltage (12.40V)
-        0x3105: 520,  # Battery current (5.20A)
-        0x310E: 85,  # Battery SOC (85%)
-        0x310C: 2450,  # Battery temperature (24.50°C)
+        0x3549: 2850,  # PV voltage (28.50V)
+        0x354A: 580,  # PV current (5.80A)
+        0x3580: 1240,  # Battery voltage (12.40V)
+        0x3581: 520,  # Battery current (5.20A)
+        0x3586: 85,  # Battery SOC (85%)
+        0x3512: 2450,  # Battery temperature (24.50°C)
         0x3200: 1,  # Charging status
         0x3201: 0,  # Load status
     }
+
+
+def load_integration_module(name):
+    """Import an integration module without running the package __init__.
+
+    The package __init__ needs Home Assistant; standalone helper modules
+    (planner, codecs, transports) only need their own siblings.
+    """
+    package_name = "epever_hi_standalone"
+    if package_name not in sys.modules:
+        package = types.ModuleType(package_name)
+        package.__path__ = [str(INTEGRATION_DIR)]
+        sys.modules[package_name] = package
+    return importlib.import_module(f"{package_name}.{name}")
@@ -0,0 +1,578 @@
+"""EPEVER Hi Modbus device simulator for tests and benchmarks.
+
+Serves the register map declared in ``const.py`` over Modbus TCP or
+RTU-over-TCP using the pymodbus server, or over Modbus RTU on a pty pair
+standing in for a serial port. Each unit ID gets its own register
+image with simple physics (a PV day curve charging a battery) and writable
+holding registers that clamp to the declared min/max like the real device.
+
+    async with EpeverHiSimulator(SimulatorConfig(latency=0.02)) as sim:
+        client = EpeverHiModbusClient("127.0.0.1", sim.port)
+
+The register map is read from const.py with ``ast`` so the simulator does
+not need Home Assistant installed.
+"""
+
+from __future__ import annotations
+
+import ast
+import asyncio
+from collections import deque
+from collections.abc import Iterable
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+import math
+import os
+from pathlib import Path
+import random
+import struct
+import time
+from typing import Any
+
+from pymodbus.constants import ExcCodes
+from pymodbus.datastore import ModbusServerContext
+from pymodbus.exceptions import NoSuchIdException
+from pymodbus.framer import FramerType
+from pymodbus.pdu import ExceptionResponse, ModbusPDU
+from pymodbus.server import ModbusTcpServer
+from pymodbus.server.requesthandler import ServerRequestHandler
+
+CONST_PATH = (
+    Path(__file__).parent.parent / "custom_components" / "epever_hi" / "const.py"
+)
+
+# Definition tables served from the holding and input register tables
+HOLDING_TABLES = (
+    "REGISTER_DEFINITIONS",
+    "SWITCH_DEFINITIONS",
+    "BUTTON_DEFINITIONS",
+    "SELECT_DEFINITIONS",
+    "FIRMWARE_INFO",
+)
+INPUT_TABLES = ("SENSOR_DEFINITIONS_NEW", "DIAGNOSTIC_DEFINITIONS")
+
+HOLDING = "h"
+INPUT = "i"
+_FUNCTION_TABLES = {3: HOLDING, 4: INPUT, 6: HOLDING, 16: HOLDING, 23: HOLDING}
+
+# Set once the current request (one asyncio task per request) paid its latency
+_REQUEST_STARTED: ContextVar[bool] = ContextVar("_REQUEST_STARTED", default=False)
+
+
+class _Literal(ast.NodeTransformer):
+    """Replace non-literal expressions (EntityCategory.X, names) with None."""
+
+    def visit_Attribute(self, node: ast.Attribute) -> ast.AST:
+        return ast.copy_location(ast.Constant(None), node)
+
+    def visit_Name(self, node: ast.Name) -> ast.AST:
+        return ast.copy_location(ast.Constant(None), node)
+
+
+def load_definition_tables(
+    names: Iterable[str], path: Path = CONST_PATH
+) -> dict[str, dict[int, dict[str, Any]]]:
+    """Return the named dict-literal definition tables from const.py."""
+    wanted = set(names)
+    tables = {}
+    for node in ast.parse(path.read_text(encoding="utf-8")).body:
+        if not isinstance(node, ast.Assign) or not isinstance(node.value, ast.Dict):
+            continue
+        for target in node.targets:
+            if isinstance(target, ast.Name) and target.id in wanted:
+                value = ast.fix_missing_locations(_Literal().visit(node.value))
+                tables[target.id] = ast.literal_eval(value)
+    return tables
+
+
+@dataclass(frozen=True)
+class RegisterSpec:
+    """One simulated register and the raw range a write is clamped to."""
+
+    key: str
+    table: str
+    writable: bool = False
+    minimum: int = 0
+    maximum: int = 0xFFFF
+
+
+def load_register_map(path: Path = CONST_PATH) -> dict[tuple[str, int], RegisterSpec]:
+    """Build the simulated register map from the const.py definition tables."""
+    tables = load_definition_tables((*HOLDING_TABLES, *INPUT_TABLES), path)
+    register_map: dict[tuple[str, int], RegisterSpec] = {}
+    for name, definitions in tables.items():
+        default_table = INPUT if name in INPUT_TABLES else HOLDING
+        for address, reg in definitions.items():
+            table = (
+                INPUT
+                if reg.get("register_type", "").lower() == "input"
+                else default_table
+            )
+            words = reg.get(
+                "dataLength", 2 if reg.get("data_type", "")[-2:] == "32" else 1
+            )
+            scale = reg.get("scale", 1) or 1
+            if "options" in reg:
+                minimum, maximum = min(reg["options"]), max(reg["options"])
+            elif "min" in reg and "max" in reg:
+                minimum = round(reg["min"] / scale)
+                maximum = round(reg["max"] / scale)
+            elif reg.get("entity_type") in ("switch", "button"):
+                minimum, maximum = 0, 1
+            else:
+                minimum, maximum = 0, 0xFFFF
+            for offset in range(words):
+                register_map.setdefault(
+                    (table, address + offset),
+                    RegisterSpec(
+                        reg.get("key", f"0x{address:04X}"),
+                        table,
+                        bool(reg.get("writable")) and words == 1,
+                        minimum,
+                        maximum,
+                    ),
+                )
+    return register_map
+
+
+@dataclass
+class SimulatorConfig:
+    """Behaviour of the simulated gateway and devices."""
+
+    unit_ids: tuple[int, ...] = (1,)
+    framer: str = "tcp"  # "tcp" or "rtu" (RTU framing over a TCP socket)
+    latency: float = 0.0  # seconds added to every request
+    jitter: float = 0.0  # +/- seconds of random latency spread
+    max_registers: int = 125  # longer reads are rejected with ILLEGAL_VALUE
+    serialize: bool = True  # one request on the bus at a time, like RS485
+    strict_addresses: bool = False  # reads through unmapped registers fail
+    clamp_writes: bool = True  # out-of-range writes are clamped, not rejected
+    unsupported_functions: frozenset[int] = frozenset()
+    # Function codes dropped without any answer, like many units treat FC23
+    ignored_functions: frozenset[int] = frozenset()
+    # (table, address) the firmware does not implement; reads touching
+    # them fail with ILLEGAL_ADDRESS, e.g. {("i", 0x3512)}
+    missing_registers: frozenset[tuple[str, int]] = frozenset()
+    time_scale: float = 60.0  # simulated seconds per wall-clock second
+    start_hour: float = 12.0  # simulated time of day at start
+    seed: int = 1
+
+
+class SimulatedUnit:
+    """Register image and physics of one EPEVER Hi unit."""
+
+    def __init__(
+        self,
+        unit_id: int,
+        register_map: dict[tuple[str, int], RegisterSpec],
+        config: SimulatorConfig,
+    ) -> None:
+        self.unit_id = unit_id
+        self.register_map = register_map
+        self.config = config
+        self.registers: dict[tuple[str, int], int] = {}
+        # key -> first address; multi-word values map to their lowest word
+        self._addresses = {
+            spec.key: address
+            for (table, address), spec in sorted(register_map.items(), reverse=True)
+            if table == INPUT
+        }
+        self._holding = {
+            spec.key: address
+            for (table, address), spec in sorted(register_map.items(), reverse=True)
+            if table == HOLDING
+        }
+        for (table, address), spec in register_map.items():
+            default = (spec.minimum + spec.maximum) // 2 if spec.writable else 0
+            self.registers[(table, address)] = default
+        self._set_holding("battery_capacity", 200)
+        self.soc = 60.0
+        self.energy = {"pv_total": 0.0, "load_total": 0.0, "grid_total": 0.0}
+        self._started = time.monotonic()
+        self._last_step = 0.0
+
+    def sim_seconds(self, now: float | None = None) -> float:
+        """Return the simulated seconds since midnight."""
+        now = time.monotonic() if now is None else now
+        elapsed = (now - self._started) * self.config.time_scale
+        return self.config.start_hour * 3600 + elapsed
+
+    def step(self, now: float | None = None) -> None:
+        """Advance the physics to ``now`` and refresh the input registers."""
+        seconds = self.sim_seconds(now)
+        dt = max(0.0, seconds - self._last_step) if self._last_step else 0.0
+        self._last_step = seconds
+
+        hour = (seconds / 3600) % 24
+        irradiance = max(0.0, math.sin(math.pi * (hour - 6) / 12))
+        pv_voltage = 32.0 + 6.0 * irradiance if irradiance else 0.0
+        pv_current = 9.0 * irradiance
+        pv_power = pv_voltage * pv_current
+
+        load_on = bool(self._get_holding("manual_control_load", 1))
+        load_current = 1.5 if load_on else 0.0
+        capacity = max(1, self._get_holding("battery_capacity", 200))
+        battery_voltage = 11.8 + 0.016 * self.soc
+        battery_current = pv_power / battery_voltage - load_current
+        if self.soc >= 100.0 and battery_current > 0:
+            battery_current = 0.0
+        self.soc = min(100.0, max(0.0, self.soc + battery_current * dt / 36 / capacity))
+
+        self.energy["pv_total"] += pv_power * dt / 3.6e6
+        self.energy["load_total"] += battery_voltage * load_current * dt / 3.6e6
+
+        self._set("grid_voltage", 23000)
+        self._set("pv_voltage", round(pv_voltage * 100))
+        self._set("pv_current", round(pv_current * 100))
+        self._set_int32("pv_power", round(pv_power * 100))
+        self._set_int32("pv_total", round(self.energy["pv_total"] * 100))
+        self._set_int32("load_total", round(self.energy["load_total"] * 100))
+        self._set_int32("grid_total", round(self.energy["grid_total"] * 100))
+        self._set("load_voltage", round(battery_voltage * 100) if load_on else 0)
+        self._set("load_current", round(load_current * 100))
+        self._set("battery_voltage", round(battery_voltage * 100))
+        self._set("battery_current", round(battery_current * 100) & 0xFFFF)
+        self._set("battery_capacity", round(self.soc))
+        self._set("battery_temp", 2500)
+        self._set("inverter_temp", 3100 + round(pv_power / 4))
+        # Status bitfields: bit 0 is "charging" and "load on" respectively
+        self.registers[(INPUT, 0x3200)] = int(battery_current > 0)
+        self.registers[(INPUT, 0x3201)] = int(load_on)
+
+    def read(self, table: str, address: int, count: int) -> list[int] | ExcCodes:
+        """Return ``count`` registers or the exception the device would send."""
+        if count > self.config.max_registers:
+            return ExcCodes.ILLEGAL_VALUE
+        values = []
+        for addr in range(address, address + count):
+            if (table, addr) in self.config.missing_registers:
+                return ExcCodes.ILLEGAL_ADDRESS
+            value = self.registers.get((table, addr))
+            if value is None:
+                if self.config.strict_addresses:
+                    return ExcCodes.ILLEGAL_ADDRESS
+                value = 0
+            values.append(value)
+        return values
+
+    def write(self, address: int, values: Iterable[int]) -> ExcCodes | None:
+        """Write holding registers, clamping values like the real device."""
+        updates = {}
+        for addr, value in enumerate(values, start=address):
+            spec = self.register_map.get((HOLDING, addr))
+            if spec is None or not spec.writable:
+                return ExcCodes.ILLEGAL_ADDRESS
+            if not spec.minimum <= value <= spec.maximum:
+                if not self.config.clamp_writes:
+                    return ExcCodes.ILLEGAL_VALUE
+                value = min(spec.maximum, max(spec.minimum, value))
+            updates[(HOLDING, addr)] = value
+        self.registers.update(updates)
+        return None
+
+    def _set(self, key: str, value: int) -> None:
+        address = self._addresses.get(key)
+        if address is not None and (INPUT, address) in self.registers:
+            self.registers[(INPUT, address)] = value
+
+    def _set_int32(self, key: str, value: int) -> None:
+        # EPEVER stores 32-bit values low word first
+        address = self._addresses.get(key)
+        if address is not None and (INPUT, address) in self.registers:
+            value &= 0xFFFFFFFF
+            self.registers[(INPUT, address)] = value & 0xFFFF
+            self.registers[(INPUT, address + 1)] = value >> 16
+
+    def _get_holding(self, key: str, default: int) -> int:
+        address = self._holding.get(key)
+        if address is None:
+            return default
+        return self.registers.get((HOLDING, address), default)
+
+    def _set_holding(self, key: str, value: int) -> None:
+        address = self._holding.get(key)
+        if address is not None:
+            self.registers[(HOLDING, address)] = value
+
+
+class _SimulatorContext(ModbusServerContext):
+    """Server context routing pymodbus datastore calls to simulated units."""
+
+    def __init__(self, simulator: EpeverHiSimulator) -> None:
+        # Deliberately skip ModbusServerContext.__init__: the server then
+        # calls our async_getValues/async_setValues directly
+        self.old_simulator = True
+        self.simdevices = []
+        self._simulator = simulator
+
+    def device_ids(self) -> list[int]:
+        return list(self._simulator.units)
+
+    async def async_getValues(
+        self, device_id: int, func_code: int, address: int, count: int = 1
+    ) -> list[int] | ExcCodes:
+        unit = await self._simulator.begin_request(device_id, func_code, address, count)
+        if isinstance(unit, ExcCodes):
+            return unit
+        unit.step()
+        return unit.read(_FUNCTION_TABLES[func_code], address, count)
+
+    async def async_setValues(
+        self, device_id: int, func_code: int, address: int, values: list[int]
+    ) -> ExcCodes | None:
+        unit = await self._simulator.begin_request(
+            device_id, func_code, address, len(values)
+        )
+        if isinstance(unit, ExcCodes):
+            return unit
+        return unit.write(address, values)
+
+
+class _RequestHandler(ServerRequestHandler):
+    """Answer every received frame, including back-to-back pipelined ones.
+
+    pymodbus parses one frame per receive and keeps the decoded request in
+    ``last_pdu``, reading it again after awaiting the datastore; frames that
+    arrive together are then dropped or answered with each other's
+    transaction IDs. Here every frame is parsed and gets its own task.
+    """
+
+    def __init__(self, *args: Any) -> None:
+        self._queued: deque[tuple[ModbusPDU, tuple | None]] = deque()
+        super().__init__(*args)
+
+    def callback_data(self, data: bytes, addr: tuple | None = None) -> int:
+        # The transport hands over its whole buffer but pymodbus consumes a
+        # single frame per call; drain every complete frame now
+        used = 0
+        while used < len(data):
+            cut = super().callback_data(data[used:], addr)
+            if self.last_pdu:
+                # super() scheduled handle_later(); hand it this frame's request
+                self._queued.append((self.last_pdu, self.last_addr))
+            if not cut:
+                break
+            used += cut
+        return used
+
+    def handle_later(self) -> None:
+        pdu, addr = self._queued.popleft()
+        self.loop.create_task(self._handle(pdu, addr))
+
+    async def _handle(self, pdu: ModbusPDU, addr: tuple | None) -> None:
+        if pdu.function_code in self.server.context._simulator.config.ignored_functions:
+            return
+        try:
+            response = await pdu.datastore_update(self.server.context, pdu.dev_id)
+        except NoSuchIdException:
+            response = ExceptionResponse(
+                pdu.function_code, ExcCodes.GATEWAY_NO_RESPONSE
+            )
+        response.transaction_id = pdu.transaction_id
+        response.dev_id = pdu.dev_id
+        self.server_send(response, addr)
+
+
+class _SimulatorServer(ModbusTcpServer):
+    """pymodbus TCP server using the pipelining-safe request handler."""
+
+    def callback_new_connection(self) -> ServerRequestHandler:
+        return _RequestHandler(
+            self, self.trace_packet, self.trace_pdu, self.trace_connect
+        )
+
+
+@dataclass
+class EpeverHiSimulator:
+    """A running simulated gateway with one or more EPEVER Hi units."""
+
+    config: SimulatorConfig = field(default_factory=SimulatorConfig)
+    host: str = "127.0.0.1"
+    port: int = 0
+
+    def __post_init__(self) -> None:
+        register_map = load_register_map()
+        self.units = {
+            unit_id: SimulatedUnit(unit_id, register_map, self.config)
+            for unit_id in self.config.unit_ids
+        }
+        # (unit, function code, address, count) of every request served
+        self.request_log: list[tuple[int, int, int, int]] = []
+        self._bus = asyncio.Lock()
+        self._rng = random.Random(self.config.seed)
+        self._server: _SimulatorServer | None = None
+
+    async def begin_request(
+        self, device_id: int, func_code: int, address: int, count: int
+    ) -> SimulatedUnit | ExcCodes:
+        """Charge the bus latency once per request and return the unit."""
+        if device_id not in self.units:
+            raise NoSuchIdException(f"No simulated unit {device_id}")
+        if func_code in self.config.unsupported_functions:
+            return ExcCodes.ILLEGAL_FUNCTION
+        if not _REQUEST_STARTED.get():
+            _REQUEST_STARTED.set(True)
+            self.request_log.append((device_id, func_code, address, count))
+            delay = self.config.latency
+            if self.config.jitter:
+                delay += self._rng.uniform(-self.config.jitter, self.config.jitter)
+            if self.config.serialize:
+                async with self._bus:
+                    await asyncio.sleep(max(0.0, delay))
+            elif delay > 0:
+                await asyncio.sleep(delay)
+        return self.units[device_id]
+
+    async def start(self) -> EpeverHiSimulator:
+        """Start listening; ``port`` holds the bound port afterwards."""
+        self._server = _SimulatorServer(
+            _SimulatorContext(self),
+            framer=FramerType.RTU if self.config.framer == "rtu" else FramerType.SOCKET,
+            address=(self.host, self.port),
+        )
+        await self._server.serve_forever(background=True)
+        self.port = self._server.transport.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self) -> None:
+        """Stop the server and drop client connections."""
+        if self._server is not None:
+            await self._server.shutdown()
+            self._server = None
+
+    async def __aenter__(self) -> EpeverHiSimulator:
+        return await self.start()
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.stop()
+
+
+def _rtu_crc(data: bytes) -> int:
+    crc = 0xFFFF
+    for byte in data:
+        crc ^= byte
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0xA001 if crc & 1 else crc >> 1
+    return crc
+
+
+def _rtu_request_length(buffer: bytes) -> int | None:
+    """Return the length of the RTU request at the start of buffer, if known."""
+    if len(buffer) < 2:
+        return None
+    function_code = buffer[1]
+    if function_code == 16:
+        return 9 + buffer[6] if len(buffer) > 6 else None
+    if function_code == 23:
+        return 13 + buffer[10] if len(buffer) > 10 else None
+    return 8  # FC3, FC4, FC6 and anything unknown
+
+
+@dataclass
+class EpeverHiSerialSimulator(EpeverHiSimulator):
+    """Simulated units answering Modbus RTU on the master side of a pty pair.
+
+    Clients open ``device``, the slave side, as if it were an RS485 adapter.
+    Unknown unit IDs stay silent like a real bus.
+    """
+
+    def __post_init__(self) -> None:
+        super().__post_init__()
+        self.device = ""
+        # Loop time each request frame was complete and its response written
+        self.bus_log: list[tuple[float, float]] = []
+        self._master: int | None = None
+        self._slave: int | None = None
+        self._received = bytearray()
+        self._requests: asyncio.Queue[tuple[bytes, float]] = asyncio.Queue()
+        self._serve_task: asyncio.Task | None = None
+
+    async def start(self) -> EpeverHiSerialSimulator:
+        """Open the pty pair; ``device`` holds the path to open afterwards."""
+        self._master, self._slave = os.openpty()
+        self.device = os.ttyname(self._slave)
+        os.set_blocking(self._master, False)
+        loop = asyncio.get_running_loop()
+        loop.add_reader(self._master, self._on_readable)
+        self._serve_task = loop.create_task(self._serve())
+        return self
+
+    async def stop(self) -> None:
+        """Stop answering and close the pty pair."""
+        if self._master is None:
+            return
+        asyncio.get_running_loop().remove_reader(self._master)
+        self._serve_task.cancel()
+        os.close(self._master)
+        os.close(self._slave)
+        self._master = self._slave = None
+
+    def _on_readable(self) -> None:
+        try:
+            self._received += os.read(self._master, 4096)
+        except OSError:
+            return
+        now = asyncio.get_running_loop().time()
+        while (length := _rtu_request_length(self._received)) is not None:
+            if len(self._received) < length:
+                break
+            frame = bytes(self._received[:length])
+            del self._received[:length]
+            self._requests.put_nowait((frame, now))
+
+    async def _serve(self) -> None:
+        # Half duplex: one request is answered at a time, in order
+        while True:
+            frame, received_at = await self._requests.get()
+            if _rtu_crc(frame) != 0:
+                continue  # corrupted requests are ignored by real devices
+            # Own task per request: the latency is charged once per context
+            pdu = await asyncio.get_running_loop().create_task(
+                self._answer(frame[0], frame[1:-2])
+            )
+            if pdu is None:
+                continue
+            response = bytes((frame[0],)) + pdu
+            os.write(self._master, response + _rtu_crc(response).to_bytes(2, "little"))
+            self.bus_log.append((received_at, asyncio.get_running_loop().time()))
+
+    async def _answer(self, unit_id: int, pdu: bytes) -> bytes | None:
+        function_code = pdu[0]
+        address, count = struct.unpack(">HH", pdu[1:5])
+        if function_code == 6:
+            value, count = count, 1
+        if function_code in self.config.ignored_functions:
+            return None
+        try:
+            unit = await self.begin_request(unit_id, function_code, address, count)
+        except NoSuchIdException:
+            return None
+        if isinstance(unit, ExcCodes):
+            return bytes((function_code | 0x80, unit))
+
+        unit.step()
+        if function_code in (3, 4):
+            result = unit.read(_FUNCTION_TABLES[function_code], address, count)
+        elif function_code == 6:
+            result = unit.write(address, [value])
+            result = result if result is not None else pdu
+        elif function_code == 16:
+            values = struct.unpack(f">{count}H", pdu[6:])
+            result = unit.write(address, values)
+            result = result if result is not None else pdu[:5]
+        elif function_code == 23:
+            write_address, write_count = struct.unpack(">HH", pdu[5:9])
+            values = struct.unpack(f">{write_count}H", pdu[10:])
+            result = unit.write(write_address, values)
+            if result is None:
+                result = unit.read(HOLDING, address, count)
+        else:
+            result = ExcCodes.ILLEGAL_FUNCTION
+
+        if isinstance(result, ExcCodes):
+            return bytes((function_code | 0x80, result))
+        if isinstance(result, bytes):
+            return result
+        return struct.pack(
+            f">BB{len(result)}H", function_code, 2 * len(result), *result
+        )
@@ -0,0 +1,130 @@
+"""Tests for the register capability probe and capability-aware planning."""
+
+import asyncio
+
+from tests.conftest import load_integration_module
+from tests.simulator import EpeverHiSimulator, SimulatorConfig
+
+capabilities = load_integration_module("capabilities")
+modbus_client = load_integration_module("modbus_client")
+modbus_pipeline = load_integration_module("modbus_pipeline")
+poller = load_integration_module("poller")
+
+# Grid, PV, battery and temperature block, as most entities register it
+SPANS = [("input", address, 1) for address in range(0x3500, 0x3516)]
+MISSING = ("input", 0x3512)  # battery temperature on some firmwares
+
+
+def _reader(client, slave=1):
+    async def read(register_type, address, count):
+        return await client.read_register_result(
+            address, count=count, slave=slave, register_type=register_type
+        )
+
+    return read
+
+
+def test_probe_finds_missing_registers_and_block_limit():
+    config = SimulatorConfig(
+        missing_registers=frozenset({("i", 0x3512)}), max_registers=8
+    )
+
+    async def run():
+        async with EpeverHiSimulator(config) as sim:
+            client = modbus_client.EpeverHiModbusClient(sim.host, sim.port)
+            try:
+                return await capabilities.probe_capabilities(_reader(client), SPANS)
+            finally:
+                await client.close()
+
+    found = asyncio.run(run())
+
+    assert found.unsupported == {MISSING}
+    assert found.complete
+    assert found.block_limit("input", 0x3500) == 8
+    assert found.block_limit("holding", 0x9000) == 125
+    assert not found.supports("input", 0x3511, 2)
+
+
+def test_poll_plan_skips_unsupported_registers():
+    """After the probe a cycle never fails on registers the firmware lacks."""
+    config = SimulatorConfig(
+        missing_registers=frozenset({("i", 0x3512)}), max_registers=8
+    )
+
+    async def run():
+        async with EpeverHiSimulator(config) as sim:
+            client = modbus_client.EpeverHiModbusClient(sim.host, sim.port)
+            try:
+                found = await capabilities.probe_capabilities(_reader(client), SPANS)
+                register_poller = poller.RegisterPoller(client, max_read_gap=16)
+                for register_type, address, count in SPANS:
+                    register_poller.register(1, address, register_type, 0, count)
+                register_poller.set_capabilities(1, found)
+                sim.request_log.clear()
+                data = await register_poller.async_poll({})
+                return data, list(sim.request_log), register_poller
+            finally:
+                await client.close()
+
+    data, log, register_poller = asyncio.run(run())
+
+    assert data[(1, 0x3500)] == 23000
+    assert data[(1, 0x3512)] is None
+    assert not register_poller.supported((1, 0x3512))
+    assert register_poller.metrics.failed_blocks_last_cycle == 0
+    for _, _, address, count in log:
+        assert count <= 8
+        assert not address <= 0x3512 < address + count
+
+
+def test_probe_of_a_silent_device_is_not_cached():
+    """Nothing answering is an outage, not a firmware without registers."""
+
+    async def read(register_type, address, count):
+        return modbus_client.ReadResult(None, timed_out=True)
+
+    assert asyncio.run(capabilities.probe_capabilities(read, SPANS)) is None
+
+
+def test_unanswered_blocks_are_left_unknown():
+    """Timeouts are not taken for missing registers, nor read value by value."""
+    reads = []
+
+    async def read(register_type, address, count):
+        reads.append((register_type, address, count))
+        if register_type == "input":
+            return modbus_client.ReadResult(None, timed_out=True)
+        if address <= 0x9002 < address + count:
+            return modbus_client.ReadResult(
+                None, modbus_pipeline.EXC_ILLEGAL_DATA_ADDRESS
+            )
+        return modbus_client.ReadResult([0] * count)
+
+    spans = SPANS + [("holding", address, 1) for address in range(0x9000, 0x9004)]
+    found = asyncio.run(capabilities.probe_capabilities(read, spans))
+
+    assert found.unsupported == {("holding", 0x9002)}
+    assert found.max_block == {}
+    assert not found.complete
+    assert capabilities.Capabilities.from_dict(found.as_dict()).complete
+    assert [r for r in reads if r[0] == "input"] == [("input", 0x3500, len(SPANS))]
+
+
+def test_capabilities_round_trip_and_firmware_key():
+    found = capabilities.Capabilities(
+        unsupported={MISSING, ("holding", 0x0001)},
+        max_block={("input", 0x3500): 8},
+    )
+
+    restored = capabilities.Capabilities.from_dict(found.as_dict())
+
+    assert restored == found
+    assert capabilities.Capabilities.from_dict({"unsupported": 5}) is None
+    assert (
+        capabilities.firmware_key(
+            {"controller_model": [0x1234, 0x0001], "firmware_version": [0x0102, 0]}
+        )
+        == "1234-0001-0102-0000"
+    )
+    assert capabilities.firmware_key({"controller_model": [1]}) is None
@@ -0,0 +1,103 @@
+"""Tests for charging profile validation and the FC16 bulk write."""
+
+import asyncio
+
+import pytest
+
+from tests.conftest import load_integration_module
+from tests.simulator import EpeverHiSimulator, SimulatorConfig, load_definition_tables
+
+charging_profile = load_integration_module("charging_profile")
+modbus_client = load_integration_module("modbus_client")
+
+DEFINITIONS = load_definition_tables(["REGISTER_DEFINITIONS"])["REGISTER_DEFINITIONS"]
+
+# A typical 12 V lead-acid (sealed) profile
+PROFILE = {
+    "battery_type": 1,
+    "battery_capacity": 200,
+    "temperature_compensation_coeff": 3,
+    "high_volt_disconnect": 16.0,
+    "charging_limit_voltage": 15.0,
+    "over_voltage_reconnect": 15.0,
+    "equalization_voltage": 14.6,
+    "boost_voltage": 14.4,
+    "float_voltage": 13.8,
+    "boost_reconnect_voltage": 13.2,
+    "low_voltage_reconnect": 12.6,
+    "under_voltage_recover": 12.2,
+    "under_voltage_warning": 12.0,
+    "low_voltage_disconnect": 11.1,
+    "discharging_limit_voltage": 10.6,
+}
+
+
+def test_profile_round_trips_through_raw_registers():
+    """A valid profile encodes to the 15 raw registers in address order."""
+    registers = charging_profile.encode_profile(PROFILE, DEFINITIONS)
+
+    assert len(registers) == charging_profile.PROFILE_COUNT
+    assert registers[:4] == [1, 200, 3, 1600]
+    assert charging_profile.decode_profile(registers, DEFINITIONS) == PROFILE
+
+
+def test_decode_skips_registers_not_read_yet():
+    registers = [None] * charging_profile.PROFILE_COUNT
+    registers[8] = 1380
+
+    assert charging_profile.decode_profile(registers, DEFINITIONS) == {
+        "float_voltage": 13.8
+    }
+
+
+def test_out_of_order_thresholds_are_all_reported():
+    """The controller would reject these, so nothing may be written."""
+    profile = {**PROFILE, "float_voltage": 14.5, "low_voltage_disconnect": 12.7}
+
+    with pytest.raises(charging_profile.ChargingProfileError) as err:
+        charging_profile.encode_profile(profile, DEFINITIONS)
+
+    message = str(err.value)
+    assert "boost_voltage (14.4) must be >= float_voltage (14.5)" in message
+    assert "low_voltage_reconnect (12.6) must be > low_voltage_disconnect" in message
+
+
+def test_missing_and_out_of_range_values_are_rejected():
+    incomplete = {k: v for k, v in PROFILE.items() if k != "boost_voltage"}
+    with pytest.raises(charging_profile.ChargingProfileError, match="boost_voltage"):
+        charging_profile.encode_profile(incomplete, DEFINITIONS)
+
+    with pytest.raises(charging_profile.ChargingProfileError, match="outside 1..7"):
+        charging_profile.encode_profile({**PROFILE, "battery_type": 9}, DEFINITIONS)
+
+
+@pytest.mark.parametrize("pipeline_depth", [1, 4])
+def test_profile_is_written_in_one_fc16_request(pipeline_depth):
+    """The whole profile goes out as one write and reads back unchanged."""
+    registers = charging_profile.encode_profile(PROFILE, DEFINITIONS)
+
+    async def run():
+        async with EpeverHiSimulator(SimulatorConfig()) as sim:
+            client = modbus_client.EpeverHiModbusClient(
+                sim.host, sim.port, pipeline_depth=pipeline_depth
+            )
+            try:
+                ok = await client.write_registers(
+                    charging_profile.PROFILE_START, registers, slave=1
+                )
+                read_back = await client.read_register(
+                    charging_profile.PROFILE_START,
+                    count=len(registers),
+                    slave=1,
+                    register_type="holding",
+                )
+                return ok, read_back, list(sim.request_log), client.metrics
+            finally:
+                await client.close()
+
+    ok, read_back, log, metrics = asyncio.run(run())
+
+    assert ok
+    assert read_back == registers
+    assert log == [(1, 16, 0x9000, 15), (1, 3, 0x9000, 15)]
+    assert metrics.failures == 0
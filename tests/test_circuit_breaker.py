@@ -0,0 +1,73 @@
+"""Tests for the connection circuit breaker."""
+
+import pytest
+
+from tests.conftest import load_integration_module
+
+circuit_breaker = load_integration_module("circuit_breaker")
+
+
+def _breaker(clock):
+    # rng 0.5 means no jitter
+    return circuit_breaker.CircuitBreaker(
+        base_delay=1.0, max_delay=8.0, jitter=0.2, clock=clock, rng=lambda: 0.5
+    )
+
+
+def test_failure_opens_breaker_and_fails_fast(clock):
+    """After a failed connect, requests are refused until the delay expires."""
+    breaker = _breaker(clock)
+    assert breaker.allow_request()
+
+    breaker.record_failure()
+    assert breaker.state == circuit_breaker.STATE_OPEN
+    assert breaker.trips == 1
+    assert not breaker.allow_request()
+
+    clock.now += 1.0
+    assert breaker.allow_request()
+    assert breaker.state == circuit_breaker.STATE_HALF_OPEN
+    # Only one probe at a time
+    assert not breaker.allow_request()
+
+
+def test_backoff_doubles_and_is_capped(clock):
+    """Each failed probe doubles the delay up to max_delay."""
+    breaker = _breaker(clock)
+    delays = []
+    for _ in range(6):
+        breaker.record_failure()
+        delays.append(breaker.retry_in)
+        clock.now += breaker.retry_in
+        assert breaker.allow_request()
+
+    assert delays == [1.0, 2.0, 4.0, 8.0, 8.0, 8.0]
+    # A single outage counts as one trip
+    assert breaker.trips == 1
+
+
+def test_jitter_spreads_delay(clock):
+    """The delay is spread by the jitter fraction."""
+    low = circuit_breaker.CircuitBreaker(jitter=0.2, clock=clock, rng=lambda: 0.0)
+    high = circuit_breaker.CircuitBreaker(jitter=0.2, clock=clock, rng=lambda: 1.0)
+    low.record_failure()
+    high.record_failure()
+    assert low.retry_in == pytest.approx(0.8)
+    assert high.retry_in == pytest.approx(1.2)
+
+
+def test_success_closes_breaker_and_tracks_time_in_state(clock):
+    """A successful probe closes the breaker and resets the backoff."""
+    breaker = _breaker(clock)
+    breaker.record_failure()
+    clock.now += 1.0
+    breaker.allow_request()
+    breaker.record_success()
+
+    assert breaker.state == circuit_breaker.STATE_CLOSED
+    assert breaker.consecutive_failures == 0
+    clock.now += 5.0
+    stats = breaker.as_dict()
+    assert stats["time_in_state"] == 5.0
+    assert stats["trips"] == 1
+    assert stats["retry_in"] == 0.0
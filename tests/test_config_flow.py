@@ -1,6 +1,7 @@
 """Tests for config flow without requiring Home Assistant runtime."""
 
 import ast
+import json
 import os
 
 import pytest
@@ -40,7 +41,7 @@ def test_config_flow_class_defined():
         content = f.read()
 
     assert "class EpeverHiConfigFlow" in content
-    assert "VERSION = 1" in content
+    assert "VERSION = 2" in content
 
 
 def test_config_schema_validation():
@@ -111,3 +112,34 @@ def test_config_flow_imports():
     assert "import voluptuous as vol" in content
     assert "from homeassistant import config_entries" in content
     assert "from .const import" in content
+
+
+def test_flow_steps_and_errors_are_translated():
+    """Every step, error and abort reason of the flows has English strings."""
+    integration_dir = os.path.join(
+        os.path.dirname(__file__), "..", "custom_components", "epever_hi"
+    )
+    with open(os.path.join(integration_dir, "config_flow.py"), encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    with open(os.path.join(integration_dir, "strings.json"), encoding="utf-8") as f:
+        strings = json.load(f)
+    with open(
+        os.path.join(integration_dir, "translations", "en.json"), encoding="utf-8"
+    ) as f:
+        assert json.load(f) == strings
+
+    for flow in tree.body:
+        if not isinstance(flow, ast.ClassDef):
+            continue
+        section = strings["options" if "Options" in flow.name else "config"]
+        for node in ast.walk(flow):
+            if isinstance(node, ast.keyword) and node.arg == "step_id":
+                assert node.value.value in section["step"]
+            if isinstance(node, ast.keyword) and node.arg == "reason":
+                assert node.value.value in section["abort"]
+            if (
+                isinstance(node, ast.Assign)
+                and isinstance(node.targets[0], ast.Subscript)
+                and "errors" in ast.unparse(node.targets[0].value)
+            ):
+                assert node.value.value in section["error"]
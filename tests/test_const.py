@@ -126,3 +126,27 @@ def test_register_definitions_structure():
         assert def_name in found_definitions, (
             f"Definition {def_name} not found as dictionary or list"
         )
+
+
+def test_every_polled_definition_belongs_to_a_register_group():
+    """The options flow can only drop registers that carry a known group."""
+    from tests.simulator import load_definition_tables
+
+    tables = load_definition_tables(
+        [
+            "SENSOR_DEFINITIONS_NEW",
+            "REGISTER_DEFINITIONS",
+            "SWITCH_DEFINITIONS",
+            "BUTTON_DEFINITIONS",
+            "SELECT_DEFINITIONS",
+            "DIAGNOSTIC_DEFINITIONS",
+        ]
+    )
+    groups = {"grid", "pv", "load", "battery", "config", "status"}
+
+    for name, table in tables.items():
+        for address, definition in table.items():
+            assert definition.get("group") in groups, f"{name} 0x{address:04X}"
+    assert {
+        definition["group"] for definition in tables["SENSOR_DEFINITIONS_NEW"].values()
+    } == {"grid", "pv", "load", "battery"}
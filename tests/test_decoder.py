@@ -0,0 +1,111 @@
+"""Tests for the compiled sensor decode plan."""
+
+import struct
+
+import pytest
+
+from tests.conftest import load_integration_module
+
+decoder = load_integration_module("decoder")
+DecodePlan = decoder.DecodePlan
+
+DEFINITIONS = {
+    0x3100: {"key": "pv_voltage", "scale": 0.01, "precision": 2},
+    0x3200: {"key": "status", "precision": 0},
+    0x3300: {"key": "power", "type": "float32", "precision": 1},
+}
+
+
+def _float_words(value):
+    return struct.unpack(">HH", struct.pack(">f", value))
+
+
+def test_decode_scales_and_rounds_per_unit():
+    """Every definition is decoded for every unit in one pass."""
+    hi, lo = _float_words(123.375)
+    data = {
+        (1, 0x3100): 1234,
+        (1, 0x3200): 7,
+        (1, 0x3300): hi,
+        (1, 0x3301): lo,
+        (2, 0x3100): 50,
+    }
+    values = DecodePlan(DEFINITIONS).decode(data, [1, 2])
+
+    assert values[(1, "pv_voltage")] == 12.34
+    assert values[(1, "status")] == 7
+    assert values[(1, "power")] == 123.4
+    assert values[(2, "pv_voltage")] == 0.5
+    assert values[(2, "status")] is None
+
+
+def test_float32_needs_both_words():
+    """A float32 with a missing word decodes to None."""
+    values = DecodePlan(DEFINITIONS).decode({(1, 0x3300): 0x42F6}, [1])
+    assert values[(1, "power")] is None
+
+
+def test_update_redecodes_only_changed_registers():
+    """Only definitions touching a changed register are re-decoded."""
+    plan = DecodePlan(DEFINITIONS)
+    hi, lo = _float_words(1.0)
+    data = {(1, 0x3100): 100, (1, 0x3200): 1, (1, 0x3300): hi, (1, 0x3301): lo}
+    values = plan.decode(data, [1])
+
+    data.update({(1, 0x3200): 2, (1, 0x3301): _float_words(2.0)[1]})
+    data[(1, 0x3300)] = _float_words(2.0)[0]
+    values[(1, "pv_voltage")] = "untouched"
+    plan.update(values, data, [(1, 0x3200), (1, 0x3301)])
+
+    assert values[(1, "status")] == 2
+    assert values[(1, "power")] == 2.0
+    assert values[(1, "pv_voltage")] == "untouched"
+
+
+def test_int32_word_swap_reads_low_word_first():
+    """EPEVER energy totals store the low word at the lower address."""
+    plan = DecodePlan(
+        {
+            0x350F: {
+                "key": "grid_total",
+                "scale": 0.01,
+                "precision": 2,
+                "data_type": "int32",
+                "swap": "word",
+            }
+        }
+    )
+    entry = plan.entries[0]
+    assert entry.count == 2
+
+    values = plan.decode({(1, 0x350F): 0x86A0, (1, 0x3510): 0x0001}, [1])
+    assert values[(1, "grid_total")] == 1000.0
+
+
+def test_signed_and_byte_swapped_types():
+    """int16 is sign-extended and the byte swap applies inside each word."""
+    plan = DecodePlan(
+        {
+            0x10: {"key": "signed", "data_type": "int16"},
+            0x20: {"key": "swapped", "data_type": "uint32", "swap": "byte"},
+            0x30: {"key": "both", "data_type": "uint32", "swap": "word_byte"},
+        }
+    )
+    data = {
+        (1, 0x10): 0xFFFE,
+        (1, 0x20): 0x3412,
+        (1, 0x21): 0x7856,
+        (1, 0x30): 0x7856,
+        (1, 0x31): 0x3412,
+    }
+    values = plan.decode(data, [1])
+
+    assert values[(1, "signed")] == -2
+    assert values[(1, "swapped")] == 0x12345678
+    assert values[(1, "both")] == 0x12345678
+
+
+def test_unknown_data_type_is_rejected():
+    """Typos in the definition tables fail loudly at compile time."""
+    with pytest.raises(ValueError):
+        decoder.compile_entry(0x10, {"key": "bad", "data_type": "int64"})
@@ -0,0 +1,96 @@
+"""Tests for the in-memory ring buffer of raw register samples."""
+
+from array import array
+
+import pytest
+
+from tests.conftest import load_integration_module
+
+history = load_integration_module("history")
+RegisterHistory = history.RegisterHistory
+
+GRID = (1, 0x3500)
+PV = (1, 0x3519)
+
+
+def _filled(capacity, cycles):
+    """Record ``cycles`` one-second cycles; PV fails on every third one."""
+    buffer = RegisterHistory(capacity)
+    for second in range(cycles):
+        buffer.record(
+            1000.0 + second,
+            {GRID: 23000 + second, PV: None if second % 3 == 0 else second},
+        )
+    return buffer
+
+
+def test_window_slices_by_time():
+    buffer = _filled(10, 6)
+
+    times, values = buffer.window(GRID, 1002.0, 1004.0)
+
+    assert list(times) == [1002.0, 1003.0]
+    assert list(values) == [23002, 23003]
+    assert len(buffer.window(GRID)[1]) == 6
+    assert buffer.window((2, 0x3500)) == (array("d"), array("H"))
+
+
+def test_ring_keeps_only_the_newest_cycles():
+    """Memory stays fixed; queries see the last ``capacity`` cycles in order."""
+    buffer = _filled(4, 10)
+
+    times, values = buffer.window(GRID)
+
+    assert len(buffer) == 4
+    assert buffer.count == 10
+    assert list(times) == [1006.0, 1007.0, 1008.0, 1009.0]
+    assert list(values) == [23006, 23007, 23008, 23009]
+    # A window across the wrap point of the ring
+    assert list(buffer.window(GRID, 1007.0, 1009.5)[1]) == [23007, 23008, 23009]
+    assert buffer.nbytes == 4 * (8 + 2 * 3)
+    assert buffer.as_dict()["oldest"] == 1006.0
+    assert buffer.as_dict()["newest"] == 1009.0
+
+
+def test_failed_and_unpolled_cycles_are_skipped():
+    buffer = _filled(10, 6)
+    buffer.record(1006.0, {GRID: 1})  # PV not in this cycle's data
+
+    times, values = buffer.window(PV)
+
+    assert list(times) == [1001.0, 1002.0, 1004.0, 1005.0]
+    assert list(values) == [1, 2, 4, 5]
+
+
+def test_stats_of_a_window():
+    buffer = _filled(10, 6)
+
+    stats = buffer.stats(GRID, 1001.0, 1005.0)
+
+    assert stats == history.WindowStats(
+        count=4, minimum=23001, maximum=23004, mean=pytest.approx(23002.5)
+    )
+    assert buffer.stats(PV, 1000.0, 1001.0) is None
+
+
+def test_clock_steps_back_do_not_break_the_time_order():
+    buffer = RegisterHistory(8)
+    buffer.record(2000.0, {GRID: 1})
+    buffer.record(1990.0, {GRID: 2})
+    buffer.record(2001.0, {GRID: 3})
+
+    times, values = buffer.window(GRID, 2000.0, 2001.0)
+
+    assert list(times) == [2000.0, 2000.0]
+    assert list(values) == [1, 2]
+
+
+def test_discarded_registers_free_their_columns():
+    buffer = _filled(10, 3)
+
+    buffer.discard(PV)
+
+    assert PV not in buffer
+    assert buffer.as_dict()["registers"] == 1
+    with pytest.raises(ValueError):
+        RegisterHistory(0)
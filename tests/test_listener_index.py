@@ -0,0 +1,64 @@
+"""Tests for the per-register listener fan-out."""
+
+from tests.conftest import load_integration_module
+
+listener_index = load_integration_module("listener_index")
+
+GRID = (1, 0x3500)
+PV = (1, 0x3519)
+OK = (True, False)  # (last update success, stale)
+
+
+def _wake(index, data, state=OK):
+    """Return the listeners an update wakes, or "all" for a full fan-out."""
+    changed = index.changes(data, state)
+    if changed is None:
+        return "all"
+    return {listener.__name__ for listener in index.listeners_for(changed)}
+
+
+def _named(name):
+    def listener():
+        pass
+
+    listener.__name__ = name
+    return listener
+
+
+def test_only_listeners_of_changed_keys_wake():
+    index = listener_index.ListenerIndex()
+    index.add(_named("grid"), frozenset({GRID}))
+    index.add(_named("pv"), frozenset({PV}))
+    index.add(_named("both"), frozenset({GRID, PV}))
+    index.add(_named("unkeyed"))
+
+    assert _wake(index, {GRID: 1, PV: 2}) == "all"  # first update
+    assert _wake(index, {GRID: 1, PV: 3}) == {"pv", "both", "unkeyed"}
+    assert _wake(index, {GRID: 1, PV: 3}) == {"unkeyed"}
+    assert _wake(index, {GRID: 1}) == {"pv", "both", "unkeyed"}  # key dropped
+
+
+def test_removed_listeners_stop_waking():
+    index = listener_index.ListenerIndex()
+    remove_grid = index.add(_named("grid"), frozenset({GRID}))
+    remove_unkeyed = index.add(_named("unkeyed"))
+    index.add(_named("other"), frozenset({GRID}))
+    index.changes({GRID: 1}, OK)
+
+    remove_grid()
+    remove_unkeyed()
+    remove_grid()  # a second removal is harmless
+
+    assert _wake(index, {GRID: 2}) == {"other"}
+
+
+def test_availability_changes_wake_everyone():
+    """A failed update or a stale snapshot changes every entity's state."""
+    index = listener_index.ListenerIndex()
+    index.add(_named("grid"), frozenset({GRID}))
+    index.changes({GRID: 1}, OK)
+
+    assert _wake(index, {GRID: 1}, (False, False)) == "all"  # update failed
+    assert _wake(index, {GRID: 1}, (False, False)) == set()
+    assert _wake(index, {GRID: 1}, OK) == "all"  # recovered
+    assert _wake(index, {GRID: 1}, (True, True)) == "all"  # restored snapshot
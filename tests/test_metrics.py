@@ -0,0 +1,59 @@
+"""Tests for the rolling metrics used by the diagnostic sensors."""
+
+import pytest
+
+from tests.conftest import load_integration_module
+
+metrics = load_integration_module("metrics")
+RollingHistogram = metrics.RollingHistogram
+
+
+def test_percentiles_use_nearest_rank():
+    """p50/p95/p99 come from the samples in the window."""
+    histogram = RollingHistogram(size=100)
+    for value in range(1, 101):
+        histogram.record(float(value))
+
+    assert histogram.percentile(50) == 50
+    assert histogram.percentile(95) == 95
+    assert histogram.percentile(99) == 99
+    assert histogram.percentile(100) == 100
+    assert histogram.last == 100
+
+
+def test_ring_evicts_the_oldest_samples():
+    """Only the last ``size`` samples contribute to the percentiles."""
+    histogram = RollingHistogram(size=4)
+    for value in (100.0, 100.0, 1.0, 2.0, 3.0, 4.0):
+        histogram.record(value)
+
+    assert len(histogram) == 4
+    assert histogram.count == 6
+    assert histogram.percentile(100) == 4
+    assert histogram.last == 4
+
+
+def test_empty_histogram_reports_nothing():
+    """No samples means no percentiles rather than zeros."""
+    histogram = RollingHistogram()
+    assert histogram.percentile(50) is None
+    assert histogram.as_dict() == {}
+    with pytest.raises(ValueError):
+        RollingHistogram(size=0)
+
+
+def test_transport_metrics_snapshot():
+    """Counters and RTT percentiles are flattened for the sensors."""
+    transport = metrics.TransportMetrics()
+    transport.record_request(0.010, 12, 49)
+    transport.record_request(0.030, 12, 49)
+    transport.record_failure(12, timeout=True)
+
+    snapshot = transport.as_dict()
+    assert snapshot["requests"] == 3
+    assert snapshot["request_failures"] == 1
+    assert snapshot["timeouts"] == 1
+    assert snapshot["bytes_sent"] == 36
+    assert snapshot["bytes_received"] == 98
+    assert snapshot["rtt_p50"] == 10.0
+    assert snapshot["rtt_p99"] == 30.0
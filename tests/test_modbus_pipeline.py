@@ -0,0 +1,147 @@
+"""Tests for the pipelined Modbus TCP transport."""
+
+import asyncio
+import struct
+
+import pytest
+
+from tests.conftest import load_integration_module
+
+modbus_pipeline = load_integration_module("modbus_pipeline")
+
+
+async def _start_gateway(handler):
+    """Start a fake Modbus TCP gateway serving ``handler(tid, unit, pdu)``."""
+    in_flight = {"max": 0, "now": 0}
+
+    async def serve(reader, writer):
+        try:
+            while True:
+                header = await reader.readexactly(7)
+                tid, _, length, unit = struct.unpack(">HHHB", header)
+                pdu = await reader.readexactly(length - 1)
+                in_flight["now"] += 1
+                in_flight["max"] = max(in_flight["max"], in_flight["now"])
+                asyncio.create_task(reply(writer, tid, unit, pdu))
+        except asyncio.IncompleteReadError:
+            writer.close()
+
+    async def reply(writer, tid, unit, pdu):
+        tid, response, delay = handler(tid, unit, pdu)
+        await asyncio.sleep(delay)
+        in_flight["now"] -= 1
+        writer.write(struct.pack(">HHHB", tid, 0, len(response) + 1, unit) + response)
+
+    server = await asyncio.start_server(serve, "127.0.0.1", 0)
+    return server, server.sockets[0].getsockname()[1], in_flight
+
+
+def _echo_address(pdu):
+    """Answer a read with registers equal to their own address."""
+    _, address, count = struct.unpack(">BHH", pdu)
+    data = struct.pack(f">{count}H", *range(address, address + count))
+    return bytes([pdu[0], 2 * count]) + data
+
+
+def test_responses_are_matched_by_transaction_id():
+    """Out-of-order responses reach the request that sent them."""
+
+    async def run():
+        # Later requests are answered first
+        server, port, in_flight = await _start_gateway(
+            lambda tid, unit, pdu: (tid, _echo_address(pdu), 0.05 / tid)
+        )
+        pipeline = modbus_pipeline.ModbusTcpPipeline("127.0.0.1", port, depth=4)
+        try:
+            results = await asyncio.gather(
+                *(pipeline.read_registers(1, 4, addr, 2) for addr in (10, 20, 30, 40))
+            )
+        finally:
+            await pipeline.close()
+            server.close()
+        return results, in_flight["max"], pipeline.pipelining
+
+    results, max_in_flight, pipelining = asyncio.run(run())
+    assert results == [[10, 11], [20, 21], [30, 31], [40, 41]]
+    assert max_in_flight == 4
+    assert pipelining
+
+
+def test_gateway_rewriting_transaction_ids_falls_back_to_serial():
+    """A gateway answering with foreign transaction IDs disables pipelining."""
+
+    async def run():
+        server, port, in_flight = await _start_gateway(
+            lambda tid, unit, pdu: (0, _echo_address(pdu), 0.01)
+        )
+        pipeline = modbus_pipeline.ModbusTcpPipeline(
+            "127.0.0.1", port, depth=4, timeout=0.2
+        )
+        try:
+            first = await asyncio.gather(
+                *(pipeline.read_registers(1, 4, addr, 1) for addr in (1, 2)),
+                return_exceptions=True,
+            )
+            in_flight["max"] = 0
+            second = await asyncio.gather(
+                *(pipeline.read_registers(1, 4, addr, 1) for addr in (1, 2)),
+                return_exceptions=True,
+            )
+        finally:
+            await pipeline.close()
+            server.close()
+        return first, second, in_flight["max"], pipeline.pipelining
+
+    first, second, max_in_flight, pipelining = asyncio.run(run())
+    assert any(isinstance(result, Exception) for result in first)
+    assert not pipelining
+    assert max_in_flight == 1
+    # Serial mode keeps working even though the gateway drops the TIDs
+    assert all(isinstance(result, TimeoutError) for result in second)
+
+
+def test_exception_response_is_raised():
+    """Modbus exception responses surface as ModbusExceptionResponse."""
+
+    async def run():
+        server, port, _ = await _start_gateway(
+            lambda tid, unit, pdu: (tid, bytes([pdu[0] | 0x80, 0x02]), 0)
+        )
+        pipeline = modbus_pipeline.ModbusTcpPipeline("127.0.0.1", port, depth=2)
+        try:
+            await pipeline.read_registers(1, 3, 0x9000, 1)
+        finally:
+            await pipeline.close()
+            server.close()
+
+    with pytest.raises(modbus_pipeline.ModbusExceptionResponse) as err:
+        asyncio.run(run())
+    assert err.value.exception_code == 0x02
+
+
+@pytest.mark.parametrize(
+    ("protocol", "length"),
+    [(0, 0), (0, 0xFFFF), (1, 5)],
+    ids=["empty", "long", "proto"],
+)
+def test_malformed_header_closes_the_connection(protocol, length):
+    """A frame that cannot be parsed fails the request instead of hanging."""
+
+    async def serve(reader, writer):
+        tid, _, _, unit = struct.unpack(">HHHB", await reader.readexactly(7))
+        await reader.readexactly(5)
+        writer.write(struct.pack(">HHHB", tid, protocol, length, unit) + b"\x03")
+
+    async def run():
+        server = await asyncio.start_server(serve, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        pipeline = modbus_pipeline.ModbusTcpPipeline("127.0.0.1", port, timeout=5)
+        try:
+            with pytest.raises(modbus_pipeline.ModbusPipelineError):
+                await asyncio.wait_for(pipeline.read_registers(1, 3, 0x9000, 1), 1)
+            return pipeline.connected
+        finally:
+            await pipeline.close()
+            server.close()
+
+    assert not asyncio.run(run())
@@ -0,0 +1,453 @@
+"""Tests for the coordinator's poll path against the simulator."""
+
+import asyncio
+
+import pytest
+
+from tests.conftest import FakeClock, load_integration_module
+from tests.simulator import EpeverHiSimulator, SimulatorConfig
+
+modbus_client = load_integration_module("modbus_client")
+poller_module = load_integration_module("poller")
+
+
+async def _poll_cycles(config, setup, cycles):
+    clock = FakeClock()
+    async with EpeverHiSimulator(config) as sim:
+        client = modbus_client.EpeverHiModbusClient(sim.host, sim.port)
+        poller = poller_module.RegisterPoller(client, clock=clock)
+        setup(poller)
+        data = {}
+        try:
+            for step in cycles:
+                clock.now += step
+                data = await poller.async_poll(data)
+        finally:
+            await client.close()
+        return data, sim.request_log
+
+
+def test_tiers_poll_only_due_registers():
+    """A slow register is read once, a fast one every cycle."""
+
+    def setup(poller):
+        poller.register(1, 0x3549, "input", 0.0)
+        poller.register(1, 0x9001, "holding", 60.0)
+
+    data, log = asyncio.run(_poll_cycles(SimulatorConfig(), setup, [0, 3, 3]))
+    assert data[(1, 0x3549)] is not None
+    assert data[(1, 0x9001)] is not None
+    assert sorted(entry[2] for entry in log) == [0x3549] * 3 + [0x9001]
+
+
+def test_multi_word_values_share_one_request():
+    """Both words of a 32-bit value come from the same response."""
+
+    def setup(poller):
+        poller.register(1, 0x354B, "input", 0.0, count=2)
+
+    data, log = asyncio.run(_poll_cycles(SimulatorConfig(), setup, [0]))
+    assert log == [(1, 4, 0x354B, 2)]
+    assert (1, 0x354C) in data
+
+
+def test_failed_blocks_clear_only_their_registers():
+    """A rejected block reads as None without touching other blocks."""
+
+    def setup(poller):
+        poller.max_read_gap = 0
+        poller.register(1, 0x3549, "input", 0.0)
+        poller.register(2, 0x3549, "input", 0.0)
+
+    config = SimulatorConfig(unit_ids=(1,))
+    data, _ = asyncio.run(_poll_cycles(config, setup, [0]))
+    assert data[(1, 0x3549)] is not None
+    assert data[(2, 0x3549)] is None
+
+
+def test_open_circuit_fails_the_cycle_fast():
+    """No connection means ClientUnavailable rather than per-block timeouts."""
+
+    async def poll():
+        client = modbus_client.EpeverHiModbusClient("127.0.0.1", 1)
+        poller = poller_module.RegisterPoller(client)
+        poller.register(1, 0x3549, "input", 0.0)
+        try:
+            with pytest.raises(poller_module.ClientUnavailable):
+                await poller.async_poll({})
+        finally:
+            await client.close()
+
+    asyncio.run(poll())
+
+
+def test_targeted_read_covers_only_the_requested_registers(clock):
+    """Write verification reads the written registers, not a full cycle."""
+
+    async def run():
+        async with EpeverHiSimulator(SimulatorConfig()) as sim:
+            client = modbus_client.EpeverHiModbusClient(sim.host, sim.port)
+            poller = poller_module.RegisterPoller(client, clock=clock)
+            poller.register(1, 0x3549, "input", 0.0)
+            poller.register(1, 0x9001, "holding", 60.0)
+            poller.register(1, 0x9003, "holding", 60.0)
+            try:
+                values = await poller.async_read({(1, 0x9001), (1, 0x9100)})
+                due = poller.due_keys(clock.now)
+            finally:
+                await client.close()
+            return values, due, sim.request_log
+
+    values, due, log = asyncio.run(run())
+    assert list(values) == [(1, 0x9001)]  # 0x9100 is not polled
+    assert log == [(1, 3, 0x9001, 1)]
+    assert (1, 0x9001) not in due
+    assert {(1, 0x3549), (1, 0x9003)} <= due
+
+
+def test_shared_registers_are_reference_counted(clock):
+    """A status word stays polled until the last entity using it goes away."""
+    poller = poller_module.RegisterPoller(client=None, clock=clock)
+    for _ in range(3):  # three bit sensors on one word
+        poller.register(1, 0x3200, "input", 0.0)
+    poller.register(1, 0x9001, "holding", 60.0)
+    poller.register(1, 0x9001, "holding", 15.0)
+
+    poller.unregister(1, 0x3200, 0.0)
+    poller.unregister(1, 0x3200, 0.0)
+    assert (1, 0x3200) in poller.active
+
+    poller.unregister(1, 0x9001, 15.0)
+    assert poller._intervals[(1, 0x9001)] == 60.0  # back to the slower tier
+
+    poller.unregister(1, 0x3200, 0.0)
+    poller.unregister(1, 0x3200, 0.0)  # unmatched calls are ignored
+    assert list(poller.active) == [(1, 0x9001)]
+    assert [block.address for block in poller.plan_for(poller.due_keys(0))] == [0x9001]
+
+
+def test_unregistering_a_multi_word_value_drops_every_word(clock):
+    poller = poller_module.RegisterPoller(client=None, clock=clock)
+    poller.register(1, 0x354B, "input", 0.0, count=2)
+    poller.register(1, 0x354C, "input", 0.0)
+
+    poller.unregister(1, 0x354B, 0.0, count=2)
+    assert list(poller.active) == [(1, 0x354C)]
+    assert poller.plan_for(frozenset(poller.active))[0].count == 1
+
+
+def test_seeded_poll_set_is_primed_in_one_batched_cycle():
+    """Every entity definition has a value after a single priming poll."""
+    from tests.simulator import load_definition_tables
+
+    tables = load_definition_tables(
+        ["SENSOR_DEFINITIONS_NEW", "REGISTER_DEFINITIONS", "DIAGNOSTIC_DEFINITIONS"]
+    )
+
+    def setup(poller):
+        for table in tables.values():
+            for address, reg in table.items():
+                poller.register(1, address, reg.get("register_type", "holding"), 0.0)
+
+    data, log = asyncio.run(_poll_cycles(SimulatorConfig(), setup, [0]))
+    assert all(value is not None for value in data.values())
+    assert len(data) == sum(len(table) for table in tables.values())
+    # Input and holding ranges batch into a handful of block reads
+    assert len(log) <= 6
+
+
+def test_released_seed_leaves_only_what_entities_registered(clock):
+    """Seeding before setup primes every value but polls nothing for good."""
+    poller = poller_module.RegisterPoller(client=None, clock=clock)
+    seed = [(0x3500, "input", 0.0, 1), (0x3510, "input", 0.0, 1)]
+    seed += [(0x354B, "input", 0.0, 2), (0x9000, "holding", 60.0, 1)]
+    for address, register_type, interval, count in seed:
+        poller.register(1, address, register_type, interval, count)
+    # Entities of enabled definitions register while the seed is held;
+    # the entity of 0x3510 is disabled in the entity registry
+    poller.register(1, 0x3500, "input", 0.0)
+    poller.register(1, 0x354B, "input", 0.0, count=2)
+    poller.register(1, 0x9000, "holding", 60.0)
+
+    for address, _, interval, count in seed:
+        poller.unregister(1, address, interval, count)
+
+    assert set(poller.active) == {(1, 0x3500), (1, 0x354B), (1, 0x354C), (1, 0x9000)}
+    assert poller._intervals[(1, 0x9000)] == 60.0
+
+    poller.unregister(1, 0x3500, 0.0)
+    poller.unregister(1, 0x354B, 0.0, count=2)
+    poller.unregister(1, 0x9000, 60.0)
+    assert not poller.active
+    assert not poller._registrations
+
+
+def test_disabled_register_groups_are_never_planned(clock):
+    """Definitions of groups switched off in the options are not polled."""
+    from tests.simulator import load_definition_tables
+
+    decoder = load_integration_module("decoder")
+    tables = load_definition_tables(
+        ["SENSOR_DEFINITIONS_NEW", "REGISTER_DEFINITIONS", "DIAGNOSTIC_DEFINITIONS"]
+    )
+    enabled = {"grid", "pv", "config", "status"}  # battery and load disabled
+    poller = poller_module.RegisterPoller(client=None, max_read_gap=0, clock=clock)
+    for table in tables.values():
+        for address, reg in table.items():
+            if decoder.in_register_groups(reg, enabled):
+                count = decoder.register_count(reg)
+                poller.register(
+                    1, address, reg.get("register_type", "holding"), 0.0, count
+                )
+
+    disabled = {
+        address
+        for table in tables.values()
+        for address, reg in table.items()
+        if not decoder.in_register_groups(reg, enabled)
+    } - {address for _, address in poller.active}
+    planned = {
+        address
+        for block in poller.plan_for(poller.due_keys(clock.now))
+        for address in range(block.address, block.address + block.count)
+    }
+
+    assert disabled
+    assert poller.active
+    assert not planned & disabled
+
+
+def test_failing_register_is_quarantined_and_retried_alone(clock):
+    """A register the unit rejects stops failing the block it sits in."""
+    config = SimulatorConfig(missing_registers=frozenset({("i", 0x3512)}))
+
+    async def run():
+        async with EpeverHiSimulator(config) as sim:
+            client = modbus_client.EpeverHiModbusClient(sim.host, sim.port)
+            poller = poller_module.RegisterPoller(client, clock=clock)
+            poller.register(1, 0x9000, "holding", 0.0)
+            for address in range(0x3510, 0x3515):
+                poller.register(1, address, "input", 0.0)
+            data = {}
+            try:
+                for _ in range(3):
+                    data = await poller.async_poll(data)
+                polled = set(range(0x3510, 0x3515))
+                assert {a for a in polled if not poller.available((1, a))} == {0x3512}
+                assert poller.take_availability_changes() == {(1, 0x3512)}
+
+                # The quarantined register is left out until its retry is due
+                sim.request_log.clear()
+                await poller.async_poll(data)
+                assert (1, 4, 0x3512, 1) not in sim.request_log
+
+                # It is retried on its own and stays held while it fails
+                clock.now += poller.quarantine.base_delay
+                sim.request_log.clear()
+                data = await poller.async_poll(data)
+                assert (1, 4, 0x3512, 1) in sim.request_log
+                assert not poller.available((1, 0x3512))
+
+                sim.request_log.clear()
+                data = await poller.async_poll(data)
+                return data, list(sim.request_log), poller.metrics
+            finally:
+                await client.close()
+
+    data, log, metrics = asyncio.run(run())
+
+    assert log == [(1, 3, 0x9000, 1), (1, 4, 0x3510, 2), (1, 4, 0x3513, 2)]
+    assert metrics.failed_blocks_last_cycle == 0
+    assert metrics.quarantined == 1
+    assert data[(1, 0x3513)] is not None
+
+
+def test_rejected_block_is_bisected_and_stays_split(clock):
+    """A hole in the register map costs a few requests once, not every cycle."""
+    # 0x3508 lies in the gap between polled values, so only merged reads fail
+    config = SimulatorConfig(missing_registers=frozenset({("i", 0x3508)}))
+    values = [0x3500, 0x3501, 0x3504, 0x3505, 0x350A, 0x350B, 0x350C, 0x350D]
+
+    async def run():
+        async with EpeverHiSimulator(config) as sim:
+            client = modbus_client.EpeverHiModbusClient(sim.host, sim.port)
+            poller = poller_module.RegisterPoller(client, clock=clock)
+            for address in values:
+                poller.register(1, address, "input", 0.0)
+            try:
+                data = await poller.async_poll({})
+                first = list(sim.request_log)
+
+                sim.request_log.clear()
+                data = await poller.async_poll(data)
+                split = list(sim.request_log)
+
+                # Much later the merged block is tried again, and re-split
+                clock.now += 900
+                sim.request_log.clear()
+                await poller.async_poll(data)
+                retried = list(sim.request_log)
+
+                # Once the device reads the merged block, it is kept; the
+                # failed retry doubled the wait before the next one
+                config.missing_registers = frozenset()
+                clock.now += 900
+                sim.request_log.clear()
+                await poller.async_poll(data)
+                assert sim.request_log == split
+                clock.now += 900
+                await poller.async_poll(data)
+                sim.request_log.clear()
+                await poller.async_poll(data)
+                merged = list(sim.request_log)
+                return data, first, split, retried, merged, poller
+            finally:
+                await client.close()
+
+    data, first, split, retried, merged, poller = asyncio.run(run())
+
+    assert all(data[(1, address)] is not None for address in values)
+    assert first == [
+        (1, 4, 0x3500, 14),
+        (1, 4, 0x3500, 6),
+        (1, 4, 0x350A, 4),
+    ]
+    assert split == [(1, 4, 0x3500, 6), (1, 4, 0x350A, 4)]
+    assert retried == first
+    assert merged == [(1, 4, 0x3500, 14)]
+    assert not poller.splits
+    assert poller.metrics.failed_blocks_last_cycle == 0
+
+
+def test_unit_outage_does_not_quarantine_registers(clock):
+    """When nothing answers, registers are not blamed individually."""
+    config = SimulatorConfig(unit_ids=(2,))
+
+    def setup(poller):
+        poller.register(1, 0x3510, "input", 0.0)
+
+    async def run():
+        async with EpeverHiSimulator(config) as sim:
+            client = modbus_client.EpeverHiModbusClient(sim.host, sim.port)
+            poller = poller_module.RegisterPoller(client, clock=clock)
+            setup(poller)
+            try:
+                for _ in range(4):
+                    await poller.async_poll({})
+                return poller
+            finally:
+                await client.close()
+
+    poller = asyncio.run(run())
+
+    assert poller.available((1, 0x3510))
+
+
+def test_offline_unit_is_not_quarantined_while_another_answers(clock):
+    """Failures are only blamed on registers of units that answer."""
+    config = SimulatorConfig(unit_ids=(1,))
+
+    async def run():
+        async with EpeverHiSimulator(config) as sim:
+            client = modbus_client.EpeverHiModbusClient(sim.host, sim.port)
+            poller = poller_module.RegisterPoller(client, clock=clock)
+            for slave in (1, 2):
+                for address in (0x3500, 0x3501, 0x3504):
+                    poller.register(slave, address, "input", 0.0)
+            try:
+                for _ in range(4):
+                    data = await poller.async_poll({})
+                return data, poller
+            finally:
+                await client.close()
+
+    data, poller = asyncio.run(run())
+
+    # The gateway reports unit 2 unreachable: one block per unit, no
+    # bisecting around a hole that is not there
+    assert poller.metrics.requests_last_cycle == 2
+    assert not poller.splits
+
+    assert data[(1, 0x3500)] is not None
+    assert data[(2, 0x3500)] is None
+    assert all(poller.available((2, address)) for address in (0x3500, 0x3504))
+    assert not poller.quarantine
+
+
+def test_register_rejected_by_a_unit_with_nothing_else_is_quarantined(clock):
+    """An exception response proves the unit is up, unlike a timeout."""
+    config = SimulatorConfig(missing_registers=frozenset({("i", 0x3512)}))
+
+    async def run():
+        async with EpeverHiSimulator(config) as sim:
+            client = modbus_client.EpeverHiModbusClient(sim.host, sim.port)
+            poller = poller_module.RegisterPoller(client, clock=clock)
+            poller.register(1, 0x3512, "input", 0.0)
+            try:
+                for _ in range(3):
+                    await poller.async_poll({})
+                return poller
+            finally:
+                await client.close()
+
+    assert not asyncio.run(run()).available((1, 0x3512))
+
+
+def test_silent_retry_of_a_held_register_backs_off(clock):
+    """A held register's retry waits longer even when its unit went quiet."""
+    config = SimulatorConfig(missing_registers=frozenset({("i", 0x3512)}))
+
+    async def run():
+        async with EpeverHiSimulator(config) as sim:
+            client = modbus_client.EpeverHiModbusClient(sim.host, sim.port)
+            poller = poller_module.RegisterPoller(client, clock=clock)
+            poller.register(1, 0x3510, "input", 0.0)
+            poller.register(1, 0x3512, "input", 0.0)
+            data = {}
+            try:
+                for _ in range(3):
+                    data = await poller.async_poll(data)
+                assert not poller.available((1, 0x3512))
+
+                sim.units.pop(1)  # the unit stops answering
+                clock.now += poller.quarantine.base_delay
+                await poller.async_poll(data)
+                clock.now += 1
+                return poller.quarantine.due()
+            finally:
+                await client.close()
+
+    assert asyncio.run(run()) == []
+
+
+def test_history_gets_only_the_registers_read_each_cycle(clock):
+    """Carried-over values of slow tiers are not recorded as fresh samples."""
+    history = load_integration_module("history")
+    buffer = history.RegisterHistory(16)
+    config = SimulatorConfig(missing_registers=frozenset({("i", 0x3512)}))
+
+    async def run():
+        async with EpeverHiSimulator(config) as sim:
+            client = modbus_client.EpeverHiModbusClient(sim.host, sim.port)
+            poller = poller_module.RegisterPoller(client, clock=clock)
+            poller.register(1, 0x3549, "input", 0.0)
+            poller.register(1, 0x9000, "holding", 60.0)
+            poller.register(1, 0x3512, "input", 0.0)
+            data = {}
+            try:
+                for _ in range(3):
+                    clock.now += 3
+                    data = await poller.async_poll(data)
+                    buffer.record(
+                        clock.now, {key: data[key] for key in poller.refreshed}
+                    )
+            finally:
+                await client.close()
+            return data
+
+    data = asyncio.run(run())
+
+    assert len(buffer.window((1, 0x3549))[1]) == 3
+    assert list(buffer.window((1, 0x9000))[0]) == [1003.0]
+    assert data[(1, 0x9000)] is not None
+    assert (1, 0x3512) not in buffer
@@ -0,0 +1,45 @@
+"""Tests for the failing-register quarantine."""
+
+from tests.conftest import load_integration_module
+
+quarantine = load_integration_module("quarantine")
+
+
+def test_key_is_held_after_threshold_failures_in_a_row(clock):
+    held = quarantine.RegisterQuarantine(threshold=3, clock=clock)
+
+    assert not held.record_failure("a")
+    held.record_success("a")  # a success resets the count
+    assert not held.record_failure("a")
+    assert not held.record_failure("a")
+    assert held.record_failure("a")
+    assert "a" in held
+    assert len(held) == 1
+
+
+def test_retry_spacing_doubles_up_to_the_maximum(clock):
+    held = quarantine.RegisterQuarantine(
+        threshold=1, base_delay=10.0, max_delay=35.0, clock=clock
+    )
+    held.record_failure("a")
+    start = clock.now
+
+    retry_times = []
+    for _ in range(4):
+        while not held.due():
+            clock.now += 1
+        retry_times.append(clock.now - start)
+        held.record_failure("a")
+
+    assert retry_times == [10, 30, 65, 100]
+
+
+def test_success_releases_and_discard_forgets(clock):
+    held = quarantine.RegisterQuarantine(threshold=1, clock=clock)
+    held.record_failure("a")
+    held.record_failure("b")
+
+    assert held.record_success("a")
+    assert not held.record_success("a")
+    held.discard("b")
+    assert len(held) == 0
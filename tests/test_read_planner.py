@@ -0,0 +1,88 @@
+"""Tests for the contiguous block read planner."""
+
+from tests.conftest import load_integration_module
+
+read_planner = load_integration_module("read_planner")
+ReadBlock = read_planner.ReadBlock
+plan_reads = read_planner.plan_reads
+
+
+def test_adjacent_addresses_merge_into_one_block():
+    """Consecutive addresses are read with a single request."""
+    blocks = plan_reads([(1, "input", 0x3200), (1, "input", 0x3201)])
+    assert blocks == [ReadBlock(1, "input", 0x3200, 2)]
+
+
+def test_gap_tolerance_controls_merging():
+    """Holes up to max_gap registers are read through, larger ones split."""
+    addresses = [(1, "input", 0x3500), (1, "input", 0x3501), (1, "input", 0x350F)]
+
+    assert plan_reads(addresses, max_gap=13) == [ReadBlock(1, "input", 0x3500, 16)]
+    assert plan_reads(addresses, max_gap=12) == [
+        ReadBlock(1, "input", 0x3500, 2),
+        ReadBlock(1, "input", 0x350F, 1),
+    ]
+
+
+def test_register_type_and_slave_are_never_mixed():
+    """Blocks are grouped per slave and per register type."""
+    blocks = plan_reads(
+        [
+            (1, "holding", 0x9000),
+            (1, "input", 0x9001),
+            (2, "holding", 0x9001),
+            (1, "HOLDING", 0x9002),
+        ]
+    )
+    assert blocks == [
+        ReadBlock(1, "holding", 0x9000, 3),
+        ReadBlock(1, "input", 0x9001, 1),
+        ReadBlock(2, "holding", 0x9001, 1),
+    ]
+
+
+def test_blocks_respect_pdu_limit():
+    """No block exceeds the 125 register PDU limit."""
+    addresses = [(1, "holding", addr) for addr in range(0, 300)]
+    blocks = plan_reads(addresses)
+
+    assert [block.count for block in blocks] == [125, 125, 50]
+    assert blocks[1].address == 125
+    assert plan_reads(addresses, max_count=500)[0].count == 125
+
+
+def test_block_slice_maps_registers_to_addresses():
+    """A block response is mapped back to per-address values."""
+    block = ReadBlock(1, "input", 0x3580, 3)
+    assert block.slice([10, 20, 30]) == {0x3580: 10, 0x3581: 20, 0x3582: 30}
+    assert block.contains(0x3582)
+    assert not block.contains(0x3583)
+
+
+def test_multi_word_values_are_never_split():
+    """A 32-bit value that would straddle the PDU limit starts a new block."""
+    blocks = plan_reads(
+        [(1, "input", 0x3500), (1, "input", 0x3503, 2)], max_gap=8, max_count=4
+    )
+    assert blocks == [
+        ReadBlock(1, "input", 0x3500, 1),
+        ReadBlock(1, "input", 0x3503, 2),
+    ]
+
+    # The high word on its own merges into the span that already covers it
+    assert plan_reads([(1, "input", 0x350F, 2), (1, "input", 0x3510)]) == [
+        ReadBlock(1, "input", 0x350F, 2)
+    ]
+
+
+def test_accept_can_veto_a_merge():
+    """A veto starts a new block, e.g. at a register the device rejects."""
+    addresses = [(1, "input", addr) for addr in (0x3510, 0x3511, 0x3513)]
+
+    def accept(slave, register_type, start, end):
+        return not start <= 0x3512 < end
+
+    assert plan_reads(addresses, max_gap=4, accept=accept) == [
+        ReadBlock(1, "input", 0x3510, 2),
+        ReadBlock(1, "input", 0x3513, 1),
+    ]
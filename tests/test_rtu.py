@@ -0,0 +1,312 @@
+"""Tests for RTU framing, bus timing and the native RTU transports."""
+
+import asyncio
+import time
+
+import pytest
+
+from tests.conftest import load_integration_module
+from tests.simulator import (
+    EpeverHiSerialSimulator,
+    EpeverHiSimulator,
+    SimulatorConfig,
+)
+
+rtu = load_integration_module("rtu")
+modbus_client = load_integration_module("modbus_client")
+modbus_pipeline = load_integration_module("modbus_pipeline")
+
+
+def test_crc_matches_reference_frames():
+    # Read holding 0x0000+1 from unit 1, as captured from a Modbus master
+    assert rtu.build_frame(1, bytes.fromhex("0300000001")) == bytes.fromhex(
+        "010300000001840a"
+    )
+    assert rtu.crc16(b"123456789") == 0x4B37
+    # Running the CRC over a frame including its CRC gives zero
+    assert rtu.crc16(bytes.fromhex("010300000001840a")) == 0
+
+
+def test_crc_can_continue_over_fragments():
+    frame = bytes.fromhex("0103021234")
+    assert rtu.crc16(frame[3:], rtu.crc16(frame[:3])) == rtu.crc16(frame)
+
+
+@pytest.mark.parametrize(
+    ("baudrate", "parity", "stopbits", "gap_ms"),
+    [
+        (9600, "N", 1, 3.5 * 10 / 9.6),
+        (9600, "E", 1, 3.5 * 11 / 9.6),
+        (4800, "N", 2, 3.5 * 11 / 4.8),
+        (19200, "N", 1, 3.5 * 10 / 19.2),
+        (115200, "N", 1, 1.75),  # fixed above 19200 baud
+    ],
+)
+def test_frame_gap_follows_baud_rate(baudrate, parity, stopbits, gap_ms):
+    assert rtu.frame_gap(baudrate, parity, stopbits) * 1000 == pytest.approx(gap_ms)
+
+
+@pytest.mark.parametrize(
+    ("pdu", "length"),
+    [
+        (bytes.fromhex("0435000010"), 5 + 32),  # FC4, 16 registers
+        (bytes.fromhex("0390000002"), 9),
+        (bytes.fromhex("0690010064"), 8),  # FC6 echo
+        (bytes.fromhex("1090000002041234abcd"), 8),  # FC16 address + count
+        (bytes.fromhex("17900100019001000102ffff"), 7),  # FC23, one register
+    ],
+)
+def test_expected_response_length(pdu, length):
+    assert rtu.expected_response_length(pdu) == length
+
+
+# Unit 1 answers two registers 0x1234, 0xABCD
+READ_RESPONSE = rtu.build_frame(1, bytes.fromhex("03041234abcd"))
+
+
+def test_assembler_completes_from_single_bytes():
+    assembler = rtu.RtuFrameAssembler(9)
+    for byte in READ_RESPONSE[:-1]:
+        assert assembler.feed(bytes((byte,))) == b""
+        assert not assembler.complete
+    assert assembler.feed(READ_RESPONSE[-1:] + b"\x01\x03") == b"\x01\x03"
+    assert assembler.valid
+    assert assembler.frame == READ_RESPONSE
+
+
+def test_assembler_follows_the_header_length():
+    """Exception and short read responses end before the request implied."""
+    exception = rtu.build_frame(1, bytes.fromhex("8302"))
+    assembler = rtu.RtuFrameAssembler(37)
+    assert assembler.feed(exception + b"junk") == b"junk"
+    assert assembler.valid
+
+    assembler = rtu.RtuFrameAssembler(37)
+    assembler.feed(READ_RESPONSE)
+    assert assembler.complete
+    assert assembler.expected == 9
+
+
+def test_assembler_rejects_a_corrupted_frame():
+    assembler = rtu.RtuFrameAssembler(9)
+    assembler.feed(READ_RESPONSE[:4] + b"\x00" + READ_RESPONSE[5:])
+    assert assembler.complete
+    assert not assembler.valid
+
+
+async def _start_fragmenting_gateway(chunk_size, delay):
+    """Serve FC3 over RTU-over-TCP, sending each response in small segments."""
+
+    async def serve(reader, writer):
+        try:
+            while True:
+                request = await reader.readexactly(8)
+                count = int.from_bytes(request[4:6], "big")
+                values = b"".join(
+                    (0x100 + offset).to_bytes(2, "big") for offset in range(count)
+                )
+                response = rtu.build_frame(
+                    request[0], bytes((request[1], 2 * count)) + values
+                )
+                for start in range(0, len(response), chunk_size):
+                    writer.write(response[start : start + chunk_size])
+                    await writer.drain()
+                    await asyncio.sleep(delay)
+        except asyncio.IncompleteReadError:
+            writer.close()
+
+    server = await asyncio.start_server(serve, "127.0.0.1", 0)
+    return server, server.sockets[0].getsockname()[1]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 7])
+def test_fragmented_rtu_over_tcp_returns_when_the_frame_completes(chunk_size):
+    """Split segments are reassembled without waiting for the 2 s timeout."""
+    delay = 0.005
+
+    async def run():
+        server, port = await _start_fragmenting_gateway(chunk_size, delay)
+        client = modbus_client.EpeverHiModbusClient("127.0.0.1", port, framer="rtu")
+        try:
+            latencies = []
+            for _ in range(3):
+                started = time.perf_counter()
+                registers = await client.read_register(0x3500, count=16, slave=1)
+                latencies.append(time.perf_counter() - started)
+            return registers, latencies
+        finally:
+            await client.close()
+            server.close()
+            await server.wait_closed()
+
+    registers, latencies = asyncio.run(run())
+
+    assert registers == [0x100 + offset for offset in range(16)]
+    segments = -(-37 // chunk_size)
+    # The last segment arrives about (segments - 1) delays after the first
+    assert max(latencies) < (segments - 1) * delay + 0.5
+
+
+def test_rtu_over_tcp_against_the_simulator():
+    async def run():
+        async with EpeverHiSimulator(SimulatorConfig(framer="rtu")) as sim:
+            client = modbus_client.EpeverHiModbusClient(
+                sim.host, sim.port, framer="rtu"
+            )
+            try:
+                registers = await client.read_register(
+                    0x3500, count=2, slave=1, register_type="input"
+                )
+                ok = await client.write_register(0x9001, 150, slave=1)
+                return registers, ok, sim.units[1].registers[("h", 0x9001)]
+            finally:
+                await client.close()
+
+    registers, ok, stored = asyncio.run(run())
+
+    assert registers[0] == 23000
+    assert ok
+    assert stored == 150
+
+
+def test_slow_bus_reads_through_fewer_gap_registers():
+    assert rtu.break_even_gap(9600) < rtu.break_even_gap(115200)
+    assert rtu.break_even_gap(115200) <= 124
+
+
+def _serial_client(sim, baudrate=9600):
+    pytest.importorskip("serial")
+    return modbus_client.EpeverHiModbusClient(
+        sim.device, 0, framer="serial", baudrate=baudrate
+    )
+
+
+def test_serial_reads_complete_without_waiting_for_timeout():
+    """Every response returns as soon as its last byte is in."""
+
+    async def run():
+        async with EpeverHiSerialSimulator(SimulatorConfig()) as sim:
+            client = _serial_client(sim)
+            try:
+                started = time.perf_counter()
+                for _ in range(5):
+                    registers = await client.read_register(
+                        0x3500, count=16, slave=1, register_type="input"
+                    )
+                elapsed = time.perf_counter() - started
+                return registers, elapsed, list(sim.request_log), client
+            finally:
+                await client.close()
+
+    registers, elapsed, log, client = asyncio.run(run())
+
+    assert registers[0] == 23000  # grid voltage
+    assert log == [(1, 4, 0x3500, 16)] * 5
+    # Five transactions, each far below the one second response timeout
+    assert elapsed < 1.0
+    assert client.metrics.bytes_sent == 5 * 8
+
+
+def test_requests_wait_for_the_inter_frame_silence():
+    async def run():
+        async with EpeverHiSerialSimulator(SimulatorConfig()) as sim:
+            client = _serial_client(sim, baudrate=1200)
+            try:
+                for address in (0x9000, 0x9001, 0x9002):
+                    await client.read_register(address, slave=1)
+                return sim.bus_log
+            finally:
+                await client.close()
+
+    bus_log = asyncio.run(run())
+
+    gap = rtu.frame_gap(1200)
+    for (_, answered), (received, _) in zip(bus_log, bus_log[1:], strict=False):
+        # The next request's 8 characters follow the silence after a response
+        assert received - answered >= gap
+
+
+def test_serial_write_and_exception_responses():
+    async def run():
+        config = SimulatorConfig(unsupported_functions=frozenset({23}))
+        async with EpeverHiSerialSimulator(config) as sim:
+            client = _serial_client(sim)
+            try:
+                ok = await client.write_register(0x9001, 210, slave=1)
+                started = time.perf_counter()
+                read_back = await client.readwrite_registers(0x9001, [220], slave=1)
+                elapsed = time.perf_counter() - started
+                missing = await client.read_register(0x9001, slave=7)
+                stored = sim.units[1].registers[("h", 0x9001)]
+                return ok, read_back, elapsed, missing, stored, client
+            finally:
+                await client.close()
+
+    ok, read_back, elapsed, missing, stored, client = asyncio.run(run())
+
+    assert ok
+    assert stored == 210
+    # The 5-byte exception frame ends the read early and is remembered
+    assert read_back is None
+    assert elapsed < 0.5
+    assert not client.supports_readwrite(1)
+    # A unit that never answers times out
+    assert missing is None
+    assert client.metrics.timeouts == 1
+
+
+def test_writes_fall_back_when_fc23_goes_unanswered():
+    """A unit dropping FC23 is written with FC6; a silent unit keeps FC23."""
+
+    async def run():
+        config = SimulatorConfig(unit_ids=(1,), ignored_functions=frozenset({23}))
+        async with EpeverHiSerialSimulator(config) as sim:
+            client = _serial_client(sim)
+            try:
+                dropped = await client.readwrite_registers(0x9001, [220], slave=1)
+                fell_back = not client.supports_readwrite(1)
+                ok = await client.write_register(0x9001, 220, slave=1)
+                # Unit 7 is absent: its plain write fails as well
+                await client.readwrite_registers(0x9001, [220], slave=7)
+                await client.write_register(0x9001, 220, slave=7)
+                return dropped, fell_back, ok, client
+            finally:
+                await client.close()
+
+    dropped, fell_back, ok, client = asyncio.run(run())
+
+    assert dropped is None
+    assert fell_back
+    assert ok
+    assert not client.supports_readwrite(1)
+    assert client.supports_readwrite(7)
+
+
+def test_missing_serial_port_fails_to_connect():
+    pytest.importorskip("serial")
+
+    async def run():
+        transport = rtu.ModbusRtuSerial("/dev/does-not-exist")
+        with pytest.raises(modbus_pipeline.ModbusPipelineError):
+            await transport.read_registers(1, 3, 0x9000, 1)
+
+    asyncio.run(run())
+
+
+def test_transport_bases_are_abstract():
+    with pytest.raises(TypeError):
+        modbus_pipeline.ModbusTransport()
+
+    class Incomplete(rtu._RtuMaster):
+        @property
+        def name(self):
+            return "incomplete"
+
+    with pytest.raises(TypeError):
+        Incomplete()
+    assert (
+        modbus_client.EpeverHiModbusClient(
+            "/dev/ttyUSB0", None, framer="serial"
+        ).endpoint
+        == "/dev/ttyUSB0"
+    )
@@ -0,0 +1,36 @@
+"""Tests for the sensor platform setup."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.epever_hi import const, sensor  # noqa: E402
+
+
+def _coordinator(slaves=(1,)):
+    """Return the coordinator attributes the sensor entities use at setup."""
+    return SimpleNamespace(
+        slaves=list(slaves),
+        primary_slave=slaves[0],
+        group_enabled=lambda definition: True,
+        metrics_snapshot=dict,
+    )
+
+
+def test_setup_adds_register_and_metric_sensors():
+    coordinator = _coordinator((1, 2))
+    hass = SimpleNamespace(data={const.DOMAIN: {"entry": coordinator}})
+    added = []
+
+    asyncio.run(
+        sensor.async_setup_entry(hass, SimpleNamespace(entry_id="entry"), added.extend)
+    )
+
+    modbus = [s for s in added if isinstance(s, sensor.EpeverHiModbusSensor)]
+    metrics = [s for s in added if isinstance(s, sensor.EpeverHiMetricSensor)]
+    assert len(modbus) == 2 * len(sensor.SENSOR_DEFINITIONS)
+    assert len(metrics) == len(const.METRIC_SENSOR_DEFINITIONS)
+    assert len({s.unique_id for s in added}) == len(added)
@@ -0,0 +1,172 @@
+"""Exercise the Modbus client against the local EPEVER Hi simulator."""
+
+import asyncio
+
+import pytest
+
+from tests.conftest import load_integration_module
+from tests.simulator import EpeverHiSimulator, SimulatorConfig
+
+modbus_client = load_integration_module("modbus_client")
+decoder = load_integration_module("decoder")
+
+
+async def _with_client(config, body, pipeline_depth=1):
+    async with EpeverHiSimulator(config) as sim:
+        client = modbus_client.EpeverHiModbusClient(
+            sim.host, sim.port, framer=config.framer, pipeline_depth=pipeline_depth
+        )
+        try:
+            return await body(client, sim)
+        finally:
+            await client.close()
+
+
+@pytest.mark.parametrize("framer", ["tcp", "rtu"])
+def test_reads_typed_values_over_both_framers(framer):
+    """PV power is a word-swapped int32 read in one request."""
+
+    async def body(client, sim):
+        registers = await client.read_register(
+            0x3549, count=4, slave=1, register_type="input"
+        )
+        return registers, sim.request_log
+
+    registers, log = asyncio.run(_with_client(SimulatorConfig(framer=framer), body))
+
+    data = {(1, 0x3549 + offset): value for offset, value in enumerate(registers)}
+    plan = decoder.DecodePlan(
+        {
+            0x3549: {"key": "pv_voltage", "scale": 0.01, "precision": 2},
+            0x354A: {"key": "pv_current", "scale": 0.01, "precision": 2},
+            0x354B: {
+                "key": "pv_power",
+                "scale": 0.01,
+                "precision": 2,
+                "data_type": "int32",
+                "swap": "word",
+            },
+        }
+    )
+    values = plan.decode(data, [1])
+    assert values[(1, "pv_power")] == pytest.approx(
+        values[(1, "pv_voltage")] * values[(1, "pv_current")], abs=0.05
+    )
+    assert log == [(1, 4, 0x3549, 4)]
+
+
+def test_writes_clamp_to_the_declared_range():
+    """Holding registers clamp like the device; read-only ones are refused."""
+
+    async def body(client, sim):
+        ok = await client.write_register(0x9001, 5000, slave=1)  # max 1000 Ah
+        clamped = await client.read_register(0x9001, slave=1)
+        refused = await client.write_register(0x9013, 1, slave=1)  # serial number
+        return ok, clamped, refused
+
+    ok, clamped, refused = asyncio.run(_with_client(SimulatorConfig(), body))
+    assert ok is True
+    assert clamped == [1000]
+    assert refused is False
+
+
+def test_unit_ids_and_pdu_limit():
+    """Every unit has its own image; unknown units and long reads fail."""
+
+    async def body(client, sim):
+        sim.units[2].write(0x9001, [321])
+        return (
+            await client.read_register(0x9001, slave=1),
+            await client.read_register(0x9001, slave=2),
+            await client.read_register(0x9001, slave=7),
+            await client.read_register(0x9000, count=65, slave=1),
+        )
+
+    config = SimulatorConfig(unit_ids=(1, 2), max_registers=64)
+    unit1, unit2, missing, too_long = asyncio.run(_with_client(config, body))
+    assert unit1 != unit2 == [321]
+    assert missing is None
+    assert too_long is None
+
+
+@pytest.mark.parametrize(
+    ("framer", "pipeline_depth"), [("tcp", 1), ("tcp", 2), ("rtu", 1)]
+)
+def test_read_results_carry_the_exception_code(framer, pipeline_depth):
+    """A rejected address is told apart from a unit the gateway cannot reach."""
+
+    async def body(client, sim):
+        return (
+            await client.read_register_result(0x3512, slave=1, register_type="input"),
+            await client.read_register_result(0x9001, slave=7),
+        )
+
+    config = SimulatorConfig(
+        framer=framer, missing_registers=frozenset({("i", 0x3512)})
+    )
+    rejected, unreachable = asyncio.run(_with_client(config, body, pipeline_depth))
+    assert rejected == (None, 0x02, False)
+    assert not rejected.unit_silent
+    assert unreachable.exception_code == 0x0B
+    assert unreachable.unit_silent
+
+
+@pytest.mark.parametrize(("serialize", "slow"), [(True, True), (False, False)])
+def test_latency_is_charged_per_request(serialize, slow):
+    """Pipelined requests overlap unless the bus serializes them."""
+
+    async def body(client, sim):
+        started = asyncio.get_running_loop().time()
+        results = await asyncio.gather(
+            *(client.read_register(0x9000 + n, slave=1) for n in range(4))
+        )
+        return asyncio.get_running_loop().time() - started, results
+
+    config = SimulatorConfig(latency=0.05, serialize=serialize)
+    elapsed, results = asyncio.run(_with_client(config, body, pipeline_depth=4))
+    assert None not in results
+    assert (elapsed >= 0.2) is slow
+
+
+def test_dynamics_charge_the_battery_in_daylight():
+    """The PV curve charges the battery as simulated time passes."""
+    sim = EpeverHiSimulator(SimulatorConfig(start_hour=12.0, time_scale=1.0))
+    unit = sim.units[1]
+    unit.step(now=unit._started)
+    soc = unit.soc
+    unit.step(now=unit._started + 3600)
+
+    assert unit.soc > soc
+    assert unit.registers[("i", 0x3200)] & 1  # charging
+    assert unit.energy["pv_total"] > 0
+
+
+@pytest.mark.parametrize("pipeline_depth", [1, 4])
+def test_readwrite_returns_the_clamped_value_in_one_request(pipeline_depth):
+    """FC23 writes and reads back in one round trip, clamping included."""
+
+    async def body(client, sim):
+        registers = await client.readwrite_registers(0x9001, [5000], slave=1)
+        return registers, list(sim.request_log)
+
+    registers, log = asyncio.run(
+        _with_client(SimulatorConfig(), body, pipeline_depth=pipeline_depth)
+    )
+    assert registers == [1000]  # battery capacity tops out at 1000 Ah
+    assert log == [(1, 23, 0x9001, 1)]
+
+
+@pytest.mark.parametrize("pipeline_depth", [1, 4])
+def test_readwrite_support_is_remembered_per_unit(pipeline_depth):
+    """A unit rejecting FC23 as illegal is not asked again."""
+
+    async def body(client, sim):
+        registers = await client.readwrite_registers(0x9001, [200], slave=1)
+        return registers, client.supports_readwrite(1), client.supports_readwrite(2)
+
+    config = SimulatorConfig(unit_ids=(1, 2), unsupported_functions=frozenset({23}))
+    registers, unit_1, unit_2 = asyncio.run(
+        _with_client(config, body, pipeline_depth=pipeline_depth)
+    )
+    assert registers is None
+    assert (unit_1, unit_2) == (False, True)
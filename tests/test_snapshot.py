@@ -0,0 +1,71 @@
+"""Tests for the warm-start register snapshot."""
+
+import json
+
+import pytest
+
+from tests.conftest import load_integration_module
+
+snapshot = load_integration_module("snapshot")
+
+
+def test_snapshot_survives_a_json_round_trip():
+    """Tuple keys and identity registers come back from the Store unchanged."""
+    original = snapshot.Snapshot(
+        registers={(1, 0x3549): 2410, (1, 0x354B): 0, (2, 0x9001): 200},
+        identity={1: {"device_serial_number": [0x3231, 0x3433]}},
+        saved_at=1_760_000_000.5,
+    )
+
+    stored = json.loads(json.dumps(original.as_dict()))
+
+    assert snapshot.Snapshot.from_dict(stored) == original
+
+
+@pytest.mark.parametrize(
+    "stored",
+    [
+        {},
+        {"registers": [], "saved_at": 0},
+        {"registers": {"1": {"not-an-address": 5}}, "saved_at": 0},
+        {"registers": {}, "identity": {"1": {"serial": None}}, "saved_at": 0},
+    ],
+)
+def test_unreadable_snapshots_are_ignored(stored):
+    assert snapshot.Snapshot.from_dict(stored) is None
+
+
+class _DelayedStore:
+    """Store.async_delay_save(): each call cancels and re-arms the timer."""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.due = None
+        self.data_func = None
+        self.saves = []
+
+    def async_delay_save(self, data_func, delay):
+        self.data_func = data_func
+        self.due = self.clock.now + delay
+
+    def tick(self):
+        if self.due is not None and self.clock.now >= self.due:
+            self.due = None
+            self.saves.append((self.clock.now, self.data_func()))
+
+
+def test_saves_land_while_polling_continues(clock):
+    """Polls every few seconds must not keep pushing the save back."""
+    store = _DelayedStore(clock)
+    saver = snapshot.SnapshotSaver(
+        store.async_delay_save, lambda: {"saved_at": clock.now}, 300
+    )
+    start = clock.now
+
+    for _ in range(250):  # 1000 s of polls, 4 s apart
+        saver.schedule()
+        clock.now += 4
+        store.tick()
+
+    assert [at - start for at, _ in store.saves] == [300, 600, 900]
+    assert saver.pending
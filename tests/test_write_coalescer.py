@@ -0,0 +1,136 @@
+"""Tests for per-register write coalescing."""
+
+import asyncio
+
+import pytest
+
+from tests.conftest import load_integration_module
+from tests.simulator import EpeverHiSimulator, SimulatorConfig
+
+write_coalescer = load_integration_module("write_coalescer")
+modbus_client = load_integration_module("modbus_client")
+
+
+def test_slider_burst_costs_one_write_on_the_wire():
+    """Twenty values dragged through in a burst reach the device as one."""
+
+    async def run():
+        async with EpeverHiSimulator(SimulatorConfig()) as sim:
+            client = modbus_client.EpeverHiModbusClient(sim.host, sim.port)
+
+            async def write(key, value):
+                return await client.write_register(key[1], value, slave=key[0])
+
+            coalescer = write_coalescer.WriteCoalescer(write, window=0.05)
+            try:
+                calls = []
+                for value in range(100, 120):
+                    calls.append(
+                        asyncio.create_task(coalescer.submit((1, 0x9001), value))
+                    )
+                    await asyncio.sleep(0.005)
+                results = await asyncio.gather(*calls)
+                stored = sim.units[1].registers[("h", 0x9001)]
+                return results, list(sim.request_log), stored, coalescer
+            finally:
+                await client.close()
+
+    results, log, stored, coalescer = asyncio.run(run())
+
+    assert results == [True] * 20
+    assert log == [(1, 6, 0x9001, 1)]
+    assert stored == 119
+    assert (coalescer.submitted, coalescer.written) == (20, 1)
+
+
+def test_keys_are_coalesced_independently():
+    written = []
+
+    async def write(key, value):
+        written.append((key, value))
+        return True
+
+    async def run():
+        coalescer = write_coalescer.WriteCoalescer(write, window=0.01)
+        await asyncio.gather(
+            coalescer.submit("a", 1),
+            coalescer.submit("b", 5),
+            coalescer.submit("a", 2),
+        )
+
+    asyncio.run(run())
+
+    assert sorted(written) == [("a", 2), ("b", 5)]
+
+
+def test_value_queued_during_a_write_is_sent_after_it():
+    """Writes to one key never overlap and the newest value lands last."""
+    written = []
+
+    async def run():
+        gate = asyncio.Event()
+
+        async def write(key, value):
+            written.append(("start", value))
+            if value == 1:
+                await gate.wait()
+            written.append(("end", value))
+            return True
+
+        coalescer = write_coalescer.WriteCoalescer(write, window=0.01)
+        first = asyncio.create_task(coalescer.submit("a", 1))
+        await asyncio.sleep(0.03)  # first write is now in flight
+        second = asyncio.create_task(coalescer.submit("a", 2))
+        await asyncio.sleep(0.03)
+        assert written == [("start", 1)]
+        gate.set()
+        assert await asyncio.gather(first, second) == [True, True]
+
+    asyncio.run(run())
+
+    assert written == [("start", 1), ("end", 1), ("start", 2), ("end", 2)]
+
+
+def test_failure_reaches_every_caller_and_flush_sends_pending():
+    async def write(key, value):
+        raise ConnectionError("gone")
+
+    async def run():
+        coalescer = write_coalescer.WriteCoalescer(write, window=10)
+        calls = [asyncio.create_task(coalescer.submit("a", v)) for v in (1, 2)]
+        await asyncio.sleep(0)
+        assert coalescer.pending_values() == {"a": 2}
+        await coalescer.async_flush()
+        return await asyncio.gather(*calls, return_exceptions=True)
+
+    results = asyncio.run(run())
+
+    assert all(isinstance(result, ConnectionError) for result in results)
+
+
+def test_zero_window_writes_straight_through():
+    written = []
+
+    async def write(key, value):
+        written.append(value)
+        return value != 3
+
+    async def run():
+        coalescer = write_coalescer.WriteCoalescer(write, window=0)
+        return [await coalescer.submit("a", v) for v in (1, 2, 3)]
+
+    assert asyncio.run(run()) == [True, True, False]
+    assert written == [1, 2, 3]
+
+
+@pytest.mark.parametrize("window", [0.0, 0.01])
+def test_pending_is_empty_once_written(window):
+    async def write(key, value):
+        return True
+
+    async def run():
+        coalescer = write_coalescer.WriteCoalescer(write, window=window)
+        await coalescer.submit("a", 1)
+        return coalescer.pending_values()
+
+    assert asyncio.run(run()) == {}